@@ -61,7 +61,9 @@ setup(
     python_requires='>=3.6',
     extras_require=optional_requirements,
     entry_points={
-        'console_scripts': [],
+        'console_scripts': [
+            'rv2-batch = compas_rv2.batch.cli:main',
+        ],
     },
     ext_modules=[],
     scripts=[]
@@ -9,7 +9,11 @@ compas_rv2
 .. toctree::
     :maxdepth: 1
 
+    compas_rv2.batch
     compas_rv2.datastructures
+    compas_rv2.equilibrium
+    compas_rv2.execution
+    compas_rv2.history
     compas_rv2.rhino
     compas_rv2.scene
 
@@ -0,0 +1,66 @@
+"""
+********************************************************************************
+compas_rv2.batch
+********************************************************************************
+
+.. currentmodule:: compas_rv2.batch
+
+Batch processing of RV2 sessions outside Rhino.
+
+The sessions are solved with the same settings as the Rhino commands
+(``tna.horizontal.kmax``, ``tna.horizontal.alpha``, ``tna.vertical.zmax``, ``tna.vertical.kmax``),
+in a pool of worker processes.
+
+.. code-block:: bash
+
+    rv2-batch data/ -o solved/ -j 8 --summary solved/summary.json
+    python -m compas_rv2.batch data/densetest.rv2 --zmax 3.0
+
+Solvers
+=======
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    solver_settings
+    solve_diagrams
+    solve_session
+    solve_file
+    solve_files
+
+Parameter sweeps
+================
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    parameter_grid
+    sweep
+
+"""
+from __future__ import absolute_import
+
+import compas
+
+if not compas.IPY:
+    from .solve import DEFAULT_SETTINGS
+    from .solve import solver_settings
+    from .solve import solve_diagrams
+    from .solve import solve_session
+    from .solve import solve_file
+    from .solve import solve_files
+    from .sweep import parameter_grid
+    from .sweep import sweep
+
+__all__ = [
+    'DEFAULT_SETTINGS',
+    'solver_settings',
+    'solve_diagrams',
+    'solve_session',
+    'solve_file',
+    'solve_files',
+    'parameter_grid',
+    'sweep',
+]
@@ -0,0 +1,10 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import sys
+
+from .cli import main
+
+
+sys.exit(main())
@@ -0,0 +1,83 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import os
+import sys
+import json
+import glob
+import argparse
+
+from .solve import solve_files
+
+
+__all__ = ['main']
+
+
+def collect_files(paths, extension='rv2'):
+    """Collect session files from a list of files and directories."""
+    filepaths = []
+    for path in paths:
+        if os.path.isdir(path):
+            filepaths += sorted(glob.glob(os.path.join(path, '*.{}'.format(extension))))
+        else:
+            filepaths.append(path)
+    return filepaths
+
+
+def format_summary(summaries):
+    """Format the summaries of a batch as a table."""
+    lines = ['{:<40} {:<6} {:>10} {:>10} {:>8}'.format('file', 'status', 'max angle', 'scale', 'time')]
+    for summary in summaries:
+        name = os.path.basename(summary['file'])
+        if summary['status'] == 'ok':
+            lines.append('{:<40} {:<6} {:>10.3f} {:>10.3f} {:>8.2f}'.format(name, 'ok', summary['max_angle'], summary['scale'], summary['time']))
+        else:
+            lines.append('{:<40} {:<6} {}'.format(name, 'error', summary['message']))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    """Compute horizontal and vertical equilibrium for a batch of RV2 session files.
+
+    Examples
+    --------
+    .. code-block:: bash
+
+        rv2-batch data/ -o solved/ --zmax 3.0 --summary solved/summary.json
+
+    """
+    parser = argparse.ArgumentParser(prog='rv2-batch', description=main.__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='+', help='RV2 session files, or directories with session files.')
+    parser.add_argument('-o', '--outdir', help='Directory for the solved session files.')
+    parser.add_argument('-j', '--processes', type=int, default=None, help='Number of worker processes. Default is the number of CPUs.')
+    parser.add_argument('--summary', help='Path of a JSON file for the summary of the results.')
+    parser.add_argument('--alpha', type=float, help='Override tna.horizontal.alpha.')
+    parser.add_argument('--kmax-horizontal', type=int, help='Override tna.horizontal.kmax.')
+    parser.add_argument('--zmax', type=float, help='Override tna.vertical.zmax.')
+    parser.add_argument('--kmax-vertical', type=int, help='Override tna.vertical.kmax.')
+    args = parser.parse_args(argv)
+
+    filepaths = collect_files(args.paths)
+    if not filepaths:
+        parser.error('No session files found.')
+
+    overrides = {
+        'tna.horizontal.alpha': args.alpha,
+        'tna.horizontal.kmax': args.kmax_horizontal,
+        'tna.vertical.zmax': args.zmax,
+        'tna.vertical.kmax': args.kmax_vertical,
+    }
+    summaries = solve_files(filepaths, outdir=args.outdir, processes=args.processes, overrides=overrides)
+
+    print(format_summary(summaries))
+
+    if args.summary:
+        with open(args.summary, 'w') as f:
+            json.dump(summaries, f, indent=4)
+
+    return 0 if all(summary['status'] == 'ok' for summary in summaries) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,222 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import os
+import json
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+from compas.utilities import DataEncoder
+from compas.utilities import DataDecoder
+
+from compas_rv2.equilibrium import horizontal_nodal_numpy
+from compas_rv2.equilibrium import vertical_from_zmax_numpy
+
+
+__all__ = [
+    'DEFAULT_SETTINGS',
+    'solver_settings',
+    'solve_diagrams',
+    'solve_session',
+    'solve_file',
+    'solve_files',
+]
+
+
+DEFAULT_SETTINGS = {
+    'tna.horizontal.kmax': 500,
+    'tna.horizontal.alpha': 100,
+    'tna.vertical.kmax': 300,
+    'tna.vertical.zmax': 4.0,
+}
+
+
+def solver_settings(settings, overrides=None):
+    """Collect the solver settings of a session.
+
+    Parameters
+    ----------
+    settings : dict
+        The settings of a session.
+        The solver settings are taken from the ``"Solvers"`` section,
+        or from the top level for sessions saved with older versions of RV2.
+    overrides : dict, optional
+        Values that replace the settings of the session, by key.
+        Values that are ``None`` are ignored.
+
+    Returns
+    -------
+    dict
+        The values of the keys of :data:`DEFAULT_SETTINGS`.
+
+    """
+    settings = settings or {}
+    solvers = settings.get('Solvers', settings)
+    values = {}
+    for key, value in DEFAULT_SETTINGS.items():
+        values[key] = solvers.get(key, value)
+    for key, value in (overrides or {}).items():
+        if value is not None:
+            values[key] = value
+    return values
+
+
+def solve_diagrams(form, force, settings):
+    """Compute horizontal and vertical equilibrium of a pair of diagrams.
+
+    Parameters
+    ----------
+    form : :class:`compas_tna.diagrams.FormDiagram`
+        The form diagram.
+    force : :class:`compas_tna.diagrams.ForceDiagram`
+        The force diagram.
+    settings : dict
+        The solver settings, as returned by :func:`solver_settings`.
+
+    Returns
+    -------
+    dict
+        A summary of the results with the maximum and mean angle deviation,
+        the scale of the horizontal forces, and the runtime (in seconds) of both solvers.
+
+    """
+    t0 = time.time()
+    horizontal_nodal_numpy(form, force,
+                           alpha=settings['tna.horizontal.alpha'],
+                           kmax=settings['tna.horizontal.kmax'])
+    t1 = time.time()
+    _, scale = vertical_from_zmax_numpy(form,
+                                        settings['tna.vertical.zmax'],
+                                        kmax=settings['tna.vertical.kmax'])
+    t2 = time.time()
+    force.attributes['scale'] = scale
+    angles = form.edges_attribute('_a', keys=list(form.edges_where({'_is_edge': True})))
+    return {
+        'vertices': form.number_of_vertices(),
+        'edges': form.number_of_edges(),
+        'max_angle': max(angles) if angles else 0.0,
+        'mean_angle': sum(angles) / len(angles) if angles else 0.0,
+        'scale': scale,
+        'time_horizontal': t1 - t0,
+        'time_vertical': t2 - t1,
+    }
+
+
+def solve_session(session, overrides=None):
+    """Compute equilibrium for the form and force diagram of an RV2 session.
+
+    Parameters
+    ----------
+    session : dict
+        The session data, with the same schema as used by
+        :meth:`compas_rv2.scene.Scene.save_session` and :meth:`compas_rv2.scene.Scene.load_session`.
+        The form and force data of the session are replaced by the results,
+        and the solver settings of the session by the settings that were used.
+    overrides : dict, optional
+        Solver settings that replace the settings of the session.
+
+    Returns
+    -------
+    dict
+        The summary of the results.
+
+    Raises
+    ------
+    ValueError
+        If the session has no form and force diagram.
+
+    """
+    from compas_rv2.datastructures import FormDiagram
+    from compas_rv2.datastructures import ForceDiagram
+
+    data = session.get('data') or {}
+    if not data.get('form') or not data.get('force'):
+        raise ValueError('The session has no form and force diagram.')
+
+    form = FormDiagram.from_data(data['form'])
+    force = ForceDiagram.from_data(data['force'])
+    force.primal = form
+    form.dual = force
+    force.update_edge_index()
+
+    settings = solver_settings(session.get('settings'), overrides)
+    summary = solve_diagrams(form, force, settings)
+    summary['settings'] = settings
+
+    data['form'] = form.to_data()
+    data['force'] = force.to_data()
+    if session.get('settings') and 'Solvers' in session['settings']:
+        session['settings']['Solvers'].update(settings)
+    return summary
+
+
+def solve_file(filepath, outdir=None, overrides=None):
+    """Compute equilibrium for an RV2 session file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to an RV2 session file.
+    outdir : str, optional
+        A directory for the solved session file.
+        If no directory is provided, the result is not written.
+    overrides : dict, optional
+        Solver settings that replace the settings of the session.
+
+    Returns
+    -------
+    dict
+        The summary of the results.
+        Errors are reported in the summary instead of being raised,
+        with ``"status"`` set to ``"error"``.
+
+    """
+    t0 = time.time()
+    summary = {'file': filepath, 'status': 'ok', 'message': ''}
+    try:
+        with open(filepath, 'r') as f:
+            session = json.load(f, cls=DataDecoder)
+        summary.update(solve_session(session, overrides))
+        if outdir:
+            outpath = os.path.join(outdir, os.path.basename(filepath))
+            with open(outpath, 'w') as f:
+                json.dump(session, f, cls=DataEncoder)
+            summary['output'] = outpath
+    except Exception as e:
+        summary['status'] = 'error'
+        summary['message'] = '{}: {}'.format(type(e).__name__, e)
+    summary['time'] = time.time() - t0
+    return summary
+
+
+def solve_files(filepaths, outdir=None, processes=None, overrides=None):
+    """Compute equilibrium for many RV2 session files in parallel.
+
+    Parameters
+    ----------
+    filepaths : list
+        Paths to RV2 session files.
+    outdir : str, optional
+        A directory for the solved session files.
+    processes : int, optional
+        The number of worker processes.
+        Default is the number of CPUs.
+        With ``processes=1`` the files are solved in the current process.
+    overrides : dict, optional
+        Solver settings that replace the settings of the sessions.
+
+    Returns
+    -------
+    list
+        The summaries of the results, in the order of the files.
+
+    """
+    if outdir and not os.path.isdir(outdir):
+        os.makedirs(outdir)
+    if processes == 1 or len(filepaths) < 2:
+        return [solve_file(filepath, outdir, overrides) for filepath in filepaths]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [executor.submit(solve_file, filepath, outdir, overrides) for filepath in filepaths]
+        return [future.result() for future in futures]
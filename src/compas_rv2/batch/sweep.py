@@ -0,0 +1,177 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import json
+import time
+
+from itertools import product
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError:
+    SharedMemory = None
+
+from compas.geometry import length_vector
+from compas.utilities import DataEncoder
+
+from compas_rv2.equilibrium import horizontal_nodal_numpy
+from compas_rv2.equilibrium import vertical_from_zmax_numpy
+
+from .solve import solver_settings
+
+
+__all__ = [
+    'parameter_grid',
+    'sweep',
+]
+
+
+WORKER = {}
+
+
+def parameter_grid(zmax, alpha, kmax):
+    """Construct all combinations of the sweep parameters.
+
+    Parameters
+    ----------
+    zmax : list
+        Values of the target height of the thrust diagram.
+    alpha : list
+        Values of the weighting factor of the horizontal solver.
+    kmax : list
+        Values of the maximum number of iterations of the horizontal solver.
+
+    Returns
+    -------
+    list
+        The combinations, as dicts with keys ``"zmax"``, ``"alpha"`` and ``"kmax"``.
+
+    """
+    return [{'zmax': z, 'alpha': a, 'kmax': k} for z, a, k in product(zmax, alpha, kmax)]
+
+
+def sweep(form, force, zmax, alpha, kmax, settings=None, processes=None):
+    """Compute equilibrium for all combinations of a range of solver parameters.
+
+    Parameters
+    ----------
+    form : :class:`compas_rv2.datastructures.FormDiagram`
+        The form diagram.
+    force : :class:`compas_rv2.datastructures.ForceDiagram`
+        The force diagram.
+    zmax : list
+        Values of the target height of the thrust diagram (``tna.vertical.zmax``).
+    alpha : list
+        Values of the weighting factor of the horizontal solver (``tna.horizontal.alpha``).
+    kmax : list
+        Values of the maximum number of iterations of the horizontal solver (``tna.horizontal.kmax``).
+    settings : dict, optional
+        Session settings for the other solver parameters (``tna.vertical.kmax``).
+    processes : int, optional
+        The number of worker processes.
+        Default is the number of CPUs.
+        With ``processes=1`` all combinations are solved in the current process.
+
+    Returns
+    -------
+    list
+        Per combination, a dict with the parameters and the results:
+        the scale of the horizontal forces, the maximum angle deviation,
+        the maximum reaction force and the maximum lumped stress.
+
+    Notes
+    -----
+    The diagrams are not modified.
+    The data of the diagrams is serialised once, and stored in a shared memory block
+    from which every worker process reads it once,
+    such that only the parameters are sent with every job.
+
+    Examples
+    --------
+    >>> table = sweep(form, force, zmax=[2.0, 3.0, 4.0], alpha=[100, 50], kmax=[100, 500])
+    >>> best = min(table, key=lambda row: row['max_stress'])
+
+    """
+    data = json.dumps({
+        'form': form.to_data(),
+        'force': force.to_data(),
+        'settings': solver_settings(settings),
+    }, cls=DataEncoder).encode('utf-8')
+
+    combinations = parameter_grid(zmax, alpha, kmax)
+
+    if processes == 1 or len(combinations) < 2:
+        init_worker(None, data)
+        try:
+            return [solve_combination(combination) for combination in combinations]
+        finally:
+            WORKER.clear()
+
+    if SharedMemory is None:
+        with ProcessPoolExecutor(max_workers=processes, initializer=init_worker, initargs=(None, data)) as executor:
+            return list(executor.map(solve_combination, combinations))
+
+    shm = SharedMemory(create=True, size=len(data))
+    try:
+        shm.buf[:len(data)] = data
+        with ProcessPoolExecutor(max_workers=processes, initializer=init_worker, initargs=(shm.name, len(data))) as executor:
+            return list(executor.map(solve_combination, combinations))
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def init_worker(name, data):
+    """Load the serialised diagrams in a worker, from shared memory if a name is provided."""
+    if name is not None:
+        shm = SharedMemory(name=name)
+        try:
+            data = bytes(shm.buf[:data])
+        finally:
+            shm.close()
+    WORKER['data'] = data
+
+
+def solve_combination(combination):
+    """Solve one combination of parameters with the diagrams loaded in the worker."""
+    from compas_rv2.datastructures import ForceDiagram
+    from compas_rv2.datastructures import ThrustDiagram
+
+    result = dict(combination)
+    result.update({'status': 'ok', 'message': ''})
+    t0 = time.time()
+    try:
+        # the diagrams are decoded for every job,
+        # because the solvers modify them in place
+        data = json.loads(WORKER['data'].decode('utf-8'))
+        # a thrust diagram is a form diagram that can compute stresses
+        form = ThrustDiagram.from_data(data['form'])
+        force = ForceDiagram.from_data(data['force'])
+        force.primal = form
+        form.dual = force
+        horizontal_nodal_numpy(form, force, alpha=combination['alpha'], kmax=combination['kmax'])
+        _, scale = vertical_from_zmax_numpy(form, combination['zmax'], kmax=data['settings']['tna.vertical.kmax'])
+        angles = form.edges_attribute('_a', keys=list(form.edges_where({'_is_edge': True})))
+        reactions = [length_vector(form.vertex_attributes(vertex, ['_rx', '_ry', '_rz'])) for vertex in form.anchors()]
+        result.update({
+            'scale': float(scale),
+            'max_angle': float(max(angles)) if angles else 0.0,
+            'max_reaction': float(max(reactions)) if reactions else 0.0,
+            'max_stress': float(max_stress(form)),
+        })
+    except Exception as e:
+        result['status'] = 'error'
+        result['message'] = '{}: {}'.format(type(e).__name__, e)
+    result['time'] = time.time() - t0
+    return result
+
+
+def max_stress(thrust):
+    """Compute the maximum absolute lumped stress of the vertices of a thrust diagram."""
+    _, smin, smax = thrust.vertices_lumped_stress()
+    if smin is None:
+        # no vertex has a lumped stress
+        return 0.0
+    return max(abs(smin), abs(smax))
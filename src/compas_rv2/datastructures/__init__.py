@@ -27,11 +27,24 @@ Diagrams
     ForceDiagram
     ThrustDiagram
 
+
+Indices
+=======
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    EdgeLoopIndex
+    BoundaryAnalysis
+
 """
 from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+from .loops import EdgeLoopIndex
+from .boundaries import BoundaryAnalysis
 from .meshmixin import MeshMixin
 from .subdmesh import SubdMesh
 from .skeleton import Skeleton
@@ -47,5 +60,7 @@ __all__ = [
     'Pattern',
     'FormDiagram',
     'ForceDiagram',
-    'ThrustDiagram'
+    'ThrustDiagram',
+    'EdgeLoopIndex',
+    'BoundaryAnalysis',
 ]
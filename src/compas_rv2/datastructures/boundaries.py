@@ -0,0 +1,211 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from itertools import groupby
+from math import acos
+from math import degrees
+from math import sqrt
+
+
+__all__ = ['BoundaryAnalysis']
+
+
+class BoundaryAnalysis(object):
+    """Analysis of the boundaries of a mesh.
+
+    The boundaries are traced in a single pass over the halfedges of the mesh.
+    The angles at the boundary vertices only depend on the coordinates of the boundary vertices,
+    and are recomputed by :meth:`update` if those change.
+
+    Parameters
+    ----------
+    mesh : :class:`compas.datastructures.Mesh`
+        The mesh.
+
+    Attributes
+    ----------
+    boundaries : list
+        The vertices of the boundaries, as closed loops that start and end with the same vertex,
+        from the longest boundary to the shortest,
+        as :meth:`compas.datastructures.Mesh.vertices_on_boundaries`.
+    neighbors : dict
+        The neighbors of every boundary vertex along the boundary.
+    degree : dict
+        The number of neighbors of every boundary vertex.
+    angles : dict
+        The angle in degrees between the two boundary edges of every boundary vertex.
+        Vertices with a zero-length boundary edge have no angle.
+
+    Examples
+    --------
+    >>> boundary = BoundaryAnalysis(pattern)
+    >>> corners = boundary.corners(tol=170)
+    >>> openings = boundary.split(pattern.vertices_where({'is_anchor': True}))
+
+    """
+
+    def __init__(self, mesh):
+        self.boundaries = []
+        self.neighbors = {}
+        self.degree = {}
+        self.angles = {}
+        self._xyz = None
+        self._corners = {}
+        self._trace(mesh)
+        self.update(mesh)
+
+    def _trace(self, mesh):
+        halfedge = mesh.halfedge
+        outgoing = {}
+        for u, nbrs in halfedge.items():
+            for v, face in nbrs.items():
+                if face is None:
+                    outgoing.setdefault(u, []).append(v)
+                    self.neighbors.setdefault(u, []).append(v)
+                    self.neighbors.setdefault(v, []).append(u)
+        for vertex in self.neighbors:
+            self.degree[vertex] = len(halfedge[vertex])
+            # the neighbors in the order of the halfedges of the vertex, as the mesh
+            nbrs = set(self.neighbors[vertex])
+            self.neighbors[vertex] = [nbr for nbr in halfedge[vertex] if nbr in nbrs]
+        boundaries = []
+        for start in list(outgoing):
+            while outgoing.get(start):
+                vertices = [start]
+                current = start
+                while True:
+                    nbrs = outgoing.get(current)
+                    if not nbrs:
+                        break
+                    current = nbrs.pop()
+                    vertices.append(current)
+                    if current == start:
+                        break
+                boundaries.append(vertices)
+        self.boundaries = sorted(boundaries, key=len, reverse=True)
+
+    def update(self, mesh):
+        """Recompute the angles at the boundary vertices if their coordinates changed.
+
+        Parameters
+        ----------
+        mesh : :class:`compas.datastructures.Mesh`
+            The mesh.
+
+        Returns
+        -------
+        bool
+            True if the angles were recomputed.
+
+        """
+        vertex = mesh.vertex
+        default = mesh.default_vertex_attributes
+        x0, y0, z0 = default.get('x', 0.0), default.get('y', 0.0), default.get('z', 0.0)
+        xyz = {}
+        for key in self.neighbors:
+            attr = vertex[key]
+            xyz[key] = attr.get('x', x0), attr.get('y', y0), attr.get('z', z0)
+        if xyz == self._xyz:
+            return False
+        self._xyz = xyz
+        angles = {}
+        for key, nbrs in self.neighbors.items():
+            if len(nbrs) < 2:
+                continue
+            x, y, z = xyz[key]
+            ax, ay, az = xyz[nbrs[0]]
+            bx, by, bz = xyz[nbrs[1]]
+            ax, ay, az = ax - x, ay - y, az - z
+            bx, by, bz = bx - x, by - y, bz - z
+            length = sqrt((ax * ax + ay * ay + az * az) * (bx * bx + by * by + bz * bz))
+            if not length:
+                continue
+            cosine = (ax * bx + ay * by + az * bz) / length
+            angles[key] = degrees(acos(max(min(cosine, 1.0), -1.0)))
+        self.angles = angles
+        # vertices with two neighbors are always corners,
+        # all other vertices are corners below a threshold on their angle
+        corners = {}
+        for key in self.neighbors:
+            if self.degree[key] == 2:
+                corners[key] = -1.0
+            elif key in angles:
+                corners[key] = angles[key]
+        self._corners = corners
+        return True
+
+    def vertices(self):
+        """The vertices on all boundaries.
+
+        Returns
+        -------
+        list
+
+        """
+        return list(self.neighbors)
+
+    def corners(self, tol=160, boundary=None):
+        """The corners of the boundaries.
+
+        Parameters
+        ----------
+        tol : float, optional
+            The angle in degrees below which a boundary vertex is a corner.
+            Vertices with two neighbors are always corners.
+        boundary : int, optional
+            The index of a boundary in :attr:`boundaries`.
+            Default is all boundaries.
+
+        Returns
+        -------
+        list
+            The corners, in the order of the vertices along the boundaries,
+            from the longest boundary to the shortest.
+
+        """
+        corners = self._corners
+        boundaries = self.boundaries if boundary is None else self.boundaries[boundary:boundary + 1]
+        vertices = []
+        seen = set()
+        for vertices_on_boundary in boundaries:
+            for key in vertices_on_boundary:
+                if key in seen:
+                    continue
+                seen.add(key)
+                if corners.get(key, tol) < tol:
+                    vertices.append(key)
+        return vertices
+
+    def split(self, vertices, boundary=0):
+        """Split a boundary into segments at the given vertices.
+
+        Parameters
+        ----------
+        vertices : iterable
+            The vertices at which the boundary is split, for example the anchors or the corners.
+        boundary : int, optional
+            The index of the boundary in :attr:`boundaries`.
+            Default is the longest boundary.
+
+        Returns
+        -------
+        list
+            The vertices of the segments of more than two vertices.
+            The consecutive segments share their end vertices.
+
+        """
+        if boundary >= len(self.boundaries):
+            return []
+        vertices = set(vertices)
+        segment = []
+        segments = [segment]
+        for vertex in self.boundaries[boundary]:
+            segment.append(vertex)
+            if vertex in vertices:
+                segment = [vertex]
+                segments.append(segment)
+        segments[-1] += segments[0]
+        del segments[0]
+        segments[:] = [segment for segment in segments if len(segment) > 2]
+        return [[key for key, _ in groupby(segment)] for segment in segments]
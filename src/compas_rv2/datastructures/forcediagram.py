@@ -2,8 +2,9 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-from compas.geometry import angle_vectors_xy
-from compas.geometry import cross_vectors
+from math import acos
+from math import degrees
+from math import sqrt
 
 from compas_tna.diagrams import ForceDiagram
 from .meshmixin import MeshMixin
@@ -19,8 +20,79 @@ class ForceDiagram(MeshMixin, ForceDiagram):
     TNA initialisation process.
 
     >>> force = FroceDiagram.from_formdiagram(form)
+
+    The correspondence between the edges of the force diagram and the edges of the
+    form diagram is stored in an edge index, which is rebuilt automatically
+    when the topology of either diagram was invalidated.
+
+    >>> force.primal_edge(edge)
+    >>> force.dual_edge(form_edge)
     """
 
+    def __init__(self, *args, **kwargs):
+        super(ForceDiagram, self).__init__(*args, **kwargs)
+        self._primal_edge = {}
+        self._dual_edge = {}
+        self._edge_index = None
+
+    @classmethod
+    def from_formdiagram(cls, formdiagram):
+        """Construct a force diagram from a form diagram.
+
+        Parameters
+        ----------
+        formdiagram : FormDiagram
+            The form diagram.
+
+        Returns
+        -------
+        ForceDiagram
+            The dual force diagram, with the edge index to the form diagram already built.
+        """
+        force = super(ForceDiagram, cls).from_formdiagram(formdiagram)
+        force.update_edge_index()
+        return force
+
+    def _edge_index_key(self):
+        primal = self.primal
+        versions = getattr(primal, '_versions', None)
+        return id(primal), self._versions()['topology'], versions()['topology'] if versions else None
+
+    def update_edge_index(self):
+        """Rebuild the map between the edges of this diagram and the edges of the primal.
+
+        Notes
+        -----
+        The index is built in a single pass over the halfedges of the primal.
+        It is stored with the versions of the topology of both diagrams,
+        and rebuilt automatically by :meth:`primal_edge` and :meth:`dual_edge`
+        after the topology of either diagram was invalidated
+        (see :meth:`compas_rv2.datastructures.MeshMixin.invalidate`).
+        """
+        halfedge = self.primal.halfedge
+        primal_edge = {}
+        for u in halfedge:
+            for v in halfedge[u]:
+                f1 = halfedge[u][v]
+                f2 = halfedge[v][u]
+                if f1 is None or f2 is None:
+                    continue
+                primal_edge[f1, f2] = u, v
+        dual_edge = {}
+        for f1, f2 in self.edges():
+            if (f1, f2) not in primal_edge:
+                continue
+            u, v = primal_edge[f1, f2]
+            dual_edge[u, v] = f1, f2
+            dual_edge[v, u] = f1, f2
+        self._primal_edge = primal_edge
+        self._dual_edge = dual_edge
+        self._edge_index = self._edge_index_key()
+
+    def _check_edge_index(self):
+        if self._edge_index != self._edge_index_key():
+            self.update_edge_index()
+
     def primal_edge(self, key):
         """Get the corresponding edge in the FormDiagram.
 
@@ -40,21 +112,97 @@ class ForceDiagram(MeshMixin, ForceDiagram):
             If the dual edge does not exist.
 
         """
-        f1, f2 = key
-        for u, v in self.primal.face_halfedges(f1):
-            if self.primal.halfedge[v][u] == f2:
-                return u, v
-        raise KeyError(key)
+        self._check_edge_index()
+        return self._primal_edge[tuple(key)]
+
+    def dual_edge(self, key):
+        """Get the corresponding edge in this diagram for an edge of the FormDiagram.
+
+        Parameters
+        ----------
+        key : tuple
+            The identifier of the edge in the other/primal diagram.
+
+        Returns
+        -------
+        tuple
+            The identifier of the edge in this diagram.
+
+        Raises
+        ------
+        KeyError
+            If the primal edge has no corresponding edge in this diagram,
+            for example because it is on the boundary.
+
+        """
+        self._check_edge_index()
+        return self._dual_edge[tuple(key)]
 
     def update_angle_deviations(self):
         """Compute the angle deviation with the corresponding edge in the FormDiagram.
+
+        Returns
+        -------
+        tuple
+            The maximum and the mean angle deviation, in degrees.
+
+        Notes
+        -----
+        The edge vectors of both diagrams are gathered in one pass,
+        all deviations are computed in a single batch,
+        and the results are assigned directly to the attribute dicts of the edges
+        and recorded with :meth:`modified`.
         """
-        for edge in self.edges():
-            edge_ = self.primal_edge(edge)
-            uv = self.edge_vector(*edge)
-            uv_ = self.primal.edge_vector(*edge_)
-            a = angle_vectors_xy(uv, cross_vectors(uv_, (0, 0, 1)), deg=True)
-            if self.primal.edge_attribute(edge_, '_is_tension'):
-                a = 180 - a
-            self.edge_attribute(edge, '_a', a)
-            self.primal.edge_attribute(edge_, '_a', a)
+        primal = self.primal
+        xy = {key: (attr['x'], attr['y']) for key, attr in self.vertices(True)}
+        xy_ = {key: (attr['x'], attr['y']) for key, attr in primal.vertices(True)}
+        edges, attrs = zip(*self.edges(True)) if self.number_of_edges() else ((), ())
+        edges_ = [self.primal_edge(edge) for edge in edges]
+        uv = [(xy[v][0] - xy[u][0], xy[v][1] - xy[u][1]) for u, v in edges]
+        # the primal vectors are rotated by -90 degrees
+        # this is the same as crossing them with the Z axis
+        uv_ = [(xy_[v][1] - xy_[u][1], xy_[u][0] - xy_[v][0]) for u, v in edges_]
+        angles = angles_vectors_xy(uv, uv_)
+        attrs_ = [primal.edge_attributes(edge_) for edge_ in edges_]
+        for index, attr_ in enumerate(attrs_):
+            if attr_['_is_tension']:
+                angles[index] = 180 - angles[index]
+        for attr, attr_, a in zip(attrs, attrs_, angles):
+            attr['_a'] = a
+            attr_['_a'] = a
+        self.modified('edges', ['_a'], edges)
+        if hasattr(primal, 'modified'):
+            primal.modified('edges', ['_a'], edges_)
+        if not angles:
+            return 0.0, 0.0
+        return max(angles), sum(angles) / len(angles)
+
+
+def angles_vectors_xy(vectors, others, tol=1e-4):
+    """Compute the angles between corresponding pairs of XY vectors.
+
+    Parameters
+    ----------
+    vectors : list
+        A list of XY vectors.
+    others : list
+        A list of XY vectors of the same length.
+    tol : float, optional
+        Tolerance for the product of the lengths of the vectors of a pair.
+        Default is ``1e-4``, as in :func:`compas.geometry.angle_vectors_xy`.
+
+    Returns
+    -------
+    list
+        The angles in degrees.
+        Pairs with a (nearly) zero-length vector have an angle of zero.
+    """
+    angles = []
+    for (x, y), (x_, y_) in zip(vectors, others):
+        ll = sqrt((x ** 2 + y ** 2) * (x_ ** 2 + y_ ** 2))
+        if ll < tol:
+            angles.append(0.0)
+            continue
+        c = (x * x_ + y * y_) / ll
+        angles.append(degrees(acos(max(min(c, 1.0), -1.0))))
+    return angles
@@ -0,0 +1,200 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+
+__all__ = ['EdgeLoopIndex']
+
+
+class EdgeLoopIndex(object):
+    """Partition of the edges of a mesh into edge loops.
+
+    The loops are traced with the same rules as :meth:`compas_rv2.datastructures.MeshMixin.edge_loop`.
+    Loops through interior edges continue straight through vertices with four neighbours.
+    Loops through boundary edges follow the boundary, and stop at corners with two neighbours.
+    All loops stop at fixed vertices.
+    Every edge is visited a constant number of times,
+    after which the loop of an edge is a dict lookup.
+
+    Parameters
+    ----------
+    mesh : :class:`compas.datastructures.Mesh`
+        The mesh.
+
+    Attributes
+    ----------
+    loops : list
+        The loops, as lists of oriented edges.
+    closed : list
+        Flags indicating which loops are closed.
+        A loop through a fixed vertex is open, and starts and ends at that vertex.
+
+    Examples
+    --------
+    >>> index = EdgeLoopIndex(pattern)
+    >>> index.edge_loop((0, 1))
+    [(0, 1), (1, 2), (2, 3)]
+
+    """
+
+    def __init__(self, mesh):
+        self.loops = []
+        self.closed = []
+        self._edge_loop = {}
+        self._build(mesh)
+
+    def _build(self, mesh):
+        halfedge = mesh.halfedge
+        fixed = set(vertex for vertex, attr in mesh.vertices(True) if attr.get('is_fixed'))
+        ordered = {}
+
+        def on_boundary(u, v):
+            return halfedge[u][v] is None or halfedge[v][u] is None
+
+        def step_interior(previous, current):
+            if current in fixed:
+                return None
+            nbrs = ordered.get(current)
+            if nbrs is None:
+                nbrs = ordered[current] = mesh.vertex_neighbors(current, ordered=True)
+            if len(nbrs) != 4:
+                return None
+            return nbrs[nbrs.index(previous) - 2]
+
+        def step_boundary(previous, current):
+            if current in fixed:
+                return None
+            nbrs = list(halfedge[current])
+            if len(nbrs) == 2:
+                return None
+            for nbr in nbrs:
+                if nbr != previous and on_boundary(current, nbr):
+                    return nbr
+            return None
+
+        for u, v in mesh.edges():
+            if (u, v) in self._edge_loop:
+                continue
+            boundary = on_boundary(u, v)
+            step = step_boundary if boundary else step_interior
+            loop = self._trace(u, v, step)
+            index = len(self.loops)
+            self.loops.append(loop)
+            self.closed.append(loop[0][0] == loop[-1][1] and step(*loop[-1]) == loop[0][1])
+            # an interior loop can run onto the boundary, and vice versa,
+            # but the loop of such an edge is traced with the rules of its own kind
+            for position, (a, b) in enumerate(loop):
+                if on_boundary(a, b) != boundary or (a, b) in self._edge_loop:
+                    continue
+                self._edge_loop[a, b] = index, position, True
+                self._edge_loop[b, a] = index, position, False
+
+    def _trace(self, u, v, step):
+        edges = [(v, u)]
+        previous, current = v, u
+        while current != v:
+            nbr = step(previous, current)
+            if nbr is None:
+                break
+            previous, current = current, nbr
+            edges.append((previous, current))
+        edges[:] = [(b, a) for a, b in edges[::-1]]
+        if edges[0][0] == edges[-1][1]:
+            return edges
+        previous, current = u, v
+        while True:
+            nbr = step(previous, current)
+            if nbr is None:
+                break
+            previous, current = current, nbr
+            edges.append((previous, current))
+        return edges
+
+    def loop_index(self, edge):
+        """The index of the loop of an edge in :attr:`loops`, or None if the edge is not in the mesh."""
+        value = self._edge_loop.get(tuple(edge))
+        if value is None:
+            return None
+        return value[0]
+
+    def edge_loop(self, edge):
+        """The loop of an edge, oriented along the edge.
+
+        Parameters
+        ----------
+        edge : tuple
+            The edge, in either orientation.
+
+        Returns
+        -------
+        list
+            The edges of the loop.
+            If the loop is closed, the given edge is the last edge of the loop.
+
+        Raises
+        ------
+        KeyError
+            If the edge is not in the mesh.
+
+        """
+        u, v = edge
+        index, position, forward = self._edge_loop[u, v]
+        loop = self.loops[index]
+        if not forward:
+            loop = [(b, a) for a, b in loop[::-1]]
+            position = len(loop) - 1 - position
+        if self.closed[index]:
+            return loop[position + 1:] + loop[:position + 1]
+        return list(loop)
+
+    def edge_loops(self, edges):
+        """The edges of all loops through the given edges.
+
+        Parameters
+        ----------
+        edges : iterable
+            The edges, in either orientation.
+
+        Returns
+        -------
+        list
+            The edges of the loops, without duplicates in either orientation.
+
+        """
+        loops = set()
+        seen = set()
+        result = []
+        for u, v in edges:
+            index = self._edge_loop[u, v][0]
+            if index in loops:
+                continue
+            loops.add(index)
+            for a, b in self.loops[index]:
+                if (a, b) not in seen:
+                    seen.add((a, b))
+                    seen.add((b, a))
+                    result.append((a, b))
+        return result
+
+    def vertices_on_edge_loops(self, edges):
+        """The vertices of all loops through the given edges.
+
+        Parameters
+        ----------
+        edges : iterable
+            The edges, in either orientation.
+
+        Returns
+        -------
+        list
+            The vertices, without duplicates.
+
+        """
+        seen = set()
+        result = []
+        for u, v in self.edge_loops(edges):
+            for vertex in (u, v):
+                if vertex not in seen:
+                    seen.add(vertex)
+                    result.append(vertex)
+        return result
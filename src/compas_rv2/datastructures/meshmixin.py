@@ -2,102 +2,350 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-from compas.geometry import angle_vectors
+from .boundaries import BoundaryAnalysis
+from .loops import EdgeLoopIndex
 
 
 class MeshMixin(object):
-    """Mixin for all mesh-based data structure in RV2."""
+    """Mixin for all mesh-based data structure in RV2.
+
+    The mixin caches analyses of the mesh, such as the edge loops and the boundaries.
+    The caches are invalidated by versions of the parts of the mesh they depend on:
+    the topology, the fixity of the vertices, the geometry, and the loads.
+    The versions are incremented by the methods that change the topology,
+    and by the attribute setters for the attributes in :attr:`CHANGES`,
+    such that a cached analysis is returned after comparing a few integers.
+
+    The same methods record the modified vertices, edges and faces,
+    such that the scene only has to redraw those (see :meth:`pop_changes`).
+    Code that writes the attribute dicts directly has to call :meth:`modified`.
+
+    """
+
+    #: The kind of change per watched vertex or face attribute.
+    CHANGES = {
+        'is_fixed': 'fixity',
+        'x': 'geometry',
+        'y': 'geometry',
+        'z': 'geometry',
+        'xy': 'geometry',
+        'xyz': 'geometry',
+        '_is_loaded': 'loads',
+    }
+
+    # ==========================================================================
+    # versions
+    # ==========================================================================
+
+    def _versions(self):
+        versions = self.__dict__.get('_cache_versions')
+        if versions is None:
+            versions = self._cache_versions = {'topology': 0, 'fixity': 0, 'geometry': 0, 'loads': 0}
+        return versions
+
+    def invalidate(self, *changes):
+        """Invalidate the cached analyses that depend on the given parts of the mesh.
+
+        Parameters
+        ----------
+        changes : str
+            The changed parts: ``'topology'``, ``'fixity'``, ``'geometry'`` or ``'loads'``.
+            Default is all parts.
+
+        Examples
+        --------
+        >>> mesh.invalidate('geometry')
+
+        """
+        versions = self._versions()
+        for change in changes or list(versions):
+            versions[change] += 1
+
+    def invalidate_attributes(self, names):
+        """Invalidate the cached analyses that depend on the given vertex or face attributes.
+
+        Parameters
+        ----------
+        names : list or str
+            The names of the changed attributes, as in :meth:`vertex_attributes`.
+            A string is a single name, for example ``'is_fixed'``, or ``'xyz'`` for all coordinates.
+            None invalidates all analyses.
+
+        """
+        if names is None:
+            self.invalidate()
+            return
+        if isinstance(names, str):
+            names = [names]
+        changes = set(self.CHANGES[name] for name in names if name in self.CHANGES)
+        if changes:
+            self.invalidate(*changes)
+
+    def cached(self, name, changes, factory):
+        """Get a cached value, or compute and cache it if the parts of the mesh it depends on changed.
+
+        Parameters
+        ----------
+        name : str
+            The name of the cached value.
+        changes : tuple
+            The parts of the mesh the value depends on, as in :meth:`invalidate`.
+        factory : callable
+            Computes the value.
+
+        Returns
+        -------
+        object
+            The value.
+
+        """
+        versions = self._versions()
+        key = tuple(versions[change] for change in changes)
+        cache = self.__dict__.get('_cache_values')
+        if cache is None:
+            cache = self._cache_values = {}
+        item = cache.get(name)
+        if item is None or item[0] != key:
+            item = cache[name] = key, factory()
+        return item[1]
+
+    # ==========================================================================
+    # changes
+    # ==========================================================================
+
+    def modified(self, section=None, names=None, keys=None):
+        """Record a modification of the mesh, and invalidate the cached analyses that depend on it.
+
+        Parameters
+        ----------
+        section : {'vertices', 'edges', 'faces'}, optional
+            The modified section.
+            Default is all of the mesh, for example after a change of the topology.
+        names : list or str, optional
+            The names of the modified attributes, as in :meth:`invalidate_attributes`.
+            Default is all of the mesh.
+        keys : list, optional
+            The modified vertices, edges or faces.
+            Default is all elements of the section.
+
+        Examples
+        --------
+        >>> for key, attr in mesh.vertices(True):
+        ...     attr['z'] = 0.0
+        >>> mesh.modified('vertices', ['z'])
+
+        """
+        changes = self.__dict__.get('_changes')
+        if section is None or names is None:
+            self.invalidate()
+            if changes is not None:
+                changes['full'] = True
+            return
+        if isinstance(names, str):
+            names = list(names) if names in ('xy', 'xyz') else [names]
+        self.invalidate_attributes(names)
+        if changes is None or changes['full']:
+            return
+        if keys is None:
+            keys = getattr(self, section)()
+        if section == 'edges':
+            keys = [tuple(sorted(edge)) for edge in keys]
+        elements = changes[section]
+        for key in keys:
+            if key in elements:
+                elements[key].update(names)
+            else:
+                elements[key] = set(names)
+
+    def pop_changes(self):
+        """Get the modifications recorded since the previous call, and start a new record.
+
+        The modifications are recorded only after the first call,
+        and only for a single reader, such as the change tracker of a scene object.
+
+        Returns
+        -------
+        dict or None
+            ``'full'`` is True if all of the mesh was modified, for example its topology.
+            Otherwise ``'vertices'``, ``'edges'`` and ``'faces'`` map the modified elements
+            to the names of their modified attributes,
+            with the edges in the orientation of the edge attributes.
+            None if the modifications were not recorded before the call.
+
+        """
+        changes = self.__dict__.get('_changes')
+        self._changes = {'full': False, 'vertices': {}, 'edges': {}, 'faces': {}}
+        return changes
+
+    # ==========================================================================
+    # topology
+    # ==========================================================================
+
+    def add_vertex(self, *args, **kwargs):
+        key = super(MeshMixin, self).add_vertex(*args, **kwargs)
+        self.modified()
+        return key
+
+    def add_face(self, *args, **kwargs):
+        key = super(MeshMixin, self).add_face(*args, **kwargs)
+        self.modified()
+        return key
+
+    def delete_vertex(self, key):
+        super(MeshMixin, self).delete_vertex(key)
+        self.modified()
+
+    def delete_face(self, fkey):
+        super(MeshMixin, self).delete_face(fkey)
+        self.modified()
+
+    def clear(self):
+        super(MeshMixin, self).clear()
+        self.modified()
+
+    def collapse_edge(self, *args, **kwargs):
+        result = super(MeshMixin, self).collapse_edge(*args, **kwargs)
+        self.modified()
+        return result
+
+    def split_edge(self, *args, **kwargs):
+        result = super(MeshMixin, self).split_edge(*args, **kwargs)
+        self.modified()
+        return result
+
+    def split_face(self, *args, **kwargs):
+        result = super(MeshMixin, self).split_face(*args, **kwargs)
+        self.modified()
+        return result
+
+    # ==========================================================================
+    # attributes
+    # ==========================================================================
+
+    def vertex_attribute(self, key, name, value=None):
+        result = super(MeshMixin, self).vertex_attribute(key, name, value)
+        if value is not None:
+            self.modified('vertices', [name], [key])
+        return result
+
+    def vertex_attributes(self, key, names=None, values=None):
+        result = super(MeshMixin, self).vertex_attributes(key, names, values)
+        if values is not None:
+            self.modified('vertices', names, [key])
+        return result
+
+    def vertices_attribute(self, name, value=None, keys=None):
+        keys = list(keys) if keys is not None else None
+        result = super(MeshMixin, self).vertices_attribute(name, value, keys)
+        if value is not None:
+            self.modified('vertices', [name], keys or None)
+        return result
+
+    def vertices_attributes(self, names=None, values=None, keys=None):
+        keys = list(keys) if keys is not None else None
+        result = super(MeshMixin, self).vertices_attributes(names, values, keys)
+        if values is not None:
+            self.modified('vertices', names, keys or None)
+        return result
+
+    def edge_attribute(self, edge, name, value=None):
+        result = super(MeshMixin, self).edge_attribute(edge, name, value)
+        if value is not None:
+            self.modified('edges', [name], [edge])
+        return result
+
+    def edge_attributes(self, edge, names=None, values=None):
+        result = super(MeshMixin, self).edge_attributes(edge, names, values)
+        if values is not None:
+            self.modified('edges', names, [edge])
+        return result
+
+    def edges_attribute(self, name, value=None, keys=None):
+        keys = list(keys) if keys is not None else None
+        result = super(MeshMixin, self).edges_attribute(name, value, keys)
+        if value is not None:
+            self.modified('edges', [name], keys or None)
+        return result
+
+    def edges_attributes(self, names=None, values=None, keys=None):
+        keys = list(keys) if keys is not None else None
+        result = super(MeshMixin, self).edges_attributes(names, values, keys)
+        if values is not None:
+            self.modified('edges', names, keys or None)
+        return result
+
+    def face_attribute(self, key, name, value=None):
+        result = super(MeshMixin, self).face_attribute(key, name, value)
+        if value is not None:
+            self.modified('faces', [name], [key])
+        return result
+
+    def face_attributes(self, key, names=None, values=None):
+        result = super(MeshMixin, self).face_attributes(key, names, values)
+        if values is not None:
+            self.modified('faces', names, [key])
+        return result
+
+    def faces_attribute(self, name, value=None, keys=None):
+        keys = list(keys) if keys is not None else None
+        result = super(MeshMixin, self).faces_attribute(name, value, keys)
+        if value is not None:
+            self.modified('faces', [name], keys or None)
+        return result
+
+    def faces_attributes(self, names=None, values=None, keys=None):
+        keys = list(keys) if keys is not None else None
+        result = super(MeshMixin, self).faces_attributes(names, values, keys)
+        if values is not None:
+            self.modified('faces', names, keys or None)
+        return result
+
+    # ==========================================================================
+    # geometry
+    # ==========================================================================
+
+    def smooth_area(self, *args, **kwargs):
+        super(MeshMixin, self).smooth_area(*args, **kwargs)
+        self.modified('vertices', 'xyz')
+
+    def smooth_centroid(self, *args, **kwargs):
+        super(MeshMixin, self).smooth_centroid(*args, **kwargs)
+        self.modified('vertices', 'xyz')
+
+    # ==========================================================================
+    # analyses
+    # ==========================================================================
+
+    def edge_loop_index(self):
+        """The partition of the edges of the mesh into edge loops.
+
+        The index is cached, and only rebuilt when the topology or the fixed vertices of the mesh change.
+
+        Returns
+        -------
+        :class:`compas_rv2.datastructures.EdgeLoopIndex`
+
+        """
+        return self.cached('edge_loop_index', ('topology', 'fixity'), lambda: EdgeLoopIndex(self))
 
     def edge_loop(self, uv):
-        if self.is_edge_on_boundary(*uv):
-            return self._edge_loop_on_boundary(uv)
-
-        edges = []
-        current, previous = uv
-        edges.append((previous, current))
-
-        while True:
-            if current == uv[1]:
-                break
-            if self.vertex_attribute(current, 'is_fixed'):
-                break
-            nbrs = self.vertex_neighbors(current, ordered=True)
-            if len(nbrs) != 4:
-                break
-            i = nbrs.index(previous)
-            previous = current
-            current = nbrs[i - 2]
-            edges.append((previous, current))
-
-        edges[:] = [(u, v) for v, u in edges[::-1]]
-
-        if edges[0][0] == edges[-1][1]:
-            return edges
-
-        previous, current = uv
-        while True:
-            if self.vertex_attribute(current, 'is_fixed'):
-                break
-            nbrs = self.vertex_neighbors(current, ordered=True)
-            if len(nbrs) != 4:
-                break
-            i = nbrs.index(previous)
-            previous = current
-            current = nbrs[i - 2]
-            edges.append((previous, current))
-
-        return edges
-
-    def _edge_loop_on_boundary(self, uv):
-        edges = []
-        current, previous = uv
-        edges.append((previous, current))
-
-        while True:
-            if current == uv[1]:
-                break
-            if self.vertex_attribute(current, 'is_fixed'):
-                break
-            nbrs = self.vertex_neighbors(current)
-            if len(nbrs) == 2:
-                break
-            nbr = None
-            for temp in nbrs:
-                if temp == previous:
-                    continue
-                if self.is_edge_on_boundary(current, temp):
-                    nbr = temp
-                    break
-            if nbr is None:
-                break
-            previous, current = current, nbr
-            edges.append((previous, current))
-
-        edges[:] = [(u, v) for v, u in edges[::-1]]
-
-        if edges[0][0] == edges[-1][1]:
-            return edges
-
-        previous, current = uv
-        while True:
-            if self.vertex_attribute(current, 'is_fixed'):
-                break
-            nbrs = self.vertex_neighbors(current)
-            if len(nbrs) == 2:
-                break
-            nbr = None
-            for temp in nbrs:
-                if temp == previous:
-                    continue
-                if self.is_edge_on_boundary(current, temp):
-                    nbr = temp
-                    break
-            if nbr is None:
-                break
-            previous, current = current, nbr
-            edges.append((previous, current))
-
-        return edges
+        return self.edge_loop_index().edge_loop(uv)
+
+    def edge_loops(self, edges):
+        """The edges of all loops through the given edges, with a single lookup of the loop index.
+
+        Parameters
+        ----------
+        edges : list
+            The edges.
+
+        Returns
+        -------
+        list
+            The edges of the loops, without duplicates.
+
+        """
+        return self.edge_loop_index().edge_loops(edges)
 
     # def edge_strip(self, uv):
     #     edges = []
@@ -137,18 +385,49 @@ class MeshMixin(object):
             vertices.append(edges[-1][1])
         return vertices
 
+    def vertices_on_edge_loops(self, edges):
+        """The vertices of all loops through the given edges, with a single lookup of the loop index.
+
+        Parameters
+        ----------
+        edges : list
+            The edges.
+
+        Returns
+        -------
+        list
+            The vertices of the loops, without duplicates.
+
+        """
+        return self.edge_loop_index().vertices_on_edge_loops(edges)
+
+    def boundary_analysis(self):
+        """The analysis of the boundaries of the mesh.
+
+        The boundaries are traced again only when the topology of the mesh changes,
+        and the angles at the boundary vertices only when the geometry changes.
+
+        Returns
+        -------
+        :class:`compas_rv2.datastructures.BoundaryAnalysis`
+
+        """
+        analysis = self.cached('boundary_analysis', ('topology',), lambda: BoundaryAnalysis(self))
+        self.cached('boundary_angles', ('topology', 'geometry'), lambda: analysis.update(self))
+        return analysis
+
     def corner_vertices(self, tol=160):
-        vkeys = []
-        for key in self.vertices_on_boundary():
-            if self.vertex_degree(key) == 2:
-                vkeys.append(key)
-            else:
-                nbrs = []
-                for nkey in self.vertex_neighbors(key):
-                    if self.is_edge_on_boundary(key, nkey):
-                        nbrs.append(nkey)
-                u = (self.edge_vector(key, nbrs[0]))
-                v = (self.edge_vector(key, nbrs[1]))
-                if angle_vectors(u, v, deg=True) < tol:
-                    vkeys.append(key)
-        return vkeys
+        """The corners of the longest boundary, in the order of the boundary.
+
+        Parameters
+        ----------
+        tol : float, optional
+            The angle in degrees below which a boundary vertex is a corner.
+            Vertices with two neighbors are always corners.
+
+        Returns
+        -------
+        list
+
+        """
+        return self.boundary_analysis().corners(tol, boundary=0)
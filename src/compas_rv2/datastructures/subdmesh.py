@@ -2,8 +2,6 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-import Rhino
-
 from itertools import groupby
 
 from compas.datastructures import Mesh
@@ -12,8 +10,6 @@ from compas.datastructures.mesh.subdivision import mesh_fast_copy
 
 from compas.utilities import geometric_key
 
-from compas_rhino.geometry import RhinoSurface
-
 
 class SubdMesh(Mesh):
 
@@ -38,6 +34,9 @@ class SubdMesh(Mesh):
 
     @classmethod
     def from_guid(cls, guid):
+        import Rhino
+        from compas_rhino.geometry import RhinoSurface
+
         rhinosurface = RhinoSurface.from_guid(guid)
         brep = Rhino.Geometry.Brep.TryConvertBrep(rhinosurface.geometry)
         subdmesh = rhinosurface.to_compas_mesh(cls=cls, cleanup=False)
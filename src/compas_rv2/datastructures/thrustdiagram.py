@@ -2,6 +2,8 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+from math import sqrt
+
 from compas.geometry import subtract_vectors
 from compas.geometry import length_vector
 from compas.geometry import cross_vectors
@@ -9,6 +11,39 @@ from compas.geometry import cross_vectors
 from .formdiagram import FormDiagram
 
 
+def _polygon_center(points):
+    """Compute the centroid of the surface of a polygon, as :func:`compas.geometry.centroid_polygon`, without intermediate lists."""
+    n = len(points)
+    ox = sum(point[0] for point in points) / n
+    oy = sum(point[1] for point in points) / n
+    oz = sum(point[2] for point in points) / n
+    if n == 3:
+        return [ox, oy, oz]
+    A2 = cx = cy = cz = 0.0
+    n0 = None
+    ax, ay, az = points[-1]
+    for bx, by, bz in points:
+        # the triangle of the centroid of the vertices and an edge, weighted by its (signed) area
+        oax, oay, oaz = ax - ox, ay - oy, az - oz
+        obx, oby, obz = bx - ox, by - oy, bz - oz
+        nx = oay * obz - oaz * oby
+        ny = oaz * obx - oax * obz
+        nz = oax * oby - oay * obx
+        a2 = sqrt(nx * nx + ny * ny + nz * nz)
+        if n0 is None:
+            n0 = nx, ny, nz
+        elif nx * n0[0] + ny * n0[1] + nz * n0[2] <= 0:
+            a2 = -a2
+        A2 += a2
+        cx += a2 * (ox + ax + bx) / 3
+        cy += a2 * (oy + ay + by) / 3
+        cz += a2 * (oz + az + bz) / 3
+        ax, ay, az = bx, by, bz
+    if A2 == 0:
+        return list(points[0])
+    return [cx / A2, cy / A2, cz / A2]
+
+
 class ThrustDiagram(FormDiagram):
     """The RV2 ThrustDiagram."""
 
@@ -38,7 +73,76 @@ class ThrustDiagram(FormDiagram):
                     area += length_vector(cross_vectors(v1, v3))
         return 0.25 * area
 
+    def vertices_tributary_area(self):
+        """Compute the tributary areas of all vertices in one pass over the faces.
+
+        Returns
+        -------
+        dict
+            The tributary area per vertex.
+
+        Notes
+        -----
+        The result is the same as :meth:`vertex_tributary_area` for every vertex,
+        but the centroid of every face is computed only once.
+        The areas are cached on the diagram,
+        and recomputed only if the topology, the geometry or the loads of the diagram changed
+        (see :meth:`compas_rv2.datastructures.MeshMixin.invalidate`).
+        Do not modify the returned dict.
+
+        """
+        return self.cached('tributary_areas', ('topology', 'geometry', 'loads'), self._tributary_areas)
+
+    def _tributary_areas(self):
+        xyz = {vertex: (attr['x'], attr['y'], attr['z']) for vertex, attr in self.vertices(True)}
+        areas = {vertex: 0.0 for vertex in xyz}
+        for face, attr in self.faces(True):
+            if not attr['_is_loaded']:
+                continue
+            vertices = self.face[face]
+            n = len(vertices)
+            points = [xyz[vertex] for vertex in vertices]
+            cx = sum(point[0] for point in points) / n
+            cy = sum(point[1] for point in points) / n
+            cz = sum(point[2] for point in points) / n
+            for i in range(n):
+                ax, ay, az = points[i - 1]
+                bx, by, bz = points[i]
+                # the triangle between the edge and the centroid is split equally between the vertices of the edge
+                ux, uy, uz = bx - ax, by - ay, bz - az
+                vx, vy, vz = cx - ax, cy - ay, cz - az
+                wx, wy, wz = cx - bx, cy - by, cz - bz
+                areas[vertices[i - 1]] += 0.25 * sqrt((uy * vz - uz * vy) ** 2 + (uz * vx - ux * vz) ** 2 + (ux * vy - uy * vx) ** 2)
+                areas[vertices[i]] += 0.25 * sqrt((uy * wz - uz * wy) ** 2 + (uz * wx - ux * wz) ** 2 + (ux * wy - uy * wx) ** 2)
+        return areas
+
+    def vertices_selfweight(self):
+        """Compute the self-weight of all vertices.
+
+        Returns
+        -------
+        dict
+            The self-weight per vertex, as the tributary area times the thickness ``t``.
+
+        """
+        areas = self.vertices_tributary_area()
+        return {vertex: areas[vertex] * attr['t'] for vertex, attr in self.vertices(True)}
+
     def vertex_lumped_stress(self, vertex):
+        """Compute the lumped stress at a vertex.
+
+        Parameters
+        ----------
+        vertex : int
+            The identifier of the vertex.
+
+        Returns
+        -------
+        float or None
+            The average stress of the edges connected to the vertex,
+            or None if none of these edges carry a force through a loaded face.
+
+        """
         stress = 0
         neighbors = self.vertex_neighbors(vertex)
         count = 0
@@ -71,4 +175,59 @@ class ThrustDiagram(FormDiagram):
                 stress += edge_force / edge_area
                 count += 1
 
+        if not count:
+            return None
         return stress / count
+
+    def vertices_lumped_stress(self):
+        """Compute the lumped stress of all vertices in one pass over the edges.
+
+        Returns
+        -------
+        tuple
+            A dict with the lumped stress per vertex,
+            and the minimum and maximum stress, for colouring.
+            Vertices without stress, i.e. without edges that carry a force through a loaded face,
+            are not included.
+            The minimum and maximum are None if no vertex has a stress.
+
+        Notes
+        -----
+        The stress of every vertex is the same as :meth:`vertex_lumped_stress`,
+        but the center of every loaded face and the stress of every edge are computed only once.
+
+        """
+        xyz = {vertex: [attr['x'], attr['y'], attr['z']] for vertex, attr in self.vertices(True)}
+        thickness = {vertex: attr['t'] for vertex, attr in self.vertices(True)}
+        centers = {}
+        for face, attr in self.faces(True):
+            if attr['_is_loaded']:
+                centers[face] = _polygon_center([xyz[vertex] for vertex in self.face[face]])
+        total = {}
+        count = {}
+        for (u, v), attr in self.edges(True):
+            force = attr['_f']
+            if abs(force) <= 0:
+                continue
+            a = xyz[u]
+            b = xyz[v]
+            mx = 0.5 * (a[0] + b[0])
+            my = 0.5 * (a[1] + b[1])
+            mz = 0.5 * (a[2] + b[2])
+            t = 0.5 * (thickness[u] + thickness[v])
+            edge_area = 0
+            for face in (self.halfedge[u][v], self.halfedge[v][u]):
+                if face in centers:
+                    c = centers[face]
+                    area = sqrt((c[0] - mx) ** 2 + (c[1] - my) ** 2 + (c[2] - mz) ** 2) * t
+                    if area > 0:
+                        edge_area += area
+            if edge_area > 0:
+                stress = force / edge_area
+                for vertex in (u, v):
+                    total[vertex] = total.get(vertex, 0) + stress
+                    count[vertex] = count.get(vertex, 0) + 1
+        stresses = {vertex: total[vertex] / count[vertex] for vertex in total}
+        if not stresses:
+            return stresses, None, None
+        return stresses, min(stresses.values()), max(stresses.values())
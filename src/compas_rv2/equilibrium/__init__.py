@@ -0,0 +1,124 @@
+"""
+********************************************************************************
+compas_rv2.equilibrium
+********************************************************************************
+
+.. currentmodule:: compas_rv2.equilibrium
+
+Array-based equilibrium solvers for RV2 diagrams.
+
+The diagrams are packed into arrays and sparse matrices once,
+all iterations are computed with array operations,
+and the results are written back to the diagrams in one pass.
+
+The ``_numpy`` solvers are not available in Rhino (IronPython).
+In Rhino, the solvers are called through the executors of :mod:`compas_rv2.execution`,
+which send only the packed arrays of the diagrams to the RPC server.
+
+>>> executor = LocalExecutor() if not compas.IPY else ProxyExecutor(proxy)
+>>> result = executor.horizontal(form, force, alpha=100, kmax=500)
+
+Horizontal
+==========
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    horizontal_nodal_numpy
+    horizontal_nodal_arrays_numpy
+    HorizontalArrays
+
+Vertical
+========
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    VerticalArrays
+    vertical_from_zmax_numpy
+    vertical_from_zmax_arrays_numpy
+    vertical_topology
+
+Force density
+=============
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    fd_arrays_numpy
+    fd_topology
+    relax_numpy
+
+Openings
+========
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    opening_sag
+    fit_opening_sags
+
+Topology cache
+==============
+
+The assembled matrices of the solvers (connectivity matrices, free and fixed vertices, and factorisations)
+are cached per topology, such that repeated solves of the same diagram after a change of
+coordinates, loads or force densities do not assemble them again.
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    SolverTopology
+    ProductPattern
+    TopologyCache
+    topology_key
+
+"""
+from __future__ import absolute_import
+
+import compas
+
+from .sag import opening_sag
+from .sag import fit_opening_sags
+
+if not compas.IPY:
+    from .horizontal_numpy import horizontal_nodal_numpy
+    from .horizontal_numpy import horizontal_nodal_arrays_numpy
+    from .horizontal_numpy import HorizontalArrays
+    from .topology_numpy import SolverTopology
+    from .topology_numpy import ProductPattern
+    from .topology_numpy import TopologyCache
+    from .topology_numpy import TOPOLOGIES
+    from .topology_numpy import topology_key
+    from .vertical_numpy import VerticalArrays
+    from .vertical_numpy import vertical_topology
+    from .vertical_numpy import vertical_from_zmax_numpy
+    from .vertical_numpy import vertical_from_zmax_arrays_numpy
+    from .relax_numpy import fd_topology
+    from .relax_numpy import fd_arrays_numpy
+    from .relax_numpy import relax_numpy
+
+__all__ = [
+    'horizontal_nodal_numpy',
+    'horizontal_nodal_arrays_numpy',
+    'HorizontalArrays',
+    'SolverTopology',
+    'ProductPattern',
+    'TopologyCache',
+    'TOPOLOGIES',
+    'topology_key',
+    'VerticalArrays',
+    'vertical_topology',
+    'vertical_from_zmax_numpy',
+    'vertical_from_zmax_arrays_numpy',
+    'fd_topology',
+    'fd_arrays_numpy',
+    'relax_numpy',
+    'opening_sag',
+    'fit_opening_sags',
+]
@@ -0,0 +1,486 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from numpy import arange
+from numpy import array
+from numpy import arccos
+from numpy import clip
+from numpy import degrees
+from numpy import float64
+from numpy import hstack
+from numpy import ones
+from numpy import where
+from numpy import zeros
+
+from scipy.sparse import coo_matrix
+
+from compas.numerical import connectivity_matrix
+from compas.numerical import normrow
+
+
+__all__ = [
+    'HorizontalArrays',
+    'horizontal_nodal_numpy',
+    'horizontal_nodal_arrays_numpy',
+]
+
+
+class HorizontalArrays(object):
+    """Packed array representation of a pair of form and force diagrams.
+
+    Parameters
+    ----------
+    form : :class:`compas_tna.diagrams.FormDiagram`
+        The form diagram.
+    force : :class:`compas_tna.diagrams.ForceDiagram`
+        The force diagram.
+        The force diagram should be the dual of the form diagram.
+
+    Attributes
+    ----------
+    xy : array (n x 2)
+        The XY coordinates of the vertices of the form diagram.
+    edges : array (m x 2)
+        The form diagram edges as pairs of vertex indices.
+    q : array (m,)
+        The current force densities of the edges of the form diagram.
+    _xy : array (_n x 2)
+        The XY coordinates of the vertices of the force diagram.
+    _edges : array (m x 2)
+        The force diagram edges as pairs of vertex indices,
+        ordered such that edge ``i`` of the force diagram is the dual of edge ``i`` of the form diagram.
+
+    Notes
+    -----
+    The diagrams are walked only once, when the arrays are packed.
+    All subsequent computations operate on the arrays and the results are written
+    back to the diagrams with :meth:`HorizontalArrays.unpack`.
+
+    """
+
+    def __init__(self, form, force):
+        self.form = form
+        self.force = force
+        if form and force:
+            self.pack()
+
+    @classmethod
+    def from_arrays(cls, xy, edges, fixed, lmin, lmax, hmin, hmax, flipmask, _xy, _edges, _fixed, _lmin, _lmax, scale=1.0, q=None):
+        """Construct the packed representation directly from arrays, without diagrams.
+
+        The arrays are the same as the arrays constructed by :meth:`HorizontalArrays.pack`.
+        Without force densities, those of all edges are ``1.0``, the default of the form diagram.
+        Without diagrams, the results cannot be unpacked.
+        """
+        arrays = cls(None, None)
+        arrays.xy = array(xy, dtype=float64).reshape((-1, 2))
+        arrays.edges = array(edges, dtype=int).reshape((-1, 2))
+        arrays.fixed = list(fixed)
+        arrays.lmin = array(lmin, dtype=float64)
+        arrays.lmax = array(lmax, dtype=float64)
+        arrays.hmin = array(hmin, dtype=float64)
+        arrays.hmax = array(hmax, dtype=float64)
+        arrays.flipmask = array(flipmask, dtype=float64)
+        arrays.q = ones(arrays.edges.shape[0], dtype=float64) if q is None else array(q, dtype=float64)
+        arrays.C = connectivity_matrix(arrays.edges.tolist(), 'csr')
+        arrays._xy = array(_xy, dtype=float64).reshape((-1, 2))
+        arrays._edges = array(_edges, dtype=int).reshape((-1, 2))
+        arrays._fixed = list(_fixed)
+        arrays._lmin = array(_lmin, dtype=float64)
+        arrays._lmax = array(_lmax, dtype=float64)
+        arrays._C = connectivity_matrix(arrays._edges.tolist(), 'csr')
+        arrays.scale = scale
+        return arrays
+
+    def pack(self):
+        form = self.form
+        force = self.force
+        # ----------------------------------------------------------------------
+        # form diagram
+        # ----------------------------------------------------------------------
+        self.k_i = k_i = form.key_index()
+        self.form_edges = form_edges = list(form.edges_where({'_is_edge': True}))
+        self.xy = array(form.vertices_attributes('xy'), dtype=float64)
+        self.edges = array([[k_i[u], k_i[v]] for u, v in form_edges], dtype=int).reshape((-1, 2))
+        self.fixed = [k_i[key] for key in set(list(form.anchors()) + list(form.fixed()))]
+        self.lmin = array(form.edges_attribute('lmin', keys=form_edges), dtype=float64)
+        self.lmax = array(form.edges_attribute('lmax', keys=form_edges), dtype=float64)
+        self.hmin = array(form.edges_attribute('hmin', keys=form_edges), dtype=float64)
+        self.hmax = array(form.edges_attribute('hmax', keys=form_edges), dtype=float64)
+        self.q = array(form.edges_attribute('q', keys=form_edges), dtype=float64)
+        self.flipmask = array([-1.0 if attr['_is_tension'] else 1.0 for attr in (form.edge_attributes(edge) for edge in form_edges)], dtype=float64)
+        self.C = connectivity_matrix(self.edges.tolist(), 'csr')
+        # ----------------------------------------------------------------------
+        # force diagram
+        # ----------------------------------------------------------------------
+        self._k_i = _k_i = force.key_index()
+        self.force_edges = force_edges = force.ordered_edges(form)
+        self._xy = array(force.vertices_attributes('xy'), dtype=float64)
+        self._edges = array([[_k_i[u], _k_i[v]] for u, v in force_edges], dtype=int).reshape((-1, 2))
+        self._fixed = [_k_i[key] for key in force.fixed()]
+        self._lmin = array(force.edges_attribute('lmin', keys=force_edges), dtype=float64)
+        self._lmax = array(force.edges_attribute('lmax', keys=force_edges), dtype=float64)
+        self._C = connectivity_matrix(self._edges.tolist(), 'csr')
+        self.scale = force.attributes.get('scale', 1.0)
+
+    def unpack(self, q, f, l, _l, a):  # noqa: E741
+        """Write the results back to the diagrams in a single pass per diagram."""
+        xy = self.xy
+        _xy = self._xy
+        k_i = self.k_i
+        _k_i = self._k_i
+        for key, attr in self.form.vertices(True):
+            i = k_i[key]
+            attr['x'] = float(xy[i, 0])
+            attr['y'] = float(xy[i, 1])
+        for index, edge in enumerate(self.form_edges):
+            attr = self.form.edge_attributes(edge)
+            attr['q'] = float(q[index])
+            attr['_f'] = float(f[index])
+            attr['_l'] = float(l[index])
+            attr['_a'] = float(a[index])
+        for key, attr in self.force.vertices(True):
+            i = _k_i[key]
+            attr['x'] = float(_xy[i, 0])
+            attr['y'] = float(_xy[i, 1])
+        for index, edge in enumerate(self.force_edges):
+            attr = self.force.edge_attributes(edge)
+            attr['_l'] = float(_l[index])
+            attr['_a'] = float(a[index])
+        # the attributes are written directly, bypassing the setters that record the modifications
+        if hasattr(self.form, 'modified'):
+            self.form.modified('vertices', 'xy')
+            self.form.modified('edges', ['q', '_f', '_l', '_a'], self.form_edges)
+        if hasattr(self.force, 'modified'):
+            self.force.modified('vertices', 'xy')
+            self.force.modified('edges', ['_l', '_a'], self.force_edges)
+
+
+def nodal_operators(xy, edges, fixed):
+    """Construct the sparse operators of a (Jacobi) nodal parallelisation step.
+
+    Parameters
+    ----------
+    xy : array (n x 2)
+        The vertex coordinates.
+    edges : array (m x 2)
+        The edges as pairs of vertex indices.
+    fixed : list
+        The indices of the fixed vertices.
+
+    Returns
+    -------
+    tuple
+        The indices of the free vertices,
+        the adjacency matrix of the free vertices,
+        the transposed connectivity matrix of the free vertices,
+        and the inverse degrees of the free vertices.
+
+    """
+    n = xy.shape[0]
+    m = edges.shape[0]
+    i = edges[:, 0]
+    j = edges[:, 1]
+    e = arange(m)
+    A = coo_matrix((ones(2 * m), (hstack((i, j)), hstack((j, i)))), shape=(n, n)).tocsr()
+    Ct = coo_matrix((hstack((-ones(m), ones(m))), (hstack((i, j)), hstack((e, e)))), shape=(n, m)).tocsr()
+    degree = array(A.sum(axis=1)).ravel()
+    isfree = ones(n, dtype=bool)
+    isfree[list(fixed)] = False
+    isfree[degree == 0] = False
+    free = where(isfree)[0]
+    return free, A[free], Ct[free], 1.0 / degree[free].reshape((-1, 1))
+
+
+def parallelise_nodal_numpy(xy, edges, targets, fixed=None, kmax=100, lmin=None, lmax=None, callback=None, refreshrate=1,
+                            tol=None, checkrate=10, history=None, reference=None, flipmask=None):
+    """Parallelise the edges of a network to given target vectors using batched nodal updates.
+
+    Parameters
+    ----------
+    xy : array (n x 2)
+        The XY coordinates of the vertices.
+        The coordinates are modified in place.
+    edges : array (m x 2)
+        The edges as pairs of vertex indices.
+    targets : array (m x 2)
+        A (unitised) target vector per edge.
+    fixed : list, optional
+        The indices of the fixed vertices.
+    kmax : int, optional
+        Maximum number of iterations.
+        Default is ``100``.
+    lmin : array (m), optional
+        Minimum length per edge.
+    lmax : array (m), optional
+        Maximum length per edge.
+    callback : callable, optional
+        A callback with signature ``callback(k, xy, edges)``.
+    refreshrate : int, optional
+        The number of iterations between calls to the callback.
+        Default is ``1``.
+    tol : float, optional
+        Stop as soon as the maximum angle deviation in degrees between the edges and the reference vectors
+        is smaller than this tolerance.
+        Default is ``None``, which runs all ``kmax`` iterations.
+    checkrate : int, optional
+        The number of iterations between checks of the angle deviations.
+        Default is ``10``.
+    history : list, optional
+        If provided, the iteration number and the maximum angle deviation of every check are appended to it.
+    reference : array (m x 2), optional
+        The vectors against which the angle deviations of the edges are checked.
+        Default is the target vectors.
+    flipmask : array (m x 1), optional
+        The signs of the edges for the check of the angle deviations,
+        with ``-1.0`` for edges that are flipped in the target vectors, such as tension edges.
+
+    Returns
+    -------
+    int
+        The number of iterations.
+
+    Notes
+    -----
+    This is a batched version of :func:`compas_tna.equilibrium.parallelise_edges`.
+    Every free vertex is moved to the average of the positions suggested by its neighbours,
+    with all vertices updated simultaneously from the coordinates of the previous iteration.
+
+    """
+    if callback and not callable(callback):
+        raise Exception('The provided callback is not callable.')
+
+    free, A, Ct, inv_degree = nodal_operators(xy, edges, fixed or [])
+    i = edges[:, 0]
+    j = edges[:, 1]
+    if reference is None:
+        reference = targets
+
+    for k in range(kmax):
+        l = normrow(xy[j] - xy[i]).ravel()  # noqa: E741
+        if lmin is not None:
+            l = where(l < lmin, lmin, l)  # noqa: E741
+        if lmax is not None:
+            l = where(l > lmax, lmax, l)  # noqa: E741
+
+        xy[free] = (A.dot(xy) + Ct.dot(l.reshape((-1, 1)) * targets)) * inv_degree
+
+        collapsed = l == 0.0
+        if collapsed.any():
+            c = 0.5 * (xy[i[collapsed]] + xy[j[collapsed]])
+            xy[i[collapsed]] = c
+            xy[j[collapsed]] = c
+
+        if callback and k % refreshrate == 0:
+            callback(k, xy, edges)
+
+        if (tol is not None or history is not None) and ((k + 1) % checkrate == 0 or k + 1 == kmax):
+            uv = xy[j] - xy[i]
+            if flipmask is not None:
+                uv *= flipmask
+            deviation = float(angles_xy_numpy(uv, reference).max()) if len(i) else 0.0
+            if history is not None:
+                history.append((k + 1, deviation))
+            if tol is not None and deviation < tol:
+                return k + 1
+
+    return kmax
+
+
+def horizontal_nodal_numpy(form, force, alpha=100, kmax=100, callback=None, refreshrate=1, tol=None, checkrate=10, stats=None):
+    r"""Compute horizontal equilibrium using batched nodal updates on packed arrays.
+
+    Parameters
+    ----------
+    form : :class:`compas_tna.diagrams.FormDiagram`
+        The form diagram.
+    force : :class:`compas_tna.diagrams.ForceDiagram`
+        The force diagram.
+    alpha : float, optional
+        Weighting factor for computation of the target vectors.
+        Default is ``100.0``, which implies that the target vectors are the edges of the form diagram.
+        If ``0.0``, the target vectors are the edges of the force diagram.
+    kmax : int, optional
+       Maximum number of iterations.
+       Default is ``100``.
+    callback : callable, optional
+        A callback function to be called during the parallelisation of the force diagram.
+        The callback should take the current iterand, the coordinates of the force diagram,
+        and the edges of the force diagram as input parameters.
+    refreshrate : int, optional
+        The number of iterations between calls to the callback.
+        Default is ``1``.
+    tol : float, optional
+        Stop as soon as the maximum angle deviation in degrees is smaller than this tolerance,
+        for example the ``tol.angles`` setting of RV2.
+        Default is ``None``, which runs all ``kmax`` iterations.
+    checkrate : int, optional
+        The number of iterations between checks of the angle deviations.
+        Default is ``10``.
+    stats : dict, optional
+        If provided, the number of iterations and the convergence history are stored in it,
+        see :func:`horizontal_nodal_arrays_numpy`.
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    This function produces the same result as :func:`compas_tna.equilibrium.horizontal_nodal`,
+    but the diagrams are packed into arrays and sparse connectivity matrices once,
+    all iterations are computed with array operations,
+    and the results are written back to the diagrams in one pass.
+
+    The relationship between force densities (``q``), horizontal forces (``h``), and lengths (``l``)
+    is the following:
+
+    .. math::
+
+        Q_{i} &= \frac{F_{i, thrust}}{L_{i, thrust}} \\
+              &= \frac{H_{i, form}}{L_{i, form}} \\
+              &= scale * \frac{L_{i, force}}{L_{i, form}}
+
+    """
+    arrays = HorizontalArrays(form, force)
+    q, f, lengths, forces, a = horizontal_nodal_arrays_numpy(arrays, alpha=alpha, kmax=kmax, callback=callback, refreshrate=refreshrate,
+                                                             tol=tol, checkrate=checkrate, stats=stats)
+    arrays.unpack(q, f, lengths, forces, a)
+
+
+def horizontal_nodal_arrays_numpy(arrays, alpha=100, kmax=100, callback=None, refreshrate=1, tol=None, checkrate=10, stats=None):
+    """Compute horizontal equilibrium of a pair of diagrams in packed array representation.
+
+    Parameters
+    ----------
+    arrays : :class:`HorizontalArrays`
+        The packed diagrams.
+        The coordinates of both diagrams are updated in place.
+    alpha : float, optional
+        Weighting factor for computation of the target vectors.
+    kmax : int, optional
+       Maximum number of iterations.
+    callback : callable, optional
+        A callback function to be called during the parallelisation of the force diagram.
+    refreshrate : int, optional
+        The number of iterations between calls to the callback.
+    tol : float, optional
+        Stop the parallelisation of a diagram as soon as the maximum angle deviation in degrees
+        of its edges is smaller than this tolerance.
+    checkrate : int, optional
+        The number of iterations between checks of the angle deviations.
+    stats : dict, optional
+        If provided, the number of iterations of both diagrams together and the convergence history are stored in it,
+        with the keys ``"iterations"`` and ``"history"``.
+        The history is a list of pairs of the iteration number and the maximum angle deviation at every check.
+
+    Returns
+    -------
+    tuple
+        The force densities, forces and lengths of the edges of the form diagram,
+        the lengths of the edges of the force diagram,
+        and the angle deviations between corresponding edges.
+        Edges of the form diagram with zero length keep their previous force density.
+
+    Notes
+    -----
+    The angle deviations of the form diagram are checked against the target vectors,
+    and those of the force diagram against the edges of the form diagram,
+    with the edge vectors of the solver, such that a check costs one pass over the edges.
+    Tension edges are flipped for the check.
+    Without tension edges, the deviations of the last check are therefore the angle deviations that are returned.
+
+    """
+    alpha = float(alpha) / 100.0
+    alpha = max(0, min(1, alpha))
+
+    xy = arrays.xy
+    edges = arrays.edges
+    C = arrays.C
+    _xy = arrays._xy
+    _edges = arrays._edges
+    _C = arrays._C
+    flipmask = arrays.flipmask.reshape((-1, 1))
+    # --------------------------------------------------------------------------
+    # rotate force diagram to make it parallel to the form diagram
+    # use CCW direction (opposite of cycle direction)
+    # --------------------------------------------------------------------------
+    _xy[:] = _xy[:, ::-1] * [-1.0, 1.0]
+    # --------------------------------------------------------------------------
+    # the target vectors are the (alpha) weighted average of the directions
+    # of corresponding edges of the two diagrams
+    # --------------------------------------------------------------------------
+    uv = flipmask * C.dot(xy)
+    _uv = _C.dot(_xy)
+    lengths = normrow(uv)
+    forces = normrow(_uv)
+    form_targets = alpha * where(lengths > 0, uv / where(lengths > 0, lengths, 1.0), 0.0)
+    force_targets = (1 - alpha) * where(forces > 0, _uv / where(forces > 0, forces, 1.0), 0.0)
+    targets = form_targets + force_targets
+    # --------------------------------------------------------------------------
+    # proper force bounds
+    # --------------------------------------------------------------------------
+    hmin = arrays.hmin / arrays.scale
+    hmax = arrays.hmax / arrays.scale
+    _lmin = where(hmin > arrays._lmin, hmin, arrays._lmin)
+    _lmax = where(hmax < arrays._lmax, hmax, arrays._lmax)
+    # --------------------------------------------------------------------------
+    # parallelise
+    # --------------------------------------------------------------------------
+    history = None if stats is None else []
+    iterations = 0
+    if alpha < 1:
+        iterations += parallelise_nodal_numpy(xy, edges, targets, fixed=arrays.fixed, kmax=kmax, lmin=arrays.lmin, lmax=arrays.lmax,
+                                              tol=tol, checkrate=checkrate, history=history, flipmask=flipmask)
+    if alpha > 0:
+        _history = None if stats is None else []
+        # the form diagram no longer changes, and is the reference of the angle deviations of the force diagram
+        _iterations = parallelise_nodal_numpy(_xy, _edges, targets, fixed=arrays._fixed, kmax=kmax, lmin=_lmin, lmax=_lmax, callback=callback, refreshrate=refreshrate,
+                                              tol=tol, checkrate=checkrate, history=_history, reference=flipmask * C.dot(xy))
+        if history is not None:
+            # the iterations of the force diagram follow those of the form diagram
+            history += [(iterations + k, deviation) for k, deviation in _history]
+        iterations += _iterations
+    if stats is not None:
+        stats['iterations'] = iterations
+        stats['history'] = history
+    # --------------------------------------------------------------------------
+    # update the coordinate difference vectors
+    # --------------------------------------------------------------------------
+    uv = C.dot(xy)
+    _uv = _C.dot(_xy)
+    lengths = normrow(uv).ravel()
+    forces = normrow(_uv).ravel()
+    # --------------------------------------------------------------------------
+    # compute the force densities
+    # --------------------------------------------------------------------------
+    f = forces * flipmask.ravel()
+    # the force density of a collapsed edge is undefined
+    q = where(lengths > 0, f / where(lengths > 0, lengths, 1.0), arrays.q)
+    # --------------------------------------------------------------------------
+    # rotate the force diagram 90 degrees in CW direction
+    # this way the relation between the two diagrams is easier to read
+    # --------------------------------------------------------------------------
+    _xy[:] = _xy[:, ::-1] * [1.0, -1.0]
+    # --------------------------------------------------------------------------
+    # angle deviations
+    # note that this does not account for flipped edges!
+    # --------------------------------------------------------------------------
+    a = angles_xy_numpy(uv, _uv)
+    return q, f, lengths, forces, a
+
+
+def angles_xy_numpy(uv, _uv, tol=1e-4):
+    """Compute the angles in degrees between corresponding rows of two arrays of XY vectors.
+
+    As in :func:`compas.geometry.angle_vectors_xy`,
+    the angle is zero if the product of the lengths of the vectors is smaller than ``tol``.
+    """
+    if not uv.shape[0]:
+        return zeros(0)
+    dot = (uv[:, 0] * _uv[:, 0] + uv[:, 1] * _uv[:, 1])
+    norm = normrow(uv[:, :2]).ravel() * normrow(_uv[:, :2]).ravel()
+    small = norm < tol
+    cos = clip(dot / where(small, 1.0, norm), -1.0, 1.0)
+    return where(small, 0.0, degrees(arccos(cos)))
@@ -0,0 +1,127 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from numpy import array
+from numpy import float64
+
+from compas.numerical import normrow
+
+from .topology_numpy import SolverTopology
+from .topology_numpy import TOPOLOGIES
+from .topology_numpy import topology_key
+
+
+__all__ = [
+    'fd_topology',
+    'fd_arrays_numpy',
+    'relax_numpy',
+]
+
+
+def fd_topology(vcount, edges, fixed, cache=TOPOLOGIES):
+    """Get the assembled topology for the force density method from the cache, or assemble it.
+
+    Parameters
+    ----------
+    vcount : int
+        The number of vertices.
+    edges : array (m x 2)
+        The edges as pairs of vertex indices.
+    fixed : list
+        The indices of the fixed vertices.
+    cache : :class:`compas_rv2.equilibrium.TopologyCache`, optional
+        The cache.
+
+    Returns
+    -------
+    :class:`compas_rv2.equilibrium.SolverTopology`
+
+    """
+    edges = array(edges, dtype=int).reshape((-1, 2))
+    fixed = array(sorted(set(fixed)), dtype=int)
+    key = topology_key('fd', vcount, edges, fixed)
+    return cache.get(key, lambda: SolverTopology(vcount, edges, fixed))
+
+
+def fd_arrays_numpy(topology, xyz, q, loads):
+    """Compute the equilibrium coordinates with the force density method, for an assembled topology.
+
+    Parameters
+    ----------
+    topology : :class:`compas_rv2.equilibrium.SolverTopology`
+        The assembled topology.
+    xyz : array (n x 3)
+        The vertex coordinates.
+        The coordinates of the fixed vertices are not changed.
+    q : array (m)
+        The force densities of the edges.
+    loads : array (n x 3)
+        The loads at the vertices.
+
+    Returns
+    -------
+    tuple
+        The vertex coordinates, the force densities, the forces and lengths of the edges,
+        and the residual forces at the vertices,
+        as returned by :func:`compas.numerical.fd_numpy`.
+
+    Notes
+    -----
+    The factorisation of the stiffness matrix is reused if the force densities did not change
+    (up to a scale factor) since the previous solve with the same topology.
+
+    """
+    free = topology.free
+    fixed = topology.fixed
+    xyz = array(xyz, dtype=float64).reshape((-1, 3))
+    q = array(q, dtype=float64).ravel()
+    p = array(loads, dtype=float64).reshape((-1, 3))
+    solve, B, s = topology.factorize(q)
+    b = (p[free] - s * B.dot(xyz[fixed])) / s
+    for axis in range(3):
+        xyz[free, axis] = solve(b[:, axis])
+    l = normrow(topology.C.dot(xyz))  # noqa: E741
+    f = q.reshape((-1, 1)) * l
+    r = p - topology.Ct.dot(topology.C.dot(xyz) * q.reshape((-1, 1)))
+    return xyz, q.reshape((-1, 1)), f, l, r
+
+
+def relax_numpy(mesh, fixed=None, cache=TOPOLOGIES):
+    """Relax a mesh with the force density method, using the force densities of its edges.
+
+    Parameters
+    ----------
+    mesh : :class:`compas.datastructures.Mesh`
+        The mesh.
+    fixed : list, optional
+        The vertices that remain fixed.
+        Default is the vertices with ``is_fixed`` set to True.
+    cache : :class:`compas_rv2.equilibrium.TopologyCache`, optional
+        The cache of assembled topologies.
+
+    Returns
+    -------
+    :class:`compas.datastructures.Mesh`
+        The mesh, with updated vertex coordinates.
+
+    Notes
+    -----
+    This produces the same result as :func:`compas.numerical.fd_numpy` without loads.
+    The connectivity of the mesh is assembled once per topology and set of fixed vertices,
+    such that repeated relaxations after changes of force densities or of the coordinates of the fixed vertices
+    only assemble and factorise the stiffness matrix.
+
+    """
+    if fixed is None:
+        fixed = mesh.vertices_where({'is_fixed': True})
+    key_index = mesh.key_index()
+    xyz = mesh.vertices_attributes('xyz')
+    edges = [(key_index[u], key_index[v]) for u, v in mesh.edges()]
+    topology = fd_topology(len(xyz), edges, [key_index[key] for key in fixed], cache=cache)
+    xyz, q, f, l, r = fd_arrays_numpy(topology, xyz, mesh.edges_attribute('q'), [[0.0, 0.0, 0.0] for _ in xyz])  # noqa: E741
+    for key, attr in mesh.vertices(True):
+        attr['x'], attr['y'], attr['z'] = xyz[key_index[key]].tolist()
+    if hasattr(mesh, 'modified'):
+        mesh.modified('vertices', 'xyz')
+    return mesh
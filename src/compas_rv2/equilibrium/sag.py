@@ -0,0 +1,158 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from math import exp
+from math import log
+
+from compas.geometry import distance_point_point_xy
+from compas.geometry import intersection_line_line_xy
+from compas.geometry import midpoint_point_point_xy
+
+
+__all__ = [
+    'opening_sag',
+    'fit_opening_sags',
+]
+
+
+def opening_sag(mesh, opening):
+    """Compute the sag of an opening, as the ratio of its rise and its span.
+
+    Parameters
+    ----------
+    mesh : :class:`compas.datastructures.Mesh`
+        The pattern.
+    opening : list
+        The edges of the opening, from one support to the next.
+
+    Returns
+    -------
+    float
+        The ratio of the rise and the span.
+        The rise is half the distance of the midspan to the intersection of the first and last edge.
+
+    """
+    u, v = opening[0]
+    if mesh.vertex_attribute(u, 'is_fixed'):
+        a = mesh.vertex_attributes(u, 'xyz')
+        aa = mesh.vertex_attributes(v, 'xyz')
+    else:
+        a = mesh.vertex_attributes(v, 'xyz')
+        aa = mesh.vertex_attributes(u, 'xyz')
+    u, v = opening[-1]
+    if mesh.vertex_attribute(u, 'is_fixed'):
+        b = mesh.vertex_attributes(u, 'xyz')
+        bb = mesh.vertex_attributes(v, 'xyz')
+    else:
+        b = mesh.vertex_attributes(v, 'xyz')
+        bb = mesh.vertex_attributes(u, 'xyz')
+    span = distance_point_point_xy(a, b)
+    apex = intersection_line_line_xy((a, aa), (b, bb))
+    if apex is None:
+        rise = 0.0
+    else:
+        midspan = midpoint_point_point_xy(a, b)
+        rise = 0.5 * distance_point_point_xy(midspan, apex)
+    return rise / span
+
+
+def _solve(A, b):
+    """Solve a small dense linear system with Gaussian elimination and partial pivoting, or return None if it is singular."""
+    n = len(b)
+    M = [list(row) + [value] for row, value in zip(A, b)]
+    for i in range(n):
+        pivot = max(range(i, n), key=lambda j: abs(M[j][i]))
+        if abs(M[pivot][i]) < 1e-12:
+            return None
+        M[i], M[pivot] = M[pivot], M[i]
+        for j in range(i + 1, n):
+            factor = M[j][i] / M[i][i]
+            for k in range(i, n + 1):
+                M[j][k] -= factor * M[i][k]
+    x = [0.0] * n
+    for i in range(n - 1, -1, -1):
+        x[i] = (M[i][n] - sum(M[i][k] * x[k] for k in range(i + 1, n))) / M[i][i]
+    return x
+
+
+def fit_opening_sags(mesh, openings, targets, q, relax, tol=1e-3, kmax=10, maxstep=2.0):
+    """Find the force densities of the edges of the openings of a pattern that produce the target sags,
+    for all openings simultaneously.
+
+    Parameters
+    ----------
+    mesh : :class:`compas.datastructures.Mesh`
+        The pattern.
+    openings : list
+        The edges of every opening.
+    targets : list
+        The target sag of every opening.
+    q : list
+        The initial force density of the edges of every opening.
+    relax : callable
+        A function without arguments that relaxes the pattern with the force densities of its edges,
+        for example with the executor of the session.
+    tol : float, optional
+        The tolerance on the difference between the sags and their targets.
+    kmax : int, optional
+        The maximum number of relaxations.
+    maxstep : float, optional
+        The maximum change of the logarithm of a force density in one step.
+
+    Returns
+    -------
+    tuple
+        The force densities of the openings, their sags, the number of relaxations,
+        and True if all sags are within the tolerance of their targets.
+
+    Notes
+    -----
+    The unknowns are the logarithms of the force densities of the openings,
+    and the residuals are the logarithms of the ratios of the sags and their targets.
+    The Jacobian of the residuals is estimated as minus the identity,
+    which is exact for a single opening whose sag is inversely proportional to its force density,
+    and which makes the first step equal to the classic update ``q = q * sag / target``.
+    The estimate is then refined with Broyden updates after every relaxation,
+    to account for the coupling between the openings,
+    such that all openings are fitted jointly with a single relaxation per step.
+
+    """
+    n = len(openings)
+    q = [float(value) for value in q]
+    x = [log(value) for value in q]
+
+    def evaluate():
+        for value, opening in zip(q, openings):
+            mesh.edges_attribute('q', value, keys=opening)
+        relax()
+        sags = [opening_sag(mesh, opening) for opening in openings]
+        residuals = [log(max(sag, 1e-6) / target) for sag, target in zip(sags, targets)]
+        return sags, residuals
+
+    J = [[-1.0 if i == j else 0.0 for j in range(n)] for i in range(n)]
+    sags, g = evaluate()
+    count = 1
+    while True:
+        if all(abs(sag - target) < tol for sag, target in zip(sags, targets)):
+            return q, sags, count, True
+        if count >= kmax:
+            return q, sags, count, False
+        dx = _solve(J, [-value for value in g])
+        if dx is None:
+            dx = list(g)
+        dx = [max(-maxstep, min(maxstep, value)) for value in dx]
+        x = [a + b for a, b in zip(x, dx)]
+        q = [exp(value) for value in x]
+        sags, g_ = evaluate()
+        count += 1
+        # Broyden update of the Jacobian with the observed change of the residuals
+        dg = [b - a for a, b in zip(g, g_)]
+        dxdx = sum(value * value for value in dx)
+        if dxdx > 0:
+            Jdx = [sum(J[i][j] * dx[j] for j in range(n)) for i in range(n)]
+            for i in range(n):
+                factor = (dg[i] - Jdx[i]) / dxdx
+                for j in range(n):
+                    J[i][j] += factor * dx[j]
+        g = g_
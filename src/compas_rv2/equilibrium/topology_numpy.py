@@ -0,0 +1,302 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import hashlib
+
+from collections import OrderedDict
+
+from numpy import array
+from numpy import asarray
+from numpy import bincount
+from numpy import cross
+from numpy import float64
+from numpy import repeat
+from numpy import setdiff1d
+from numpy import arange
+from numpy import concatenate
+from numpy import cumsum
+from numpy import diff
+from numpy import unique
+from numpy import zeros
+
+from scipy.sparse import csc_matrix
+from scipy.sparse import csr_matrix
+from scipy.sparse.linalg import splu
+
+from compas.numerical import connectivity_matrix
+from compas.numerical import normrow
+
+
+__all__ = [
+    'SolverTopology',
+    'ProductPattern',
+    'TopologyCache',
+    'topology_key',
+    'TOPOLOGIES',
+]
+
+
+def topology_key(*arrays):
+    """Compute a hash of the arrays that define the topology of a diagram.
+
+    Parameters
+    ----------
+    arrays : list
+        Arrays, or packed binary messages (:func:`compas_rv2.execution.wire.encode_array`),
+        or numbers.
+
+    Returns
+    -------
+    str
+
+    """
+    h = hashlib.sha1()
+    for item in arrays:
+        if isinstance(item, dict):
+            item = item['data']
+        if hasattr(item, 'tobytes'):
+            item = asarray(item).tobytes()
+        if not isinstance(item, bytes):
+            item = str(item).encode('utf-8')
+        h.update(item)
+        h.update(b'|')
+    return h.hexdigest()
+
+
+class ProductPattern(object):
+    """The sparsity pattern of the product ``X.T * diag(q) * Y``, for repeated assembly with different ``q``.
+
+    The nonzero values of the product are a linear function of ``q``,
+    and are computed with a single sparse matrix-vector product,
+    instead of two sparse matrix-matrix products.
+
+    Parameters
+    ----------
+    X : sparse matrix (m x a)
+        The left matrix.
+    Y : sparse matrix (m x b)
+        The right matrix.
+
+    Examples
+    --------
+    >>> pattern = ProductPattern(Ci, Ci)
+    >>> A = pattern.assemble(q)
+
+    """
+
+    def __init__(self, X, Y):
+        X = csr_matrix(X)
+        Y = csr_matrix(Y)
+        X.sort_indices()
+        Y.sort_indices()
+        m, a = X.shape
+        b = Y.shape[1]
+        # pair every nonzero of X with all nonzeros of Y in the same row
+        xrow = arange(m).repeat(diff(X.indptr))
+        count = diff(Y.indptr)[xrow]
+        left = arange(X.nnz).repeat(count)
+        offset = arange(left.size) - (cumsum(count) - count).repeat(count)
+        right = Y.indptr[xrow[left]] + offset
+        rows = X.indices[left]
+        cols = Y.indices[right]
+        # the position of every pair in the compressed columns of the product
+        keys, slot = unique(cols.astype('int64') * a + rows, return_inverse=True)
+        self.shape = a, b
+        self.indices = (keys % a).astype('int32')
+        self.indptr = concatenate(([0], cumsum(bincount(keys // a, minlength=b)))).astype('int32')
+        self.P = csr_matrix((X.data[left] * Y.data[right], (slot.ravel(), xrow[left])), shape=(keys.size, m))
+
+    def assemble(self, q):
+        """Assemble the product for the force densities ``q``.
+
+        Parameters
+        ----------
+        q : array (m)
+            The diagonal.
+
+        Returns
+        -------
+        sparse matrix (a x b)
+            The product, in compressed column format.
+
+        """
+        return csc_matrix((self.P.dot(q), self.indices.copy(), self.indptr.copy()), shape=self.shape)
+
+
+class SolverTopology(object):
+    """Assembled matrices of the topology of a diagram, for repeated solves.
+
+    Parameters
+    ----------
+    vcount : int
+        The number of vertices.
+    edges : array (m x 2)
+        The edges as pairs of vertex indices.
+    fixed : list
+        The indices of the fixed vertices.
+    faces : list, optional
+        The vertex indices of the faces, concatenated.
+    sizes : list, optional
+        The number of vertices per face.
+    loaded : list, optional
+        Flags indicating which faces are loaded.
+        Only loaded faces contribute to the tributary areas of the vertices.
+
+    Attributes
+    ----------
+    C : sparse matrix (m x n)
+        The connectivity matrix.
+    Ci : sparse matrix (m x len(free))
+        The columns of the free vertices.
+    Cf : sparse matrix (m x len(fixed))
+        The columns of the fixed vertices.
+    free : array
+        The indices of the free vertices.
+
+    Notes
+    -----
+    The factorisation of the stiffness matrix of the free vertices, ``Ci.T * diag(q) * Ci``,
+    is cached for the most recent force densities.
+    A multiple of the same force densities reuses the factorisation.
+    For other force densities, the matrix is assembled from its cached sparsity pattern,
+    and factorised with a symmetric fill-reducing ordering.
+
+    """
+
+    def __init__(self, vcount, edges, fixed, faces=None, sizes=None, loaded=None):
+        self.vcount = vcount
+        self.edges = array(edges, dtype=int).reshape((-1, 2))
+        self.fixed = array(sorted(set(int(i) for i in fixed)), dtype=int)
+        self.free = setdiff1d(arange(vcount), self.fixed)
+        self.C = connectivity_matrix(self.edges.tolist(), 'csr')
+        if self.C.shape[1] < vcount:
+            self.C.resize((self.C.shape[0], vcount))
+        self.Ct = self.C.transpose().tocsr()
+        self.Ci = self.C[:, self.free]
+        self.Cf = self.C[:, self.fixed]
+        self.Cit = self.Ci.transpose().tocsr()
+        self._q = None
+        self._solve = None
+        self._B = None
+        self._patterns = None
+        self.factorizations = 0
+        self.face_edges(faces, sizes, loaded)
+
+    def face_edges(self, faces, sizes, loaded):
+        """Construct the (directed) edges of the loaded faces, for the computation of tributary areas."""
+        if faces is None:
+            self.fu = self.fv = self.ff = None
+            return
+        faces = asarray(faces, dtype=int)
+        sizes = asarray(sizes, dtype=int)
+        loaded = asarray(loaded, dtype=bool)
+        face = repeat(arange(len(sizes)), sizes)
+        start = repeat(sizes.cumsum() - sizes, sizes)
+        position = arange(len(faces)) - start
+        following = start + (position + 1) % repeat(sizes, sizes)
+        self.fcount = len(sizes)
+        self.fsizes = sizes
+        self.faces = faces
+        self.face = face
+        mask = loaded[face]
+        self.fu = faces[mask]
+        self.fv = faces[following][mask]
+        self.ff = face[mask]
+
+    def factorize(self, q):
+        """Factorise the stiffness matrix of the free vertices, or reuse the factorisation.
+
+        Parameters
+        ----------
+        q : array (m)
+            The force densities.
+
+        Returns
+        -------
+        tuple
+            A function that solves the system for a right-hand side,
+            the matrix ``Ci.T * diag(q) * Cf``,
+            and the scale of ``q`` with respect to the factorised force densities.
+
+        """
+        q = asarray(q, dtype=float64).ravel()
+        if self._q is not None and self._q.shape == q.shape:
+            # the factorisation can be reused for a multiple of the factorised force densities
+            nz = self._q != 0
+            if nz.any() and (q[~nz] == 0).all():
+                ratio = q[nz] / self._q[nz]
+                if (abs(ratio - ratio[0]) <= 1e-12 * abs(ratio[0])).all() and ratio[0] != 0:
+                    return self._solve, self._B, float(ratio[0])
+        if self._patterns is None:
+            self._patterns = ProductPattern(self.Ci, self.Ci), ProductPattern(self.Ci, self.Cf)
+        A = self._patterns[0].assemble(q)
+        # the stiffness matrix is symmetric, and positive definite for positive force densities
+        self._solve = splu(A, permc_spec='MMD_AT_PLUS_A', options=dict(SymmetricMode=True)).solve
+        self._B = self._patterns[1].assemble(q)
+        self._q = q.copy()
+        self.factorizations += 1
+        return self._solve, self._B, 1.0
+
+    def tributary_areas(self, xyz):
+        """Compute the tributary areas of the vertices.
+
+        Parameters
+        ----------
+        xyz : array (n x 3)
+            The vertex coordinates.
+
+        Returns
+        -------
+        array (n)
+            The tributary area of every vertex,
+            computed with the same formula as :class:`compas_tna.utilities.LoadUpdater`.
+
+        """
+        if self.fu is None:
+            return zeros(self.vcount)
+        sums = zeros((self.fcount, 3))
+        for axis in range(3):
+            sums[:, axis] = bincount(self.face, weights=xyz[self.faces, axis], minlength=self.fcount)
+        centroids = sums / self.fsizes.reshape((-1, 1))
+        u = xyz[self.fu]
+        v = xyz[self.fv]
+        c = centroids[self.ff]
+        au = 0.25 * normrow(cross(v - u, c - u)).ravel()
+        av = 0.25 * normrow(cross(u - v, c - v)).ravel()
+        return bincount(self.fu, weights=au, minlength=self.vcount) + bincount(self.fv, weights=av, minlength=self.vcount)
+
+
+class TopologyCache(object):
+    """A cache of assembled topologies, by topology key, with a maximum size.
+
+    The least recently used topology is removed when the cache is full.
+    """
+
+    def __init__(self, maxsize=8):
+        self.maxsize = maxsize
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, key, factory):
+        """Get the topology with a key, or construct it with the factory."""
+        if key in self.items:
+            self.hits += 1
+            self.items.move_to_end(key)
+            return self.items[key]
+        self.misses += 1
+        topology = factory()
+        self.items[key] = topology
+        while len(self.items) > self.maxsize:
+            self.items.popitem(last=False)
+        return topology
+
+    def clear(self):
+        self.items.clear()
+
+
+TOPOLOGIES = TopologyCache()
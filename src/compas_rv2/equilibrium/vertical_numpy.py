@@ -0,0 +1,288 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from numpy import array
+from numpy import float64
+
+from scipy.linalg import norm
+from scipy.sparse import diags
+
+from compas.numerical import normrow
+
+from .topology_numpy import SolverTopology
+from .topology_numpy import TOPOLOGIES
+from .topology_numpy import topology_key
+
+
+__all__ = [
+    'VerticalArrays',
+    'vertical_from_zmax_numpy',
+    'vertical_from_zmax_arrays_numpy',
+    'vertical_topology',
+]
+
+
+def vertical_topology(vcount, edges, anchors, faces, sizes, loaded, cache=TOPOLOGIES):
+    """Get the assembled topology for vertical equilibrium from the cache, or assemble it.
+
+    Parameters
+    ----------
+    vcount : int
+        The number of vertices.
+    edges : array (m x 2)
+        The edges as pairs of vertex indices.
+    anchors : list
+        The indices of the anchored vertices.
+    faces : list
+        The vertex indices of the faces, concatenated.
+    sizes : list
+        The number of vertices per face.
+    loaded : list
+        Flags indicating which faces are loaded.
+    cache : :class:`compas_rv2.equilibrium.TopologyCache`, optional
+        The cache.
+
+    Returns
+    -------
+    :class:`compas_rv2.equilibrium.SolverTopology`
+
+    """
+    edges = array(edges, dtype=int).reshape((-1, 2))
+    anchors = array(sorted(anchors), dtype=int)
+    faces = array(faces, dtype=int)
+    sizes = array(sizes, dtype=int)
+    loaded = array(loaded, dtype=bool)
+    key = topology_key('vertical', vcount, edges, anchors, faces, sizes, loaded)
+    return cache.get(key, lambda: SolverTopology(vcount, edges, anchors, faces=faces, sizes=sizes, loaded=loaded))
+
+
+class VerticalArrays(object):
+    """Packed array representation of a form diagram for vertical equilibrium.
+
+    Parameters
+    ----------
+    form : :class:`compas_tna.diagrams.FormDiagram`
+        The form diagram.
+    cache : :class:`compas_rv2.equilibrium.TopologyCache`, optional
+        The cache of assembled topologies.
+
+    Attributes
+    ----------
+    topology : :class:`compas_rv2.equilibrium.SolverTopology`
+        The assembled topology, with the anchors as fixed vertices.
+    xyz : list
+        The vertex coordinates.
+    p : list
+        The point loads at the vertices.
+    t : list
+        The thickness at the vertices.
+    q : list
+        The force densities of the edges.
+
+    Notes
+    -----
+    The results are written back to the diagram with :meth:`VerticalArrays.unpack`,
+    such that the diagram is not modified until the computation is complete.
+
+    """
+
+    def __init__(self, form, cache=TOPOLOGIES):
+        self.form = form
+        self.key_index = key_index = form.key_index()
+        faces = []
+        sizes = []
+        loaded = []
+        for face in form.faces():
+            vertices = form.face_vertices(face)
+            faces += [key_index[vertex] for vertex in vertices]
+            sizes.append(len(vertices))
+            loaded.append(bool(form.face_attribute(face, '_is_loaded')))
+        self.edges = edges = list(form.edges_where({'_is_edge': True}))
+        anchors = [key_index[vertex] for vertex in form.anchors()]
+        self.topology = vertical_topology(form.number_of_vertices(), [(key_index[u], key_index[v]) for u, v in edges], anchors, faces, sizes, loaded, cache=cache)
+        self.xyz = form.vertices_attributes('xyz')
+        self.p = form.vertices_attributes(['px', 'py', 'pz'])
+        self.t = form.vertices_attribute('t')
+        self.q = form.edges_attribute('q', keys=edges)
+
+    def unpack(self, xyz, q, f, r):
+        """Write the results back to the diagram in a single pass."""
+        key_index = self.key_index
+        for key, attr in self.form.vertices(True):
+            index = key_index[key]
+            attr['z'] = float(xyz[index, 2])
+            attr['_rx'], attr['_ry'], attr['_rz'] = r[index].tolist()
+        for index, edge in enumerate(self.edges):
+            attr = self.form.edge_attributes(edge)
+            attr['q'] = float(q[index])
+            attr['_f'] = float(f[index])
+        # the attributes are written directly, bypassing the setters that record the modifications
+        if hasattr(self.form, 'modified'):
+            self.form.modified('vertices', ['z', '_rx', '_ry', '_rz'])
+            self.form.modified('edges', ['q', '_f'], self.edges)
+
+
+def vertical_from_zmax_arrays_numpy(topology, xyz, p0, t, q0, zmax, kmax=100, xtol=1e-2, rtol=1e-3, density=1.0, warmstart=False, callback=None):
+    """Compute vertical equilibrium for a target height, in packed array representation.
+
+    Parameters
+    ----------
+    topology : :class:`compas_rv2.equilibrium.SolverTopology`
+        The assembled topology, with the anchors as fixed vertices.
+    xyz : array (n x 3)
+        The vertex coordinates.
+    p0 : array (n x 3)
+        The point loads at the vertices, without self-weight.
+    t : array (n)
+        The thickness at the vertices.
+    q0 : array (m)
+        The force densities of the edges.
+    zmax : float
+        The target height.
+    kmax : int, optional
+        The maximum number of iterations.
+    xtol : float, optional
+        The tolerance on the target height.
+    rtol : float, optional
+        The tolerance on the residual forces at the free vertices.
+    density : float, optional
+        The density for the computation of self-weight.
+    warmstart : bool, optional
+        If True, the current heights and force densities are considered to be close to the solution,
+        and the iterations stop as soon as the tolerances are met.
+        Otherwise, at least 11 iterations are used to find the scale, as in COMPAS TNA.
+    callback : callable, optional
+        A function that is called with the total number of iterations after every iteration,
+        for example to report progress, or to cancel the computation by raising an exception.
+
+    Returns
+    -------
+    tuple
+        The vertex coordinates, the scaled force densities, the forces in the edges,
+        the residual forces at the vertices, the scale,
+        the total number of iterations, and the norm of the residual forces at the free vertices.
+
+    Notes
+    -----
+    Without warm start, this produces the same result as :func:`compas_tna.equilibrium.vertical_from_zmax`.
+    After local changes of loads, thickness or supports, the force densities of the previous solution are already scaled,
+    and a warm start typically converges in a few iterations.
+    The stiffness matrix of the free vertices only depends on the force densities up to a scale factor,
+    and is therefore factorised only once, or not at all if the factorisation of the topology can be reused.
+
+    """
+    xtol2 = xtol ** 2
+    free = topology.free
+    fixed = topology.fixed
+    C = topology.C
+    Ct = topology.Ct
+
+    xyz = array(xyz, dtype=float64).reshape((-1, 3))
+    p0 = array(p0, dtype=float64).reshape((-1, 3))
+    t = array(t, dtype=float64).ravel()
+    q0 = array(q0, dtype=float64).ravel()
+    p = p0.copy()
+
+    def update_loads(p, xyz):
+        p[:, 2] = p0[:, 2] + topology.tributary_areas(xyz) * t * density
+
+    # the factorised matrix corresponds to force densities s0 * q0
+    solve, B, s0 = topology.factorize(q0)
+
+    def update_free_z(scale):
+        s = scale * s0
+        xyz[free, 2] = solve(p[free, 2] - s * B.dot(xyz[fixed, 2])) / s
+
+    # --------------------------------------------------------------------------
+    # scale to zmax
+    # --------------------------------------------------------------------------
+    kmin = 0 if warmstart else 11
+    iterations = 0
+    scale = 1.0
+    for k in range(kmax):
+        iterations += 1
+        update_loads(p, xyz)
+        update_free_z(scale)
+        if callback:
+            callback(iterations)
+        z = max(xyz[free, 2])
+        if k >= kmin and (z - zmax) ** 2 < xtol2:
+            break
+        scale = scale * (z / zmax)
+    # --------------------------------------------------------------------------
+    # vertical
+    # --------------------------------------------------------------------------
+    q = scale * q0
+    CtQC = Ct.dot(diags([q], [0])).dot(C)
+    update_loads(p, xyz)
+    residual = None
+    for k in range(kmax):
+        iterations += 1
+        update_free_z(scale)
+        update_loads(p, xyz)
+        if callback:
+            callback(iterations)
+        r = CtQC.dot(xyz[:, 2]) - p[:, 2]
+        residual = norm(r[free])
+        if residual < rtol:
+            break
+    # --------------------------------------------------------------------------
+    # update
+    # --------------------------------------------------------------------------
+    f = q * normrow(C.dot(xyz)).ravel()
+    r = CtQC.dot(xyz) - p
+    return xyz, q, f, r, scale, iterations, residual
+
+
+def vertical_from_zmax_numpy(form, zmax, kmax=100, xtol=1e-2, rtol=1e-3, density=1.0, warmstart=False, stats=None, cache=TOPOLOGIES, callback=None):
+    """Compute vertical equilibrium of a form diagram for a target height.
+
+    Parameters
+    ----------
+    form : :class:`compas_tna.diagrams.FormDiagram`
+        The form diagram.
+    zmax : float
+        The target height of the thrust diagram.
+    kmax : int, optional
+        The maximum number of iterations.
+    xtol : float, optional
+        The tolerance on the target height.
+    rtol : float, optional
+        The tolerance on the residual forces at the free vertices.
+    density : float, optional
+        The density for the computation of self-weight.
+    warmstart : bool, optional
+        Start from the current heights and force densities of the diagram,
+        and stop as soon as the tolerances are met.
+        Use this to re-solve after local changes of loads, thickness or supports.
+    stats : dict, optional
+        If provided, the number of iterations and the final residual are stored in it,
+        with the keys ``"iterations"`` and ``"residual"``.
+    cache : :class:`compas_rv2.equilibrium.TopologyCache`, optional
+        The cache of assembled topologies.
+    callback : callable, optional
+        A function that is called with the total number of iterations after every iteration.
+
+    Returns
+    -------
+    tuple
+        The form diagram and the scale of the horizontal forces.
+
+    Notes
+    -----
+    This is a drop-in replacement for :func:`compas_tna.equilibrium.vertical_from_zmax`.
+    The assembled matrices are cached per topology,
+    such that only the attributes of the diagram are packed
+    when the diagram is solved again after a change of loads, force densities, or target height.
+
+    """
+    arrays = VerticalArrays(form, cache=cache)
+    result = vertical_from_zmax_arrays_numpy(arrays.topology, arrays.xyz, arrays.p, arrays.t, arrays.q,
+                                             zmax, kmax=kmax, xtol=xtol, rtol=rtol, density=density, warmstart=warmstart, callback=callback)
+    xyz, q, f, r, scale, iterations, residual = result
+    if stats is not None:
+        stats['iterations'] = iterations
+        stats['residual'] = float(residual)
+    arrays.unpack(xyz, q, f, r)
+    return form, scale
@@ -0,0 +1,119 @@
+"""
+********************************************************************************
+compas_rv2.execution
+********************************************************************************
+
+.. currentmodule:: compas_rv2.execution
+
+Execution backends for the NumPy/SciPy solvers of RV2.
+
+In IronPython (Rhino 6/7), the solvers run on the RPC server and are called through the proxy.
+When NumPy is available in the current process, the solvers are called directly,
+without serialising the diagrams.
+
+>>> executor = LocalExecutor() if not compas.IPY else ProxyExecutor(proxy)
+>>> result = executor.vertical(form, zmax, kmax=kmax)
+>>> print(result['time'])
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    Executor
+    LocalExecutor
+    ProxyExecutor
+
+Solver pool
+===========
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    SolverPool
+
+Background computations
+=======================
+
+Solver calls can run on a separate thread, such that Rhino remains responsive,
+the intermediate results can be drawn, and the computation can be cancelled.
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    BackgroundSolve
+    SnapshotChannel
+    Cancellation
+    Cancelled
+
+Wire format
+===========
+
+The proxy executor sends only the numeric arrays used by the solvers,
+as base64 encoded little-endian binary arrays,
+and scatters the arrays returned by the server back into the diagrams.
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    encode_array
+    decode_array
+    pack_vertical
+    scatter_vertical
+    pack_horizontal
+    scatter_horizontal
+
+"""
+from __future__ import absolute_import
+
+import compas
+
+from .background import Cancelled
+from .background import Cancellation
+from .background import SnapshotChannel
+from .background import BackgroundSolve
+from .executor import Executor
+from .executor import ProxyExecutor
+from .pool import Future
+from .pool import SolverPool
+from .wire import encode_array
+from .wire import decode_array
+from .wire import pack_vertical
+from .wire import scatter_vertical
+from .wire import pack_horizontal
+from .wire import scatter_horizontal
+
+if not compas.IPY:
+    from .local import LocalExecutor
+    from .local import vertical_proxy
+    from .local import horizontal_proxy
+    from .local import fd_proxy
+    from .local import warmup_proxy
+    from .local import ping_proxy
+    from .local import resident_proxy
+
+__all__ = [
+    'Executor',
+    'ProxyExecutor',
+    'LocalExecutor',
+    'Future',
+    'SolverPool',
+    'Cancelled',
+    'Cancellation',
+    'SnapshotChannel',
+    'BackgroundSolve',
+    'encode_array',
+    'decode_array',
+    'pack_vertical',
+    'scatter_vertical',
+    'pack_horizontal',
+    'scatter_horizontal',
+    'vertical_proxy',
+    'horizontal_proxy',
+    'fd_proxy',
+    'warmup_proxy',
+    'ping_proxy',
+    'resident_proxy',
+]
@@ -0,0 +1,278 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import threading
+
+from time import time
+
+from .pool import Future
+
+
+__all__ = [
+    'Cancelled',
+    'Cancellation',
+    'SnapshotChannel',
+    'BackgroundSolve',
+]
+
+
+class Cancelled(Exception):
+    """Raised by the executors if a computation is cancelled before the diagrams are updated."""
+
+
+class Cancellation(object):
+    """A cancellation flag that is shared between the thread that runs a computation and the thread that cancels it.
+
+    The executors update the diagrams inside the context of the flag.
+    Cancelling waits for an update that is in progress,
+    such that a computation is either cancelled before the diagrams are updated,
+    or completed with all diagrams updated.
+
+    Examples
+    --------
+    >>> cancel = Cancellation()
+    >>> with cancel:
+    ...     arrays.unpack(q, f, l, _l, a)
+
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._updated = False
+
+    def __enter__(self):
+        self._lock.acquire()
+        if self._cancelled:
+            self._lock.release()
+            raise Cancelled()
+        return self
+
+    def __exit__(self, error, *args):
+        if error is None:
+            self._updated = True
+        self._lock.release()
+
+    def cancel(self):
+        """Cancel the computation.
+
+        If the diagrams are being updated, this waits until the update is completed.
+
+        Returns
+        -------
+        bool
+            True if the computation was cancelled before the diagrams were updated.
+
+        """
+        with self._lock:
+            self._cancelled = True
+            return not self._updated
+
+    def is_set(self):
+        """Is the computation cancelled."""
+        return self._cancelled
+
+    def check(self, *args):
+        """Raise :class:`Cancelled` if the computation is cancelled.
+
+        This can be used as the callback of a solver.
+        """
+        if self._cancelled:
+            raise Cancelled()
+
+
+class SnapshotChannel(object):
+    """A thread-safe channel for the intermediate results of a solver running in the background.
+
+    The solver puts snapshots into the channel through :meth:`callback`,
+    and the display takes the latest snapshot with :meth:`take`.
+    Only the latest snapshot is kept, and the solver only copies its data into the channel
+    after the display requested a new frame,
+    such that the solver is not slowed down by snapshots that are never drawn.
+
+    The interval between frames adapts to the measured duration of drawing a frame,
+    such that drawing takes at most a fraction of the time of the solver.
+
+    Parameters
+    ----------
+    budget : float, optional
+        The maximum fraction of the time that is spent on drawing frames.
+    minimum : float, optional
+        The minimum interval between frames, in seconds.
+    maximum : float, optional
+        The maximum interval between frames, in seconds.
+
+    Examples
+    --------
+    >>> channel = SnapshotChannel()
+    >>> solve = BackgroundSolve(executor.horizontal, form, force, callback=channel.callback, refreshrate=1)
+    >>> while not solve.done():
+    ...     snapshot = channel.take()
+    ...     if snapshot:
+    ...         t0 = time()
+    ...         draw(*snapshot)
+    ...         channel.drawn(time() - t0)
+
+    """
+
+    def __init__(self, budget=0.2, minimum=0.02, maximum=1.0):
+        self.budget = budget
+        self.minimum = minimum
+        self.maximum = maximum
+        self.interval = minimum
+        self.frames = 0
+        self._lock = threading.Lock()
+        self._wanted = threading.Event()
+        self._wanted.set()
+        self._snapshot = None
+        self._due = 0.0
+
+    def callback(self, k, xy, edges):
+        """Put a snapshot into the channel, if a new frame was requested.
+
+        This is the callback of the solver, and is called on the thread of the solver.
+        The coordinates are copied, because the solver updates them in place.
+        """
+        if not self._wanted.is_set():
+            return
+        xy = xy.copy() if hasattr(xy, 'copy') else list(xy)
+        with self._lock:
+            self._snapshot = k, xy, edges
+            self._wanted.clear()
+
+    def take(self):
+        """Take the latest snapshot, if a new frame is due.
+
+        Returns
+        -------
+        tuple or None
+            The iteration number, the coordinates and the edges of the snapshot.
+            None if there is no new snapshot, or if it is too early for a new frame.
+
+        """
+        if time() < self._due:
+            return None
+        with self._lock:
+            snapshot = self._snapshot
+            self._snapshot = None
+        if snapshot is None:
+            self._wanted.set()
+        return snapshot
+
+    def drawn(self, duration):
+        """Register the duration of drawing a frame, and request the next frame.
+
+        Parameters
+        ----------
+        duration : float
+            The time spent on drawing the frame, in seconds.
+
+        """
+        self.frames += 1
+        self.interval = max(self.minimum, min(self.maximum, duration * (1.0 - self.budget) / self.budget))
+        self._due = time() + self.interval
+        self._wanted.set()
+
+
+class BackgroundSolve(object):
+    """A call of an executor that runs on a separate thread, and that can be cancelled.
+
+    A :class:`Cancellation` is passed to the call with the named argument ``cancel``.
+    The executors stop as soon as possible after it is cancelled,
+    without updating the diagrams, and raise :class:`Cancelled`.
+    The diagrams therefore keep the state of the last computation that was completed.
+
+    Parameters
+    ----------
+    function : callable
+        A method of an executor, for example :meth:`compas_rv2.execution.Executor.horizontal`.
+    args : list
+        The positional arguments of the call.
+    kwargs : dict
+        The named arguments of the call.
+
+    Notes
+    -----
+    The diagrams should not be modified on the calling thread until the call is done.
+    Drawing should be done on the calling thread, with the snapshots of a :class:`SnapshotChannel`.
+
+    Examples
+    --------
+    >>> solve = BackgroundSolve(executor.vertical, form, 4.0, kmax=300)
+    >>> while not solve.done():
+    ...     if escape_pressed():
+    ...         solve.cancel()
+    >>> result = solve.result()
+
+    """
+
+    def __init__(self, function, *args, **kwargs):
+        self.cancellation = Cancellation()
+        self.future = Future()
+        self.t0 = time()
+        kwargs['cancel'] = self.cancellation
+        self.thread = threading.Thread(target=self._run, args=(function, args, kwargs))
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _run(self, function, args, kwargs):
+        try:
+            self.future.set_result(function(*args, **kwargs))
+        except Exception as e:
+            self.future.set_error(e)
+
+    @property
+    def elapsed(self):
+        """The time since the start of the call, in seconds."""
+        return time() - self.t0
+
+    @property
+    def cancelled(self):
+        """Is the call cancelled."""
+        return self.cancellation.is_set()
+
+    def cancel(self):
+        """Cancel the call.
+
+        Returns
+        -------
+        bool
+            True if the call was cancelled before the diagrams were updated.
+            False if the call already updated the diagrams, and is therefore completed.
+
+        """
+        return self.cancellation.cancel()
+
+    def done(self):
+        """Is the call finished."""
+        return self.future.done()
+
+    def wait(self, timeout=None):
+        """Wait for the call to finish.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum time to wait, in seconds.
+
+        Returns
+        -------
+        bool
+            True if the call is finished.
+
+        """
+        return self.future.wait(timeout)
+
+    def result(self, timeout=None):
+        """Wait for the call to finish and return its result.
+
+        Raises
+        ------
+        :class:`Cancelled`
+            If the call was cancelled before the diagrams were updated.
+        Exception
+            The error raised by the call, if any.
+
+        """
+        return self.future.result(timeout)
@@ -0,0 +1,250 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import threading
+
+from time import time
+
+from .background import Cancellation
+from .wire import decode_array
+from .wire import pack_vertical
+from .wire import scatter_vertical
+from .wire import pack_horizontal
+from .wire import scatter_horizontal
+from .wire import pack_fd
+
+
+__all__ = [
+    'Executor',
+    'ProxyExecutor',
+]
+
+
+def timings(total, solver):
+    """Construct the timings of a solver call.
+
+    Parameters
+    ----------
+    total : float
+        The total duration of the call, in seconds.
+    solver : float
+        The duration of the computation, in seconds.
+
+    Returns
+    -------
+    dict
+        The total duration, the duration of the computation,
+        and the remainder, which is spent on packing, transport and unpacking of data.
+    """
+    return {'total': total, 'solver': solver, 'transport': max(total - solver, 0.0)}
+
+
+class Executor(object):
+    """Base class for the execution backends of the RV2 solvers.
+
+    An executor runs the NumPy/SciPy solvers for the diagrams of a session,
+    and updates the diagrams in place with the results.
+    Every call returns a result dict with the outputs of the solver (if any)
+    and the timings of the call under the key ``"time"``.
+
+    Notes
+    -----
+    Use :class:`compas_rv2.execution.LocalExecutor` when NumPy is available in the current process
+    (for example, outside Rhino or in CPython Rhino 8),
+    and :class:`ProxyExecutor` otherwise.
+    """
+
+    def vertical(self, form, zmax, kmax=100, warmstart=False, cancel=None):
+        """Compute vertical equilibrium for a target height.
+
+        Parameters
+        ----------
+        form : :class:`compas_rv2.datastructures.FormDiagram`
+            The form diagram.
+        zmax : float
+            The target height of the thrust diagram.
+        kmax : int, optional
+            The maximum number of iterations.
+        warmstart : bool, optional
+            Start from the current heights and force densities of the form diagram,
+            and stop as soon as the tolerances are met.
+        cancel : :class:`compas_rv2.execution.Cancellation`, optional
+            A cancellation flag, for computations that run in the background.
+            If the computation is cancelled, the diagrams are not updated,
+            and :class:`compas_rv2.execution.Cancelled` is raised.
+
+        Returns
+        -------
+        dict or None
+            The scale of the horizontal forces (``"scale"``),
+            the number of iterations (``"iterations"``),
+            the norm of the residual forces at the free vertices (``"residual"``),
+            and the timings.
+            None if the computation failed.
+        """
+        raise NotImplementedError
+
+    def horizontal(self, form, force, alpha=100, kmax=100, callback=None, refreshrate=1, tol=None, checkrate=10, cancel=None):
+        """Compute horizontal equilibrium.
+
+        Parameters
+        ----------
+        form : :class:`compas_rv2.datastructures.FormDiagram`
+            The form diagram.
+        force : :class:`compas_rv2.datastructures.ForceDiagram`
+            The force diagram.
+        alpha : float, optional
+            Weighting factor for the computation of the target vectors.
+        kmax : int, optional
+            The maximum number of iterations.
+        callback : callable, optional
+            A function that is called with the iteration number, the XY coordinates of the force diagram,
+            and the edges of the force diagram, every ``refreshrate`` iterations.
+        refreshrate : int, optional
+            The number of iterations between calls to the callback.
+        tol : float, optional
+            Stop as soon as the maximum angle deviation in degrees is smaller than this tolerance.
+            Default is ``None``, which runs all ``kmax`` iterations.
+        checkrate : int, optional
+            The number of iterations between checks of the angle deviations.
+        cancel : :class:`compas_rv2.execution.Cancellation`, optional
+            A cancellation flag, for computations that run in the background.
+            If the computation is cancelled, the diagrams are not updated,
+            and :class:`compas_rv2.execution.Cancelled` is raised.
+
+        Returns
+        -------
+        dict or None
+            The number of iterations (``"iterations"``),
+            the iteration numbers and maximum angle deviations of the checks (``"history"``),
+            and the timings.
+            None if the computation failed.
+        """
+        raise NotImplementedError
+
+    def relax(self, mesh, fixed):
+        """Relax a mesh with the force density method, using the force densities of its edges.
+
+        Parameters
+        ----------
+        mesh : :class:`compas.datastructures.Mesh`
+            The mesh.
+        fixed : list
+            The identifiers of the vertices that should remain fixed.
+
+        Returns
+        -------
+        dict or None
+            The timings.
+            None if the computation failed.
+        """
+        key_index = mesh.key_index()
+        xyz = mesh.vertices_attributes('xyz')
+        loads = [[0.0, 0.0, 0.0] for _ in xyz]
+        fixed = [key_index[key] for key in fixed]
+        edges = [(key_index[u], key_index[v]) for u, v in mesh.edges()]
+        q = mesh.edges_attribute('q')
+        t0 = time()
+        result = self.fd(xyz, edges, fixed, q, loads)
+        if not result:
+            return None
+        xyz, solver = result
+        for key in mesh.vertices():
+            mesh.vertex_attributes(key, 'xyz', list(xyz[key_index[key]]))
+        return {'time': timings(time() - t0, solver)}
+
+    def fd(self, xyz, edges, fixed, q, loads):
+        """Compute the equilibrium coordinates with the force density method.
+
+        Returns
+        -------
+        tuple or None
+            The new vertex coordinates, and the duration of the computation.
+        """
+        raise NotImplementedError
+
+
+class ProxyExecutor(Executor):
+    """Executor that runs the solvers on the RPC server, through a proxy.
+
+    Only the numeric data used by the solvers is sent to the server,
+    as packed binary arrays (see :mod:`compas_rv2.execution.wire`).
+    The server only sends back the arrays that were changed by the solver,
+    and these are scattered back into the diagrams.
+
+    Parameters
+    ----------
+    proxy : :class:`compas_cloud.Proxy` or :class:`compas_rv2.execution.SolverPool`
+        The proxy.
+    session : hashable, optional
+        The session of the calls.
+        With a solver pool, the packed arrays of a session remain resident on a worker of the pool,
+        and only the arrays that changed are sent with the next call.
+
+    Notes
+    -----
+    A computation on the server cannot be interrupted.
+    If a computation is cancelled, the result is discarded when it arrives,
+    and the next call through the executor waits until the server is done.
+
+    Examples
+    --------
+    >>> executor = ProxyExecutor(Proxy(port=9009))
+    >>> result = executor.vertical(form, 4.0, kmax=300)
+    >>> result['scale']
+    >>> result['time']['transport']
+
+    """
+
+    def __init__(self, proxy, session=None):
+        self.proxy = proxy
+        self.session = session
+        self.lock = threading.Lock()
+
+    def function(self, name):
+        if self.session is None:
+            function = self.proxy.function(name)
+        else:
+            function = self.proxy.function(name, session=self.session)
+
+        # calls from background threads are sent one at a time
+        def call(*args, **kwargs):
+            with self.lock:
+                return function(*args, **kwargs)
+        return call
+
+    def vertical(self, form, zmax, kmax=100, warmstart=False, cancel=None):
+        cancel = cancel or Cancellation()
+        vertical = self.function('compas_rv2.execution.vertical_proxy')
+        t0 = time()
+        result = vertical(pack_vertical(form), zmax, kmax=kmax, warmstart=warmstart)
+        if not result:
+            return None
+        with cancel:
+            scatter_vertical(form, result)
+        return {'scale': result['scale'],
+                'iterations': result['iterations'],
+                'residual': result['residual'],
+                'time': timings(time() - t0, result['time'])}
+
+    def horizontal(self, form, force, alpha=100, kmax=100, callback=None, refreshrate=1, tol=None, checkrate=10, cancel=None):
+        cancel = cancel or Cancellation()
+        horizontal = self.function('compas_rv2.execution.horizontal_proxy')
+        t0 = time()
+        if callback:
+            result = horizontal(pack_horizontal(form, force), alpha=alpha, kmax=kmax, callback=callback, refreshrate=refreshrate, tol=tol, checkrate=checkrate)
+        else:
+            result = horizontal(pack_horizontal(form, force), alpha=alpha, kmax=kmax, tol=tol, checkrate=checkrate)
+        if not result:
+            return None
+        with cancel:
+            scatter_horizontal(form, force, result)
+        return {'iterations': result['iterations'], 'history': result['history'], 'time': timings(time() - t0, result['time'])}
+
+    def fd(self, xyz, edges, fixed, q, loads):
+        fd = self.function('compas_rv2.execution.fd_proxy')
+        result = fd(pack_fd(xyz, edges, fixed, q, loads))
+        if not result:
+            return None
+        return decode_array(result['xyz']), result['time']
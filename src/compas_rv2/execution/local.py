@@ -0,0 +1,217 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import os
+import importlib
+
+from time import time
+
+from compas_rv2.equilibrium import HorizontalArrays
+from compas_rv2.equilibrium import horizontal_nodal_arrays_numpy
+from compas_rv2.equilibrium import VerticalArrays
+from compas_rv2.equilibrium import vertical_topology
+from compas_rv2.equilibrium import vertical_from_zmax_arrays_numpy
+from compas_rv2.equilibrium import fd_topology
+from compas_rv2.equilibrium import fd_arrays_numpy
+
+from .background import Cancellation
+from .executor import Executor
+from .executor import timings
+from .wire_numpy import encode_array_numpy
+from .wire_numpy import decode_array_numpy
+
+
+__all__ = [
+    'LocalExecutor',
+    'vertical_proxy',
+    'horizontal_proxy',
+    'fd_proxy',
+    'warmup_proxy',
+    'ping_proxy',
+    'resident_proxy',
+]
+
+
+RESIDENT = {}
+
+
+class LocalExecutor(Executor):
+    """Executor that runs the solvers directly on the diagrams, in the current process.
+
+    Nothing is serialised, and the diagrams are updated by the solvers themselves.
+    The assembled matrices of the solvers are cached per topology,
+    in :data:`compas_rv2.equilibrium.TOPOLOGIES`.
+
+    Examples
+    --------
+    >>> executor = LocalExecutor()
+    >>> result = executor.vertical(form, 4.0, kmax=300)
+    >>> result['scale']
+    >>> result['time']['transport']
+    0.0
+
+    """
+
+    def vertical(self, form, zmax, kmax=100, warmstart=False, cancel=None):
+        cancel = cancel or Cancellation()
+        t0 = time()
+        arrays = VerticalArrays(form)
+        xyz, q, f, r, scale, iterations, residual = vertical_from_zmax_arrays_numpy(arrays.topology, arrays.xyz, arrays.p, arrays.t, arrays.q,
+                                                                                    zmax, kmax=kmax, warmstart=warmstart, callback=cancel.check)
+        with cancel:
+            arrays.unpack(xyz, q, f, r)
+        t = time() - t0
+        return {'scale': scale, 'iterations': iterations, 'residual': float(residual), 'time': timings(t, t)}
+
+    def horizontal(self, form, force, alpha=100, kmax=100, callback=None, refreshrate=1, tol=None, checkrate=10, cancel=None):
+        cancel = cancel or Cancellation()
+
+        # the cancellation is checked at every iteration
+        def update(k, xy, edges):
+            cancel.check()
+            if callback and k % refreshrate == 0:
+                callback(k, xy, edges)
+
+        stats = {}
+        t0 = time()
+        arrays = HorizontalArrays(form, force)
+        q, f, l, _l, a = horizontal_nodal_arrays_numpy(arrays, alpha=alpha, kmax=kmax, callback=update, refreshrate=1, tol=tol, checkrate=checkrate, stats=stats)
+        with cancel:
+            arrays.unpack(q, f, l, _l, a)
+        t = time() - t0
+        return {'iterations': stats['iterations'], 'history': stats['history'], 'time': timings(t, t)}
+
+    def fd(self, xyz, edges, fixed, q, loads):
+        t0 = time()
+        topology = fd_topology(len(xyz), edges, fixed)
+        xyz, q, f, l, r = fd_arrays_numpy(topology, xyz, q, loads)
+        return xyz, time() - t0
+
+
+# ==============================================================================
+# Functions called by the proxy executor on the RPC server
+# The data is exchanged as packed binary arrays, see compas_rv2.execution.wire
+# ==============================================================================
+
+
+def vertical_proxy(message, zmax, kmax=100, warmstart=False):
+    xyz = decode_array_numpy(message['xyz'])
+    topology = vertical_topology(xyz.shape[0],
+                                 decode_array_numpy(message['edges']),
+                                 decode_array_numpy(message['anchors']),
+                                 decode_array_numpy(message['faces']),
+                                 decode_array_numpy(message['sizes']),
+                                 decode_array_numpy(message['loaded']))
+    t0 = time()
+    xyz, q, f, r, scale, iterations, residual = vertical_from_zmax_arrays_numpy(topology,
+                                                                                xyz,
+                                                                                decode_array_numpy(message['p']),
+                                                                                decode_array_numpy(message['t']),
+                                                                                decode_array_numpy(message['q']),
+                                                                                zmax, kmax=kmax, warmstart=warmstart)
+    return {
+        'z': encode_array_numpy(xyz[:, 2]),
+        'r': encode_array_numpy(r),
+        'q': encode_array_numpy(q),
+        'f': encode_array_numpy(f),
+        'scale': float(scale),
+        'iterations': iterations,
+        'residual': float(residual),
+        'time': time() - t0,
+    }
+
+
+def horizontal_proxy(message, alpha=100, kmax=100, callback=None, refreshrate=1, tol=None, checkrate=10):
+    if callback:
+        # the proxy can only forward plain lists to the client
+        def redraw(k, xy, edges):
+            callback(k, xy.tolist(), edges.tolist())
+    else:
+        redraw = None
+    scale = message.pop('scale', 1.0)
+    arrays = HorizontalArrays.from_arrays(scale=scale, **{name: decode_array_numpy(value) for name, value in message.items()})
+    stats = {}
+    t0 = time()
+    q, f, l, _l, a = horizontal_nodal_arrays_numpy(arrays, alpha=alpha, kmax=kmax, callback=redraw, refreshrate=refreshrate,
+                                                   tol=tol, checkrate=checkrate, stats=stats)
+    t = time() - t0
+    return {
+        'xy': encode_array_numpy(arrays.xy),
+        '_xy': encode_array_numpy(arrays._xy),
+        'q': encode_array_numpy(q),
+        'f': encode_array_numpy(f),
+        'l': encode_array_numpy(l),
+        '_l': encode_array_numpy(_l),
+        'a': encode_array_numpy(a),
+        'iterations': stats['iterations'],
+        'history': [[k, deviation] for k, deviation in stats['history']],
+        'time': t,
+    }
+
+
+def fd_proxy(message):
+    xyz, t = LocalExecutor().fd(decode_array_numpy(message['xyz']),
+                                decode_array_numpy(message['edges']).reshape((-1, 2)).tolist(),
+                                decode_array_numpy(message['fixed']).tolist(),
+                                decode_array_numpy(message['q']),
+                                decode_array_numpy(message['loads']))
+    return {'xyz': encode_array_numpy(xyz), 'time': t}
+
+
+# ==============================================================================
+# Functions called by the solver pool on its workers
+# ==============================================================================
+
+
+def warmup_proxy():
+    """Load the solver modules, and run the solvers once on a tiny diagram."""
+    from compas.datastructures import Mesh
+    from compas_tna.diagrams import FormDiagram
+    from compas_tna.diagrams import ForceDiagram
+
+    t0 = time()
+    form = FormDiagram.from_mesh(Mesh.from_meshgrid(dx=1.0, nx=2))
+    form.vertices_attribute('is_anchor', True, keys=list(form.vertices_where({'vertex_degree': 2})))
+    form.update_boundaries()
+    force = ForceDiagram.from_formdiagram(form)
+    executor = LocalExecutor()
+    executor.horizontal(form, force, kmax=1)
+    executor.vertical(form, 1.0, kmax=1)
+    executor.relax(form, list(form.anchors()))
+    return time() - t0
+
+
+def ping_proxy():
+    """Identify the worker process."""
+    return os.getpid()
+
+
+def resident_proxy(session, name, keys, delta, *args, **kwargs):
+    """Call a solver with a message of packed arrays that is resident on the worker.
+
+    Parameters
+    ----------
+    session : hashable
+        The session of the call.
+    name : str
+        The full name of the solver function.
+    keys : list
+        The names of the arrays of the message.
+    delta : dict
+        The arrays that changed since the previous call of the session.
+
+    Returns
+    -------
+    object
+        The result of the solver,
+        or a dict with ``"resend": True`` if arrays of the message are not resident.
+
+    """
+    message = RESIDENT.setdefault((session, name), {})
+    message.update(delta)
+    if any(key not in message for key in keys):
+        return {'resend': True}
+    module, function = name.rsplit('.', 1)
+    function = getattr(importlib.import_module(module), function)
+    return function({key: message[key] for key in keys}, *args, **kwargs)
@@ -0,0 +1,321 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import threading
+
+from time import time
+
+
+__all__ = [
+    'Future',
+    'SolverPool',
+]
+
+
+class Future(object):
+    """The result of a call that is dispatched to a worker of a :class:`SolverPool`."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._result = None
+        self._error = None
+
+    def done(self):
+        """Is the call finished."""
+        return self._event.is_set()
+
+    def wait(self, timeout=None):
+        """Wait for the call to finish, and return True if it is finished."""
+        return self._event.wait(timeout)
+
+    def result(self, timeout=None):
+        """Wait for the call to finish and return its result.
+
+        Raises
+        ------
+        Exception
+            The error raised by the call, if any.
+        RuntimeError
+            If the call did not finish within the timeout.
+
+        """
+        if not self._event.wait(timeout):
+            raise RuntimeError('The call did not finish within {} seconds.'.format(timeout))
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def set_result(self, result):
+        self._result = result
+        self._event.set()
+
+    def set_error(self, error):
+        self._error = error
+        self._event.set()
+
+
+class Worker(object):
+    """A solver server of a pool, and the messages that are resident on it."""
+
+    def __init__(self, proxy, port):
+        self.proxy = proxy
+        self.port = port
+        self.lock = threading.Lock()
+        self.queued = 0
+        self.calls = 0
+        self.resident = {}
+
+
+class SolverPool(object):
+    """A pool of warm solver servers.
+
+    Every worker is a separate RPC server process with its own proxy,
+    such that independent calls are solved concurrently.
+    The solver modules (NumPy, SciPy, COMPAS TNA and the RV2 solvers) are imported on every worker
+    when the pool is started, such that the first solver call does not pay for the imports.
+
+    The pool has the same interface as a proxy,
+    and can be used as the proxy of a :class:`compas_rv2.execution.ProxyExecutor`.
+
+    Parameters
+    ----------
+    size : int, optional
+        The number of workers.
+    port : int, optional
+        The port of the first worker.
+        The other workers use the subsequent ports.
+    factory : callable, optional
+        A function that constructs the proxy of a worker from a port number.
+        Default is a :class:`compas_cloud.Proxy` that starts a server on the port,
+        or reconnects to a server that is already running on the port.
+    preload : bool, optional
+        Import the solver modules on all workers when the pool is started.
+
+    Notes
+    -----
+    Calls that belong to a session are always sent to the same worker.
+    The packed arrays of these calls remain resident on the worker,
+    and arrays that did not change since the previous call of the session are not sent again.
+
+    Examples
+    --------
+    >>> pool = SolverPool(size=2)
+    >>> executor = ProxyExecutor(pool, session='form')
+    >>> result = executor.vertical(form, 4.0)
+
+    Dispatch independent calls concurrently.
+
+    >>> relax = pool.submit('compas_rv2.execution.fd_proxy', pack_fd(xyz, edges, fixed, q, loads))
+    >>> horizontal = pool.submit('compas_rv2.execution.horizontal_proxy', pack_horizontal(form, force), kmax=500)
+    >>> relax.result()
+
+    """
+
+    def __init__(self, size=2, port=9009, factory=None, preload=True):
+        self.factory = factory or default_factory
+        self.lock = threading.Lock()
+        self.affinity = {}
+        self.workers = [Worker(self.factory(port + i), port + i) for i in range(size)]
+        if preload:
+            self.warmup()
+
+    @property
+    def size(self):
+        return len(self.workers)
+
+    # ==========================================================================
+    # dispatch
+    # ==========================================================================
+
+    def select(self, session=None):
+        """Select the worker for a call.
+
+        Calls of a session go to the worker of the session.
+        Other calls go to the worker with the fewest queued calls.
+        """
+        with self.lock:
+            if session is not None and session in self.affinity:
+                worker = self.affinity[session]
+            else:
+                worker = min(self.workers, key=lambda worker: worker.queued)
+                if session is not None:
+                    self.affinity[session] = worker
+            worker.queued += 1
+        return worker
+
+    def run(self, worker, name, *args, **kwargs):
+        session = kwargs.pop('session', None)
+        try:
+            with worker.lock:
+                worker.calls += 1
+                if session is None:
+                    return worker.proxy.function(name)(*args, **kwargs)
+                return self.run_resident(worker, session, name, *args, **kwargs)
+        finally:
+            with self.lock:
+                worker.queued -= 1
+
+    def run_resident(self, worker, session, name, message, *args, **kwargs):
+        """Send only the arrays of a message that are not yet resident on the worker."""
+        function = worker.proxy.function('compas_rv2.execution.resident_proxy')
+        resident = worker.resident.setdefault((session, name), {})
+        delta = {key: value for key, value in message.items() if resident.get(key) != value}
+        result = function(session, name, sorted(message), delta, *args, **kwargs)
+        if isinstance(result, dict) and result.get('resend'):
+            # the worker lost the resident data, for example after a restart
+            result = function(session, name, sorted(message), message, *args, **kwargs)
+        worker.resident[(session, name)] = dict(message)
+        return result
+
+    def function(self, name, session=None):
+        """Construct a function that runs on a worker of the pool.
+
+        Parameters
+        ----------
+        name : str
+            The full name of the function.
+        session : hashable, optional
+            The session of the calls.
+            Calls of the same session run on the same worker,
+            and their first argument is a message of packed arrays
+            that is kept resident on the worker.
+
+        Returns
+        -------
+        callable
+
+        """
+        def call(*args, **kwargs):
+            worker = self.select(session)
+            kwargs['session'] = session
+            return self.run(worker, name, *args, **kwargs)
+        return call
+
+    def submit(self, name, *args, **kwargs):
+        """Run a function on a worker of the pool in the background.
+
+        Parameters
+        ----------
+        name : str
+            The full name of the function.
+        args : list
+            The positional arguments of the function.
+        kwargs : dict
+            The named arguments of the function,
+            and optionally the session of the call (``session``).
+
+        Returns
+        -------
+        :class:`Future`
+
+        """
+        future = Future()
+        worker = self.select(kwargs.get('session'))
+
+        def target():
+            try:
+                future.set_result(self.run(worker, name, *args, **kwargs))
+            except Exception as e:
+                future.set_error(e)
+
+        thread = threading.Thread(target=target)
+        thread.daemon = True
+        thread.start()
+        return future
+
+    # ==========================================================================
+    # management
+    # ==========================================================================
+
+    def warmup(self):
+        """Import the solver modules on all workers, concurrently.
+
+        Returns
+        -------
+        list
+            Per worker, the time spent on the imports, in seconds.
+
+        """
+        futures = []
+        for worker in self.workers:
+            future = Future()
+            thread = threading.Thread(target=self._warmup, args=(worker, future))
+            thread.daemon = True
+            thread.start()
+            futures.append(future)
+        return [future.result() for future in futures]
+
+    def _warmup(self, worker, future):
+        try:
+            with worker.lock:
+                future.set_result(worker.proxy.function('compas_rv2.execution.warmup_proxy')())
+        except Exception as e:
+            future.set_error(e)
+
+    def health(self):
+        """Check the workers of the pool.
+
+        Returns
+        -------
+        list
+            Per worker, a dict with the port, the status (``"ok"``, ``"busy"`` or ``"error"``),
+            the number of calls, and the round trip time of the check.
+            Workers that are running a call are not checked.
+
+        """
+        report = []
+        for worker in self.workers:
+            status = {'port': worker.port, 'calls': worker.calls, 'status': 'ok', 'latency': None}
+            if not worker.lock.acquire(False):
+                status['status'] = 'busy'
+            else:
+                try:
+                    t0 = time()
+                    worker.proxy.function('compas_rv2.execution.ping_proxy')()
+                    status['latency'] = time() - t0
+                except Exception as e:
+                    status['status'] = 'error'
+                    status['message'] = str(e)
+                finally:
+                    worker.lock.release()
+            report.append(status)
+        return report
+
+    def restart(self, unhealthy=True):
+        """Restart the workers of the pool.
+
+        Parameters
+        ----------
+        unhealthy : bool, optional
+            Restart only the workers that fail the health check.
+
+        Returns
+        -------
+        list
+            The ports of the restarted workers.
+
+        """
+        restarted = []
+        for worker, status in zip(self.workers, self.health()):
+            if unhealthy and status['status'] != 'error':
+                continue
+            with worker.lock:
+                worker.proxy.restart()
+                worker.resident = {}
+                worker.proxy.function('compas_rv2.execution.warmup_proxy')()
+            restarted.append(worker.port)
+        return restarted
+
+    def shutdown(self):
+        """Shut down all workers of the pool."""
+        for worker in self.workers:
+            with worker.lock:
+                worker.proxy.shutdown()
+                worker.resident = {}
+        self.affinity = {}
+
+
+def default_factory(port):
+    from compas_cloud import Proxy
+    return Proxy(port=port)
@@ -0,0 +1,293 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import sys
+import base64
+
+from array import array
+
+
+__all__ = [
+    'encode_array',
+    'decode_array',
+    'pack_vertical',
+    'scatter_vertical',
+    'pack_horizontal',
+    'scatter_horizontal',
+    'pack_fd',
+]
+
+
+TYPECODES = {'f8': 'd', 'i4': 'i', 'u1': 'B'}
+
+
+def encode_array(values, dtype='f8'):
+    """Encode a (nested) list of numbers as a compact binary message.
+
+    Parameters
+    ----------
+    values : list
+        A flat list of numbers, or a list of rows of equal length.
+    dtype : {'f8', 'i4', 'u1'}, optional
+        The binary type of the numbers: 64-bit floats, 32-bit integers, or bytes (for flags).
+
+    Returns
+    -------
+    dict
+        The type, the shape, and the base64 encoded little-endian bytes of the numbers.
+
+    Examples
+    --------
+    >>> message = encode_array([[0.0, 1.0], [2.0, 3.0]])
+    >>> message['shape']
+    [2, 2]
+    >>> decode_array(message)
+    [[0.0, 1.0], [2.0, 3.0]]
+
+    """
+    values = list(values)
+    if values and isinstance(values[0], (list, tuple)):
+        shape = [len(values), len(values[0])]
+        flat = [value for row in values for value in row]
+    else:
+        shape = [len(values)]
+        flat = values
+    if dtype != 'f8':
+        flat = [int(value) for value in flat]
+    else:
+        flat = [float(value) for value in flat]
+    data = array(TYPECODES[dtype], flat)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    data = data.tobytes() if hasattr(data, 'tobytes') else data.tostring()
+    text = base64.b64encode(data)
+    if not isinstance(text, str):
+        text = text.decode('ascii')
+    return {'type': dtype, 'shape': shape, 'data': text}
+
+
+def decode_array(message):
+    """Decode a binary message into a (nested) list of numbers.
+
+    Parameters
+    ----------
+    message : dict
+        A message constructed with :func:`encode_array`.
+
+    Returns
+    -------
+    list
+        A flat list for one-dimensional messages, or a list of rows.
+
+    """
+    data = array(TYPECODES[message['type']])
+    raw = base64.b64decode(message['data'])
+    if hasattr(data, 'frombytes'):
+        data.frombytes(raw)
+    else:
+        data.fromstring(raw)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    shape = message['shape']
+    if len(shape) == 1:
+        return data.tolist()
+    n, m = shape
+    return [data[i * m:(i + 1) * m].tolist() for i in range(n)]
+
+
+# ==============================================================================
+# Vertical equilibrium
+# ==============================================================================
+
+
+def pack_vertical(form):
+    """Pack the data required for vertical equilibrium of a form diagram.
+
+    Only the numeric arrays used by the solver are packed:
+    the vertex coordinates, thicknesses and point loads, the anchors,
+    the vertex indices of the faces and the face load flags,
+    and the edges with their force densities.
+
+    Parameters
+    ----------
+    form : :class:`compas_rv2.datastructures.FormDiagram`
+        The form diagram.
+
+    Returns
+    -------
+    dict
+        The packed arrays.
+
+    """
+    key_index = form.key_index()
+    faces = []
+    sizes = []
+    loaded = []
+    for face in form.faces():
+        vertices = form.face_vertices(face)
+        faces += [key_index[vertex] for vertex in vertices]
+        sizes.append(len(vertices))
+        loaded.append(1 if form.face_attribute(face, '_is_loaded') else 0)
+    edges = list(form.edges_where({'_is_edge': True}))
+    return {
+        'xyz': encode_array(form.vertices_attributes('xyz')),
+        't': encode_array(form.vertices_attribute('t')),
+        'p': encode_array(form.vertices_attributes(['px', 'py', 'pz'])),
+        'anchors': encode_array([key_index[vertex] for vertex in form.anchors()], 'i4'),
+        'faces': encode_array(faces, 'i4'),
+        'sizes': encode_array(sizes, 'i4'),
+        'loaded': encode_array(loaded, 'u1'),
+        'edges': encode_array([[key_index[u], key_index[v]] for u, v in edges], 'i4'),
+        'q': encode_array(form.edges_attribute('q', keys=edges)),
+    }
+
+
+def scatter_vertical(form, result):
+    """Write the results of vertical equilibrium back to a form diagram.
+
+    Parameters
+    ----------
+    form : :class:`compas_rv2.datastructures.FormDiagram`
+        The form diagram that was packed with :func:`pack_vertical`.
+    result : dict
+        The packed heights and residuals of the vertices,
+        and the force densities and forces of the edges.
+
+    Returns
+    -------
+    None
+
+    """
+    z = decode_array(result['z'])
+    r = decode_array(result['r'])
+    q = decode_array(result['q'])
+    f = decode_array(result['f'])
+    key_index = form.key_index()
+    for key, attr in form.vertices(True):
+        index = key_index[key]
+        attr['z'] = z[index]
+        attr['_rx'], attr['_ry'], attr['_rz'] = r[index]
+    edges = list(form.edges_where({'_is_edge': True}))
+    for index, edge in enumerate(edges):
+        attr = form.edge_attributes(edge)
+        attr['q'] = q[index]
+        attr['_f'] = f[index]
+    if hasattr(form, 'modified'):
+        form.modified('vertices', ['z', '_rx', '_ry', '_rz'])
+        form.modified('edges', ['q', '_f'], edges)
+
+
+# ==============================================================================
+# Horizontal equilibrium
+# ==============================================================================
+
+
+def pack_horizontal(form, force):
+    """Pack the data required for horizontal equilibrium of a pair of diagrams.
+
+    The arrays are the same as the arrays of :class:`compas_rv2.equilibrium.HorizontalArrays`.
+
+    Parameters
+    ----------
+    form : :class:`compas_rv2.datastructures.FormDiagram`
+        The form diagram.
+    force : :class:`compas_rv2.datastructures.ForceDiagram`
+        The force diagram.
+
+    Returns
+    -------
+    dict
+        The packed arrays.
+
+    """
+    k_i = form.key_index()
+    form_edges = list(form.edges_where({'_is_edge': True}))
+    attrs = [form.edge_attributes(edge) for edge in form_edges]
+    _k_i = force.key_index()
+    force_edges = force.ordered_edges(form)
+    _attrs = [force.edge_attributes(edge) for edge in force_edges]
+    return {
+        'xy': encode_array(form.vertices_attributes('xy')),
+        'edges': encode_array([[k_i[u], k_i[v]] for u, v in form_edges], 'i4'),
+        'fixed': encode_array([k_i[key] for key in set(list(form.anchors()) + list(form.fixed()))], 'i4'),
+        'lmin': encode_array([attr['lmin'] for attr in attrs]),
+        'lmax': encode_array([attr['lmax'] for attr in attrs]),
+        'hmin': encode_array([attr['hmin'] for attr in attrs]),
+        'hmax': encode_array([attr['hmax'] for attr in attrs]),
+        'flipmask': encode_array([-1.0 if attr['_is_tension'] else 1.0 for attr in attrs]),
+        'q': encode_array([attr['q'] for attr in attrs]),
+        '_xy': encode_array(force.vertices_attributes('xy')),
+        '_edges': encode_array([[_k_i[u], _k_i[v]] for u, v in force_edges], 'i4'),
+        '_fixed': encode_array([_k_i[key] for key in force.fixed()], 'i4'),
+        '_lmin': encode_array([attr['lmin'] for attr in _attrs]),
+        '_lmax': encode_array([attr['lmax'] for attr in _attrs]),
+        'scale': force.attributes.get('scale', 1.0),
+    }
+
+
+def scatter_horizontal(form, force, result):
+    """Write the results of horizontal equilibrium back to a pair of diagrams.
+
+    Parameters
+    ----------
+    form : :class:`compas_rv2.datastructures.FormDiagram`
+        The form diagram that was packed with :func:`pack_horizontal`.
+    force : :class:`compas_rv2.datastructures.ForceDiagram`
+        The force diagram that was packed with :func:`pack_horizontal`.
+    result : dict
+        The packed coordinates of both diagrams,
+        and the force densities, forces, lengths and angle deviations of the edges.
+
+    Returns
+    -------
+    None
+
+    """
+    xy = decode_array(result['xy'])
+    _xy = decode_array(result['_xy'])
+    q = decode_array(result['q'])
+    f = decode_array(result['f'])
+    l = decode_array(result['l'])  # noqa: E741
+    _l = decode_array(result['_l'])
+    a = decode_array(result['a'])
+    k_i = form.key_index()
+    for key, attr in form.vertices(True):
+        attr['x'], attr['y'] = xy[k_i[key]]
+    edges = list(form.edges_where({'_is_edge': True}))
+    for index, edge in enumerate(edges):
+        attr = form.edge_attributes(edge)
+        attr['q'] = q[index]
+        attr['_f'] = f[index]
+        attr['_l'] = l[index]
+        attr['_a'] = a[index]
+    _k_i = force.key_index()
+    for key, attr in force.vertices(True):
+        attr['x'], attr['y'] = _xy[_k_i[key]]
+    _edges = force.ordered_edges(form)
+    for index, edge in enumerate(_edges):
+        attr = force.edge_attributes(edge)
+        attr['_l'] = _l[index]
+        attr['_a'] = a[index]
+    if hasattr(form, 'modified'):
+        form.modified('vertices', 'xy')
+        form.modified('edges', ['q', '_f', '_l', '_a'], edges)
+    if hasattr(force, 'modified'):
+        force.modified('vertices', 'xy')
+        force.modified('edges', ['_l', '_a'], _edges)
+
+
+# ==============================================================================
+# Force density
+# ==============================================================================
+
+
+def pack_fd(xyz, edges, fixed, q, loads):
+    """Pack the input of the force density method."""
+    return {
+        'xyz': encode_array(xyz),
+        'edges': encode_array(edges, 'i4'),
+        'fixed': encode_array(fixed, 'i4'),
+        'q': encode_array(q),
+        'loads': encode_array(loads),
+    }
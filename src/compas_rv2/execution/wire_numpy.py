@@ -0,0 +1,32 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import base64
+
+from numpy import ascontiguousarray
+from numpy import frombuffer
+
+
+__all__ = [
+    'encode_array_numpy',
+    'decode_array_numpy',
+]
+
+
+DTYPES = {'f8': '<f8', 'i4': '<i4', 'u1': 'u1'}
+
+
+def encode_array_numpy(values, dtype='f8'):
+    """Encode an array as a compact binary message.
+
+    The message has the same format as the messages of :func:`compas_rv2.execution.wire.encode_array`.
+    """
+    values = ascontiguousarray(values, dtype=DTYPES[dtype])
+    return {'type': dtype, 'shape': list(values.shape), 'data': base64.b64encode(values.tobytes()).decode('ascii')}
+
+
+def decode_array_numpy(message):
+    """Decode a binary message into a (writable) array that shares memory with the decoded bytes."""
+    data = bytearray(base64.b64decode(message['data']))
+    return frombuffer(data, dtype=DTYPES[message['type']]).reshape(message['shape'])
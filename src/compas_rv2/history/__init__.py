@@ -0,0 +1,35 @@
+"""
+********************************************************************************
+compas_rv2.history
+********************************************************************************
+
+.. currentmodule:: compas_rv2.history
+
+Undo history for the diagrams of an RV2 session.
+
+Instead of storing a full copy of the session after every command,
+the history stores only the changes between consecutive states of the diagrams
+(vertex coordinates, force densities, anchors, loads, ...),
+and applies or reverts them in place.
+The history does not depend on Rhino.
+
+>>> history = History(budget=64 * 2 ** 20)
+>>> history.record({'form': form, 'force': force})
+>>> form.vertex_attribute(0, 'is_anchor', True)
+>>> history.record({'form': form, 'force': force})
+>>> history.undo({'form': form, 'force': force})
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    History
+
+"""
+from __future__ import absolute_import
+
+from .history import History
+
+__all__ = [
+    'History',
+]
@@ -0,0 +1,426 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from ast import literal_eval
+
+
+__all__ = ['History']
+
+
+MISSING = object()
+
+SECTIONS = ('vertex', 'facedata', 'edgedata')
+
+
+class History(object):
+    """Undo history based on the differences between consecutive states of the diagrams.
+
+    Parameters
+    ----------
+    budget : int, optional
+        The approximate amount of memory, in bytes, available for the recorded changes.
+        When the budget is exceeded, the oldest steps are discarded.
+        The most recent step is always kept.
+        Default is ``64 * 2 ** 20``.
+
+    Notes
+    -----
+    The history keeps one lightweight snapshot of the current state of every diagram,
+    consisting of copies of the attribute dicts of the vertices, faces and edges.
+    Recording a step compares the diagrams with this snapshot
+    and stores only the attributes that have changed.
+
+    Changes of attribute values are applied and reverted in place.
+    If the topology of a diagram has changed, the step stores the complete data
+    of the diagram before and after the change,
+    and the data of the existing diagram object is replaced when the step is applied or reverted.
+    If a diagram object was added to, removed from, or replaced in the session,
+    a new diagram object is constructed from the stored data.
+
+    Attribute values are compared and stored as is.
+    Values that are modified in place, such as lists, are therefore not tracked.
+
+    Examples
+    --------
+    >>> history = History()
+    >>> diagrams = {'form': form, 'force': force}
+    >>> history.record(diagrams)
+    False
+    >>> form.vertex_attribute(0, 'is_anchor', True)
+    >>> history.record(diagrams)
+    True
+    >>> history.undo(diagrams)
+    []
+    >>> form.vertex_attribute(0, 'is_anchor')
+    False
+
+    """
+
+    def __init__(self, budget=64 * 2 ** 20):
+        self.budget = budget
+        self._undo = []
+        self._redo = []
+        self._objects = None
+        self._snapshots = None
+        self._settings = None
+
+    @property
+    def can_undo(self):
+        """bool: True if there is a recorded step that can be reverted."""
+        return len(self._undo) > 0
+
+    @property
+    def can_redo(self):
+        """bool: True if there is a reverted step that can be re-applied."""
+        return len(self._redo) > 0
+
+    @property
+    def nbytes(self):
+        """int: The approximate amount of memory, in bytes, used by the recorded steps."""
+        return sum(step['nbytes'] for step in self._undo) + sum(step['nbytes'] for step in self._redo)
+
+    def clear(self):
+        """Remove all recorded steps, and forget the current state of the diagrams."""
+        self._undo = []
+        self._redo = []
+        self._objects = None
+        self._snapshots = None
+        self._settings = None
+
+    def record(self, diagrams, settings=None):
+        """Record the changes since the previous recording as one undo step.
+
+        Parameters
+        ----------
+        diagrams : dict
+            The diagrams of the session, by name.
+            Names that are not used in the session can be mapped to ``None``.
+        settings : dict, optional
+            The settings of the session.
+
+        Returns
+        -------
+        bool
+            True if a step was recorded.
+            False if nothing has changed, or if this is the first recording,
+            in which case only the current state of the diagrams is stored.
+
+        """
+        if self._snapshots is None:
+            self._objects = {}
+            self._snapshots = {}
+            for name, diagram in diagrams.items():
+                if diagram is not None:
+                    self._objects[name] = diagram
+                    self._snapshots[name] = mesh_snapshot(diagram)
+            self._settings = copy_settings(settings)
+            return False
+        step = {'diagrams': {}, 'settings': None}
+        for name in set(diagrams) | set(self._objects):
+            change = self._diff_diagram(name, diagrams.get(name))
+            if change:
+                step['diagrams'][name] = change
+        if settings is not None and settings != self._settings:
+            before = self._settings
+            self._settings = copy_settings(settings)
+            step['settings'] = before, copy_settings(settings)
+        if not step['diagrams'] and not step['settings']:
+            return False
+        step['nbytes'] = sizeof(step)
+        self._undo.append(step)
+        self._redo = []
+        self._trim()
+        return True
+
+    def undo(self, diagrams, settings=None):
+        """Revert the most recent step.
+
+        Changes that were made after the most recent recording are recorded first.
+
+        Parameters
+        ----------
+        diagrams : dict
+            The diagrams of the session, by name.
+            The dict is updated in place if diagram objects have to be replaced.
+        settings : dict, optional
+            The settings of the session.
+            The dict is updated in place.
+
+        Returns
+        -------
+        list or None
+            The names of the diagrams whose objects were replaced.
+            None if there was nothing to undo.
+
+        """
+        self.record(diagrams, settings)
+        if not self._undo:
+            return None
+        step = self._undo.pop()
+        replaced = self._apply(step, diagrams, settings, 0)
+        self._redo.append(step)
+        return replaced
+
+    def redo(self, diagrams, settings=None):
+        """Re-apply the most recently reverted step.
+
+        Parameters
+        ----------
+        diagrams : dict
+            The diagrams of the session, by name.
+            The dict is updated in place if diagram objects have to be replaced.
+        settings : dict, optional
+            The settings of the session.
+            The dict is updated in place.
+
+        Returns
+        -------
+        list or None
+            The names of the diagrams whose objects were replaced.
+            None if there was nothing to redo.
+
+        """
+        self.record(diagrams, settings)
+        if not self._redo:
+            return None
+        step = self._redo.pop()
+        replaced = self._apply(step, diagrams, settings, 1)
+        self._undo.append(step)
+        return replaced
+
+    # --------------------------------------------------------------------------
+    # helpers
+    # --------------------------------------------------------------------------
+
+    def _diff_diagram(self, name, diagram):
+        previous = self._objects.get(name)
+        if diagram is None and previous is None:
+            return None
+        if diagram is not previous:
+            before = None
+            after = None
+            if previous is not None:
+                before = type(previous), self._snapshots[name]
+                del self._objects[name]
+                del self._snapshots[name]
+            if diagram is not None:
+                after = type(diagram), mesh_snapshot(diagram)
+                self._objects[name] = diagram
+                self._snapshots[name] = copy_snapshot(after[1])
+            return 'replace', before, after
+        snapshot = self._snapshots[name]
+        if has_topology_changed(snapshot, diagram):
+            after = mesh_snapshot(diagram)
+            self._snapshots[name] = copy_snapshot(after)
+            return 'data', snapshot, after
+        sections = diff_sections(snapshot, mesh_sections(diagram))
+        if not sections:
+            return None
+        apply_sections(snapshot, sections, 1)
+        return 'attributes', sections
+
+    def _apply(self, step, diagrams, settings, index):
+        replaced = []
+        for name, change in step['diagrams'].items():
+            if change[0] == 'attributes':
+                apply_sections(mesh_sections(diagrams[name]), change[1], index)
+                apply_sections(self._snapshots[name], change[1], index)
+                # the attributes are restored in the attribute dicts, bypassing the setters of the diagram
+                if hasattr(diagrams[name], 'modified'):
+                    modified_sections(diagrams[name], change[1])
+            elif change[0] == 'data':
+                diagrams[name].data = copy_snapshot(change[1 + index])
+                self._snapshots[name] = copy_snapshot(change[1 + index])
+            else:
+                state = change[1 + index]
+                if state is None:
+                    diagrams[name] = None
+                    self._objects.pop(name, None)
+                    self._snapshots.pop(name, None)
+                else:
+                    cls, snapshot = state
+                    diagram = cls.from_data(copy_snapshot(snapshot))
+                    diagrams[name] = diagram
+                    self._objects[name] = diagram
+                    self._snapshots[name] = copy_snapshot(snapshot)
+                replaced.append(name)
+        if step['settings']:
+            values = step['settings'][index]
+            self._settings = copy_settings(values)
+            if settings is not None:
+                settings.clear()
+                settings.update(copy_settings(values))
+        return replaced
+
+    def _trim(self):
+        nbytes = self.nbytes
+        while len(self._undo) > 1 and nbytes > self.budget:
+            nbytes -= self._undo.pop(0)['nbytes']
+
+
+# ==============================================================================
+# Snapshots
+# ==============================================================================
+
+
+def mesh_sections(mesh):
+    """Get the attribute dicts of a mesh, by section."""
+    return {
+        'attributes': mesh.attributes,
+        'vertex': mesh.vertex,
+        'facedata': mesh.facedata,
+        'edgedata': mesh.edgedata,
+    }
+
+
+def mesh_snapshot(mesh):
+    """Copy the data of a mesh, without copying the attribute values."""
+    return {
+        'attributes': dict(mesh.attributes),
+        'vertex': {key: dict(attr) for key, attr in mesh.vertex.items()},
+        'face': {fkey: list(vertices) for fkey, vertices in mesh.face.items()},
+        'facedata': {fkey: dict(attr) for fkey, attr in mesh.facedata.items()},
+        'edgedata': {key: dict(attr) for key, attr in mesh.edgedata.items()},
+        'max_vertex': mesh._max_vertex,
+        'max_face': mesh._max_face,
+    }
+
+
+def copy_snapshot(snapshot):
+    """Copy a snapshot, such that it can be used as mesh data."""
+    return {
+        'attributes': dict(snapshot['attributes']),
+        'vertex': {key: dict(attr) for key, attr in snapshot['vertex'].items()},
+        'face': {fkey: list(vertices) for fkey, vertices in snapshot['face'].items()},
+        'facedata': {fkey: dict(attr) for fkey, attr in snapshot['facedata'].items()},
+        'edgedata': {key: dict(attr) for key, attr in snapshot['edgedata'].items()},
+        'max_vertex': snapshot['max_vertex'],
+        'max_face': snapshot['max_face'],
+    }
+
+
+def copy_settings(settings):
+    """Copy nested settings dicts."""
+    if isinstance(settings, dict):
+        return {key: copy_settings(value) for key, value in settings.items()}
+    if isinstance(settings, list):
+        return [copy_settings(value) for value in settings]
+    return settings
+
+
+def has_topology_changed(snapshot, mesh):
+    """Verify if the vertices or faces of a mesh differ from those of a snapshot."""
+    if len(snapshot['vertex']) != len(mesh.vertex):
+        return True
+    if any(key not in snapshot['vertex'] for key in mesh.vertex):
+        return True
+    return snapshot['face'] != mesh.face
+
+
+# ==============================================================================
+# Differences
+# ==============================================================================
+
+
+def diff_attributes(old, new):
+    """Compute the attribute values that differ between two attribute dicts.
+
+    Returns
+    -------
+    tuple
+        The changed values before and after the change.
+        Attributes that are not set have the value ``MISSING``.
+    """
+    before = {}
+    after = {}
+    for name, value in new.items():
+        if name not in old:
+            before[name] = MISSING
+            after[name] = value
+        elif old[name] != value:
+            before[name] = old[name]
+            after[name] = value
+    for name in old:
+        if name not in new:
+            before[name] = old[name]
+            after[name] = MISSING
+    return before, after
+
+
+def diff_sections(old, new):
+    """Compute the differences between the attribute dicts of two sets of mesh sections.
+
+    Returns
+    -------
+    dict
+        Per section, a list of changes ``(key, before, after)``.
+        If an element was added or removed, ``before`` or ``after`` is ``None``.
+        For the attributes of the mesh itself, a single pair ``(before, after)``.
+    """
+    sections = {}
+    if old['attributes'] != new['attributes']:
+        sections['attributes'] = diff_attributes(old['attributes'], new['attributes'])
+    for section in SECTIONS:
+        old_section = old[section]
+        new_section = new[section]
+        changes = []
+        for key, attr in new_section.items():
+            if key not in old_section:
+                changes.append((key, None, dict(attr)))
+                continue
+            attr_ = old_section[key]
+            if attr_ != attr:
+                before, after = diff_attributes(attr_, attr)
+                changes.append((key, before, after))
+        for key, attr in old_section.items():
+            if key not in new_section:
+                changes.append((key, dict(attr), None))
+        if changes:
+            sections[section] = changes
+    return sections
+
+
+def update_attributes(attr, values):
+    for name, value in values.items():
+        if value is MISSING:
+            attr.pop(name, None)
+        else:
+            attr[name] = value
+
+
+def apply_sections(target, sections, index):
+    """Apply (``index=1``) or revert (``index=0``) differences to a set of mesh sections."""
+    if 'attributes' in sections:
+        update_attributes(target['attributes'], sections['attributes'][index])
+    for section in SECTIONS:
+        if section not in sections:
+            continue
+        data = target[section]
+        for change in sections[section]:
+            key = change[0]
+            values = change[1 + index]
+            if values is None:
+                del data[key]
+            elif change[2 - index] is None:
+                data[key] = dict(values)
+            else:
+                update_attributes(data[key], values)
+
+
+def modified_sections(mesh, sections):
+    """Record the modifications of the elements of a mesh in a set of differences."""
+    for section, name in (('vertex', 'vertices'), ('edgedata', 'edges'), ('facedata', 'faces')):
+        for key, before, after in sections.get(section, []):
+            if section == 'edgedata' and isinstance(key, str):
+                key = literal_eval(key)
+            mesh.modified(name, set(before or {}) | set(after or {}), [key])
+
+
+def sizeof(obj):
+    """Estimate the memory used by a nested structure of dicts, lists and values."""
+    if isinstance(obj, dict):
+        return 64 + sum(sizeof(key) + sizeof(value) for key, value in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return 56 + sum(sizeof(value) for value in obj)
+    return 32
@@ -48,7 +48,12 @@ from .helpers import (
     get_rv2,
     get_scene,
     get_proxy,
+    get_pool,
+    get_executor,
+    print_timings,
+    solve_in_background,
     get_system,
+    find_object,
     select_vertices,
     select_edges,
     select_faces,
@@ -99,7 +104,12 @@ __all__ = [
     'get_rv2',
     'get_scene',
     'get_proxy',
+    'get_pool',
+    'get_executor',
+    'print_timings',
+    'solve_in_background',
     'get_system',
+    'find_object',
     'select_vertices',
     'select_edges',
     'select_faces',
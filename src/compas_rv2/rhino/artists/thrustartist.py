@@ -39,13 +39,12 @@ class ThrustArtist(MeshArtist):
         The magnitude of selfweight is calculated by the tributary area of the vertex of the loaded faces times its thickness `t`.
         """
         vertex_xyz = self.vertex_xyz
+        selfweight = self.mesh.vertices_selfweight()
         lines = []
 
         for vertex in vertices:
             a = vertex_xyz[vertex]
-            area = self.mesh.vertex_tributary_area(vertex)
-            thickness = self.mesh.vertex_attribute(vertex, 't')
-            weight = area * thickness
+            weight = selfweight[vertex]
             load = scale_vector((0, 0, 1), scale * weight)
             b = add_vectors(a, load)
             lines.append({'start': a, 'end': b, 'color': color, 'arrow': "start"})
@@ -4,19 +4,21 @@ from __future__ import division
 
 from compas_rhino.conduits import BaseConduit
 
-from Rhino.Geometry import Point3d
 from Rhino.Geometry import Line
 
-from System.Collections.Generic import List
+from System import Array
 from System.Drawing.Color import FromArgb
 
 
 class HorizontalConduit(BaseConduit):
-    """A Rhino display conduit for lines.
+    """A Rhino display conduit for the force diagram during the computation of horizontal equilibrium.
+
+    The lines are stored in a buffer with one line per edge,
+    which is allocated once and updated in place with every snapshot of the solver.
 
     Parameters
     ----------
-    lines : list of 2-tuple
+    lines : list of 2-tuple, optional
         A list of start-end point pairs that define the lines.
     thickness : list of int, optional
         The thickness of the individual lines.
@@ -34,18 +36,64 @@ class HorizontalConduit(BaseConduit):
 
     Examples
     --------
-    >>>
+    >>> conduit = HorizontalConduit()
+    >>> with conduit.enabled():
+    ...     conduit.update(xy, edges)
+    ...     conduit.redraw()
 
     """
 
-    def __init__(self, lines, **kwargs):
+    def __init__(self, lines=None, **kwargs):
         super(HorizontalConduit, self).__init__(**kwargs)
         self._default_thickness = 1.0
         self._default_color = FromArgb(255, 255, 255)
+        self._edges = None
+        self._flat = None
+        self._buffer = Array[Line](0)
         self.lines = lines or []
 
+    @property
+    def lines(self):
+        return [[[line.FromX, line.FromY], [line.ToX, line.ToY]] for line in self._buffer]
+
+    @lines.setter
+    def lines(self, lines):
+        self._edges = None
+        self._buffer = Array[Line](len(lines))
+        for index, (start, end) in enumerate(lines):
+            self._buffer[index] = Line(start[0], start[1], 0.0, end[0], end[1], 0.0)
+
+    def update(self, xy, edges):
+        """Update the lines with the coordinates of the force diagram in the frame of the solver.
+
+        The solver computes the force diagram rotated by 90 degrees,
+        and the coordinates are rotated back before they are drawn.
+
+        Parameters
+        ----------
+        xy : list or array (n x 2)
+            The XY coordinates of the vertices of the force diagram.
+        edges : list or array (m x 2)
+            The edges of the force diagram as pairs of vertex indices.
+            The edges do not change during a computation,
+            and are only converted and allocated if their number changes.
+
+        """
+        if self._edges is None or len(edges) != len(self._edges):
+            self._edges = edges.tolist() if hasattr(edges, 'tolist') else edges
+            self._flat = [(2 * i, 2 * j) for i, j in self._edges]
+            self._buffer = Array[Line](len(self._edges))
+        buffer = self._buffer
+        if hasattr(xy, 'ravel'):
+            # a single flat list of floats per snapshot, without a list per vertex
+            flat = xy.ravel().tolist()
+            for index, (i, j) in enumerate(self._flat):
+                buffer[index] = Line(flat[i + 1], -flat[i], 0.0, flat[j + 1], -flat[j], 0.0)
+        else:
+            for index, (i, j) in enumerate(self._edges):
+                a = xy[i]
+                b = xy[j]
+                buffer[index] = Line(a[1], -a[0], 0.0, b[1], -b[0], 0.0)
+
     def DrawForeground(self, e):
-        lines = List[Line](len(self.lines))
-        for start, end in self.lines:
-            lines.Add(Line(Point3d(start[0], start[1], 0), Point3d(end[0], end[1], 0)))
-        e.Display.DrawLines(lines, self._default_color, self._default_thickness)
+        e.Display.DrawLines(self._buffer, self._default_color, self._default_thickness)
@@ -4,9 +4,11 @@ from __future__ import division
 
 from compas_rhino.conduits import BaseConduit
 
-from compas.geometry import add_vectors
-from compas.geometry import scale_vector
-from compas.geometry import length_vector_sqrd
+from compas_rv2.scene.buffers import ArrowBuffer
+from compas_rv2.scene.buffers import arrows_selfweight
+from compas_rv2.scene.buffers import arrows_reactions
+from compas_rv2.scene.buffers import arrows_loads
+from compas_rv2.scene.buffers import arrows_residuals
 
 from System.Drawing.Color import FromArgb
 
@@ -14,48 +16,72 @@ from Rhino.Geometry import Line
 from Rhino.Geometry import Point3d
 
 
-class SelfWeightConduit(BaseConduit):
-    """Display conduit for ThrustDiagram selfweight.
+class ArrowConduit(BaseConduit):
+    """Base display conduit for arrows at the vertices of a ThrustDiagram.
+
+    The arrows are taken from an :class:`compas_rv2.scene.buffers.ArrowBuffer`,
+    and converted to lines only when the buffer was rebuilt,
+    such that a redraw of the viewport only draws the arrows.
+    Call :meth:`invalidate` after a change of the diagram.
 
     Parameters
     ----------
     mesh : :class:`compas_rv2.datastructures.ThrustDiagram`
         The thrust diagram.
     color : rgb tuple
-        The color of the reaction forces.
+        The color of the arrows.
     scale : float
         The scale factor.
     tol : float
-        Minimum length of a reaction force vector.
+        Minimum length of an arrow.
     """
 
+    arrows = None
+
     def __init__(self, mesh, color, scale, tol, **kwargs):
-        super(SelfWeightConduit, self).__init__(**kwargs)
+        super(ArrowConduit, self).__init__(**kwargs)
         self.mesh = mesh
         self.color = color
-        self.scale = scale
-        self.tol = tol
+        self.buffer = ArrowBuffer(self.arrows, scale=scale, tol=tol)
         self.arrow_size = 0.1
+        self._lines = []
+        self._version = None
+
+    @property
+    def scale(self):
+        return self.buffer.scale
+
+    @scale.setter
+    def scale(self, scale):
+        self.buffer.scale = scale
+
+    @property
+    def tol(self):
+        return self.buffer.tol
+
+    @tol.setter
+    def tol(self, tol):
+        self.buffer.tol = tol
+
+    def invalidate(self):
+        """Rebuild the arrows before the next redraw."""
+        self.buffer.invalidate()
 
     def DrawForeground(self, e):
-        for vertex in self.mesh.vertices():
-            ep = self.mesh.vertex_coordinates(vertex)
-            area = self.mesh.vertex_tributary_area(vertex)
-            thickness = self.mesh.vertex_attribute(vertex, 't')
-            weight = area * thickness
-            load = scale_vector((0, 0, 1), self.scale * weight)
-            if length_vector_sqrd(load) < self.tol ** 2:
-                continue
-            sp = add_vectors(ep, load)
-            line = Line(Point3d(*sp), Point3d(*ep))
+        version = self.buffer.update(self.mesh)
+        if version != self._version:
+            self._lines = [Line(Point3d(*sp), Point3d(*ep)) for sp, ep in zip(self.buffer.starts, self.buffer.ends)]
+            self._version = version
+        color = FromArgb(*self.color)
+        for line in self._lines:
             e.Display.DrawArrow(line,
-                                FromArgb(*self.color),
+                                color,
                                 0,
                                 self.arrow_size)
 
 
-class ReactionConduit(BaseConduit):
-    """Display conduit for ThrustDiagram reactions.
+class SelfWeightConduit(ArrowConduit):
+    """Display conduit for ThrustDiagram selfweight.
 
     Parameters
     ----------
@@ -69,30 +95,28 @@ class ReactionConduit(BaseConduit):
         Minimum length of a reaction force vector.
     """
 
-    def __init__(self, mesh, color, scale, tol, **kwargs):
-        super(ReactionConduit, self).__init__(**kwargs)
-        self.mesh = mesh
-        self.color = color
-        self.scale = scale
-        self.tol = tol
-        self.arrow_size = 0.1
+    arrows = staticmethod(arrows_selfweight)
 
-    def DrawForeground(self, e):
-        for vertex in self.mesh.vertices_where({'is_anchor': True}):
-            ep = self.mesh.vertex_coordinates(vertex)
-            r = self.mesh.vertex_attributes(vertex, ['_rx', '_ry', '_rz'])
-            r = scale_vector(r, self.scale)
-            if length_vector_sqrd(r) < self.tol ** 2:
-                continue
-            sp = add_vectors(ep, r)
-            line = Line(Point3d(*sp), Point3d(*ep))
-            e.Display.DrawArrow(line,
-                                FromArgb(*self.color),
-                                0,
-                                self.arrow_size)
 
+class ReactionConduit(ArrowConduit):
+    """Display conduit for ThrustDiagram reactions.
 
-class LoadConduit(BaseConduit):
+    Parameters
+    ----------
+    mesh : :class:`compas_rv2.datastructures.ThrustDiagram`
+        The thrust diagram.
+    color : rgb tuple
+        The color of the reaction forces.
+    scale : float
+        The scale factor.
+    tol : float
+        Minimum length of a reaction force vector.
+    """
+
+    arrows = staticmethod(arrows_reactions)
+
+
+class LoadConduit(ArrowConduit):
     """Display conduit for ThrustDiagram loads.
 
     Parameters
@@ -107,30 +131,10 @@ class LoadConduit(BaseConduit):
         Minimum length of a reaction force vector.
     """
 
-    def __init__(self, mesh, color, scale, tol, **kwargs):
-        super(LoadConduit, self).__init__(**kwargs)
-        self.mesh = mesh
-        self.color = color
-        self.scale = scale
-        self.tol = tol
-        self.arrow_size = 0.1
-
-    def DrawForeground(self, e):
-        for vertex in self.mesh.vertices():
-            ep = self.mesh.vertex_coordinates(vertex)
-            live = self.mesh.vertex_attribute(vertex, 'pz')
-            load = scale_vector((0, 0, 1), self.scale * live)
-            if length_vector_sqrd(load) < self.tol ** 2:
-                continue
-            sp = add_vectors(ep, load)
-            line = Line(Point3d(*sp), Point3d(*ep))
-            e.Display.DrawArrow(line,
-                                FromArgb(*self.color),
-                                0,
-                                self.arrow_size)
+    arrows = staticmethod(arrows_loads)
 
 
-class ResidualConduit(BaseConduit):
+class ResidualConduit(ArrowConduit):
     """Display conduit for ThrustDiagram residuals.
 
     Parameters
@@ -145,24 +149,4 @@ class ResidualConduit(BaseConduit):
         Minimum length of a reaction force vector.
     """
 
-    def __init__(self, mesh, color, scale, tol, **kwargs):
-        super(ResidualConduit, self).__init__(**kwargs)
-        self.mesh = mesh
-        self.color = color
-        self.scale = scale
-        self.tol = tol
-        self.arrow_size = 0.1
-
-    def DrawForeground(self, e):
-        for vertex in self.mesh.vertices_where({'is_anchor': False}):
-            ep = self.mesh.vertex_coordinates(vertex)
-            r = self.mesh.vertex_attributes(vertex, ['_rx', '_ry', '_rz'])
-            r = scale_vector(r, self.scale)
-            if length_vector_sqrd(r) < self.tol ** 2:
-                continue
-            sp = add_vectors(ep, r)
-            line = Line(Point3d(*sp), Point3d(*ep))
-            e.Display.DrawArrow(line,
-                                FromArgb(*self.color),
-                                0,
-                                self.arrow_size)
+    arrows = staticmethod(arrows_residuals)
@@ -3,21 +3,50 @@ from __future__ import absolute_import
 from __future__ import division
 
 import os
-import json
 from ast import literal_eval
+from time import time
 
 import scriptcontext as sc
 
+import compas
 import compas_rhino
 from compas_rhino.forms import TextForm
 
-from compas_rv2.datastructures import Pattern
-from compas_rv2.datastructures import FormDiagram
-from compas_rv2.datastructures import ForceDiagram
-from compas_rv2.datastructures import ThrustDiagram
+from compas_rv2.history import History
+from compas_rv2.execution import ProxyExecutor
+from compas_rv2.execution import BackgroundSolve
+from compas_rv2.execution import SnapshotChannel
+from compas_rv2.execution import Cancelled
+
+
+def find_object(diagram):
+    """Find the scene object of a diagram.
+
+    Parameters
+    ----------
+    diagram : :class:`compas.datastructures.Mesh` or scene object
+        The data structure of the object, or the object itself.
+
+    Returns
+    -------
+    object or None
+        The scene object, if the diagram is in the RV2 scene.
+    """
+    rv2 = sc.sticky.get("RV2")
+    scene = rv2['scene'] if rv2 else None
+    if not scene:
+        return None
+    for node in scene.nodes.values():
+        if node is diagram or node.datastructure is diagram:
+            return node
+    return None
 
 
 def match_vertices(diagram, keys):
+    node = find_object(diagram)
+    if node is not None and hasattr(node, 'vertex_guids'):
+        return node.vertex_guids(keys)
+    keys = set(keys)
     temp = compas_rhino.get_objects(name="{}.vertex.*".format(diagram.name))
     names = compas_rhino.get_object_names(temp)
     guids = []
@@ -30,6 +59,10 @@ def match_vertices(diagram, keys):
 
 
 def match_edges(diagram, keys):
+    node = find_object(diagram)
+    if node is not None and hasattr(node, 'edge_guids'):
+        return node.edge_guids(keys)
+    keys = set(tuple(key) for key in keys)
     temp = compas_rhino.get_objects(name="{}.edge.*".format(diagram.name))
     names = compas_rhino.get_object_names(temp)
     guids = []
@@ -43,6 +76,10 @@ def match_edges(diagram, keys):
 
 
 def match_faces(diagram, keys):
+    node = find_object(diagram)
+    if node is not None and hasattr(node, 'face_guids'):
+        return node.face_guids(keys)
+    keys = set(keys)
     temp = compas_rhino.get_objects(name="{}.face.*".format(diagram.name))
     names = compas_rhino.get_object_names(temp)
     guids = []
@@ -159,6 +196,82 @@ def get_proxy():
     return sc.sticky["RV2.proxy"]
 
 
+def get_pool():
+    return sc.sticky.get("RV2.pool")
+
+
+def get_executor():
+    if "RV2.executor" not in sc.sticky:
+        if not compas.IPY:
+            from compas_rv2.execution import LocalExecutor
+            sc.sticky["RV2.executor"] = LocalExecutor()
+        elif get_pool():
+            sc.sticky["RV2.executor"] = ProxyExecutor(get_pool(), session=get_system()["session.id"])
+        else:
+            proxy = get_proxy()
+            if not proxy:
+                return None
+            sc.sticky["RV2.executor"] = ProxyExecutor(proxy)
+    return sc.sticky["RV2.executor"]
+
+
+def print_timings(result):
+    time = result['time']
+    print("solver: {:.3f}s, transport: {:.3f}s, total: {:.3f}s".format(time['solver'], time['transport'], time['total']))
+
+
+def solve_in_background(function, *args, **kwargs):
+    """Run a call of the executor on a separate thread, while Rhino remains responsive.
+
+    The call can be cancelled with ESC.
+    The intermediate results of the solver are drawn at an interval that adapts to the time it takes to draw them.
+
+    Parameters
+    ----------
+    function : callable
+        A method of the executor.
+    args : list
+        The positional arguments of the call.
+    kwargs : dict
+        The named arguments of the call,
+        and optionally a function that draws the snapshots of the solver (``draw``).
+        The snapshots are passed to the solver as its callback.
+
+    Returns
+    -------
+    dict or None
+        The result of the call.
+
+    Raises
+    ------
+    :class:`compas_rv2.execution.Cancelled`
+        If the call was cancelled before the diagrams were updated.
+
+    """
+    draw = kwargs.pop('draw', None)
+    channel = None
+    if draw:
+        channel = SnapshotChannel()
+        kwargs['callback'] = channel.callback
+    # reset an escape that was pressed before the call
+    sc.escape_test(False, True)
+    solve = BackgroundSolve(function, *args, **kwargs)
+    compas_rhino.rs.Prompt('Computing... Press ESC to cancel.')
+    while not solve.wait(0.01):
+        if sc.escape_test(False, True):
+            if solve.cancel():
+                raise Cancelled()
+            break
+        if channel:
+            snapshot = channel.take()
+            if snapshot:
+                t0 = time()
+                draw(*snapshot)
+                channel.drawn(time() - t0)
+    compas_rhino.rs.Prompt('')
+    return solve.result()
+
+
 def get_system():
     if "RV2.system" not in sc.sticky:
         form = TextForm('Initialise the plugin first!', 'RV2')
@@ -168,99 +281,73 @@ def get_system():
 
 
 def save_session():
-    scene = get_scene()
-    session = {
-        "data": {"pattern": None, "form": None, "force": None},
-        "settings": scene.settings,
-    }
-    pattern = scene.get('pattern')[0]
-    if pattern:
-        session['data']['pattern'] = pattern.datastructure.to_data()
-    form = scene.get('form')[0]
-    if form:
-        session['data']['form'] = form.datastructure.to_data()
-    force = scene.get('force')[0]
-    if force:
-        session['data']['force'] = force.datastructure.to_data()
-    return session
+    return get_scene().save_session()
 
 
 def save_session_thrust():
-    scene = get_scene()
-    session = {
-        "data": {
-            "thrust": None
-        },
-        "settings": scene.settings,
-    }
-    thrust = scene.get('thrust')[0].datastructure
+    return get_scene().save_session_thrust()
 
-    faces = list(thrust.faces_where({'_is_loaded': False}))
 
-    for face in faces:
-        thrust.delete_face(face)
+def load_session(session):
+    print("loading session")
+    get_scene().load_session(session)
 
-    if thrust:
-        session['data']['thrust'] = thrust.to_data()
 
-    return session
+def get_history():
+    if "RV2.history" not in sc.sticky:
+        sc.sticky["RV2.history"] = History()
+    history = sc.sticky["RV2.history"]
+    scene = get_scene()
+    if scene:
+        history.budget = scene.settings.get('RV2', {}).get('undo.memory', 64) * 2 ** 20
+    return history
 
 
-def load_session(session):
-    print("loading session")
+def get_diagrams():
     scene = get_scene()
-    scene.clear()
-    if 'settings' in session:
-        scene.settings = session['settings']
-    if 'data' in session:
-        data = session['data']
-        if 'pattern' in data and data['pattern']:
-            pattern = Pattern.from_data(data['pattern'])
-            scene.add(pattern, name="pattern")
-        else:
-            if 'form' in data and data['form']:
-                form = FormDiagram.from_data(data['form'])
-                thrust = form.copy(cls=ThrustDiagram)  # this is not a good idea
-                scene.add(form, name="form")
-                scene.add(thrust, name="thrust")
-
-            if 'force' in data and data['force']:
-                force = ForceDiagram.from_data(data['force'])
-                force.primal = form
-                form.dual = force
-                force.update_angle_deviations()
-                scene.add(force, name="force")
+    diagrams = {}
+    for name in ('pattern', 'form', 'force', 'thrust'):
+        node = scene.get(name)[0]
+        diagrams[name] = node.datastructure if node else None
+    return diagrams
+
+
+def update_diagrams(diagrams, replaced):
+    scene = get_scene()
+    if replaced:
+        scene.clear()
+        form = diagrams['form']
+        force = diagrams['force']
+        if form and force:
+            force.primal = form
+            form.dual = force
+            force.update_edge_index()
+        for name in ('pattern', 'form', 'thrust', 'force'):
+            if diagrams[name]:
+                scene.add(diagrams[name], name=name)
     scene.update()
 
 
 def record():
-    session = json.loads(json.dumps(save_session()))
-    sc.sticky["RV2.sessions"] = sc.sticky["RV2.sessions"][:sc.sticky["RV2.sessions.current"]+1]
-    sc.sticky["RV2.sessions"].append(session)
-    if len(sc.sticky["RV2.sessions"]) > 10:
-        sc.sticky["RV2.sessions"] = sc.sticky["RV2.sessions"][-10:]
-    sc.sticky["RV2.sessions.current"] = len(sc.sticky["RV2.sessions"]) - 1
+    get_history().record(get_diagrams(), get_scene().settings)
 
 
 def undo(sender, e):
+    history = get_history()
+    diagrams = get_diagrams()
     if e.Tag == "undo":
-        if sc.sticky["RV2.sessions.current"] - 1 < 0:
-            print("no more recorded sessions to undo")
+        replaced = history.undo(diagrams, get_scene().settings)
+        if replaced is None:
+            print("no more recorded steps to undo")
             return
-        sc.sticky["RV2.sessions.current"] -= 1
-        session = sc.sticky["RV2.sessions"][sc.sticky["RV2.sessions.current"]]
-        load_session(session)
         e.Document.AddCustomUndoEvent("RV2 Redo", undo, "redo")
     if e.Tag == "redo":
-        if sc.sticky["RV2.sessions.current"] + 1 >= len(sc.sticky["RV2.sessions"]):
-            print("no more recorded sessions to redo")
+        replaced = history.redo(diagrams, get_scene().settings)
+        if replaced is None:
+            print("no more recorded steps to redo")
             return
-        sc.sticky["RV2.sessions.current"] += 1
-        session = sc.sticky["RV2.sessions"][sc.sticky["RV2.sessions.current"]]
-        load_session(session)
         e.Document.AddCustomUndoEvent("RV2 Redo", undo, "undo")
-    print("current sessions:", sc.sticky["RV2.sessions.current"]+1)
-    print("total sessions:", len(sc.sticky["RV2.sessions"]))
+    update_diagrams(diagrams, replaced)
 
 
 def rv2_undo(command):
@@ -274,8 +361,8 @@ def rv2_undo(command):
         else:
             print("Custom undo recording", undoRecord)
 
-        if len(sc.sticky["RV2.sessions"]) == 0:
-            sc.sticky["RV2.sessions.current"] = 0
+        history = get_history()
+        if not history.can_undo and not history.can_redo:
             record()
         command(*args, **kwargs)
         record()
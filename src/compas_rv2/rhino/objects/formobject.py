@@ -3,10 +3,6 @@ from __future__ import absolute_import
 from __future__ import division
 
 from compas.utilities import i_to_rgb
-from compas.geometry import Point
-from compas.geometry import Scale
-from compas.geometry import Translation
-from compas.geometry import Rotation
 
 import compas_rhino
 
@@ -35,23 +31,48 @@ class FormObject(MeshObject):
     @property
     def vertex_xyz(self):
         """dict : The view coordinates of the mesh object."""
-        origin = Point(0, 0, 0)
-        if self.anchor is not None:
-            xyz = self.mesh.vertex_attributes(self.anchor, 'xyz')
-            point = Point(* xyz)
-            T1 = Translation.from_vector(origin - point)
-            S = Scale.from_factors([self.scale] * 3)
-            R = Rotation.from_euler_angles(self.rotation)
-            T2 = Translation.from_vector(self.location)
-            X = T2 * R * S * T1
-        else:
-            S = Scale.from_factors([self.scale] * 3)
-            R = Rotation.from_euler_angles(self.rotation)
-            T = Translation.from_vector(self.location)
-            X = T * R * S
-        mesh = self.mesh.transformed(X)
-        vertex_xyz = {vertex: mesh.vertex_attributes(vertex, 'xy') + [0.0] for vertex in mesh.vertices()}
-        return vertex_xyz
+        return self.view_coordinates.get(self.mesh, self.location, self.scale, self.rotation, anchor=self.anchor, flat=True)
+
+    def vertex_colors(self, vertices):
+        """The colors of vertices, by type of support."""
+        color = {}
+        for vertex in vertices:
+            if self.mesh.vertex_attribute(vertex, 'is_anchor'):
+                color[vertex] = self.settings['color.vertices:is_anchor']
+            elif self.mesh.vertex_attribute(vertex, 'is_fixed'):
+                color[vertex] = self.settings['color.vertices:is_fixed']
+            else:
+                color[vertex] = self.settings['color.vertices']
+        return color
+
+    def edge_colors(self, edges):
+        """The colors of edges, for compression and tension."""
+        colors = {}
+        for edge in edges:
+            if self.mesh.edge_attribute(edge, '_is_tension'):
+                colors[edge] = self.settings['color.tension']
+            else:
+                colors[edge] = self.settings['color.edges']
+        return colors
+
+    def redraw(self, changes):
+        """Redraw the changed vertices and edges of the form diagram.
+
+        The diagram is redrawn completely if the changes affect the colors or labels of other elements,
+        i.e. if the edges are colored by force, or if angle deviations are shown and the geometry or the deviations changed.
+
+        Parameters
+        ----------
+        changes : :class:`compas_rv2.scene.ChangeSet`
+            The changes of the vertices, edges and faces since the previous draw.
+        """
+        settings = self.scene.settings['RV2'] if self.scene else {}
+        edge_names = changes.names('edges')
+        if not self.visible or settings.get('show.forces') or '_is_edge' in edge_names:
+            return self.draw()
+        if settings.get('show.angles') and (changes.geometry or '_a' in edge_names):
+            return self.draw()
+        self.redraw_elements(changes)
 
     def draw(self):
         """Draw the objects representing the force diagram.
@@ -87,11 +108,7 @@ class FormObject(MeshObject):
         # ======================================================================
 
         vertices = list(self.mesh.vertices())
-        color = {vertex: self.settings['color.vertices'] for vertex in vertices}
-        color_fixed = self.settings['color.vertices:is_fixed']
-        color_anchor = self.settings['color.vertices:is_anchor']
-        color.update({vertex: color_fixed for vertex in self.mesh.vertices_where({'is_fixed': True}) if vertex in vertices})
-        color.update({vertex: color_anchor for vertex in self.mesh.vertices_where({'is_anchor': True}) if vertex in vertices})
+        color = self.vertex_colors(vertices)
 
         guids = self.artist.draw_vertices(vertices, color)
         self.guid_vertex = zip(guids, vertices)
@@ -109,16 +126,7 @@ class FormObject(MeshObject):
         # ======================================================================
 
         edges = list(self.mesh.edges_where({'_is_edge': True}))
-        colors = {}
-        t_colors = {}
-
-        for edge in edges:
-            if self.mesh.edge_attribute(edge, '_is_tension'):
-                colors[edge] = self.settings['color.tension']
-            else:
-                colors[edge] = self.settings['color.edges']
-
-        colors.update(t_colors)
+        colors = self.edge_colors(edges)
 
         # color analysis
         if self.scene and self.scene.settings['RV2']['show.forces']:
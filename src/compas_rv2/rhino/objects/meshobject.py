@@ -6,10 +6,6 @@ import Rhino
 
 import rhinoscriptsyntax as rs
 
-from compas.geometry import Point
-from compas.geometry import Scale
-from compas.geometry import Translation
-from compas.geometry import Rotation
 from compas.geometry import add_vectors
 
 import compas_rhino
@@ -18,6 +14,9 @@ from compas_rhino.objects import mesh_update_vertex_attributes
 from compas_rhino.objects import mesh_update_edge_attributes
 from compas_rhino.objects import mesh_update_face_attributes
 
+from compas_rv2.scene.view import ViewCoordinates
+from compas_rv2.scene.registry import GuidMap
+
 from compas_rv2.rhino import select_vertices as rv2_select_vertices
 from compas_rv2.rhino import select_faces as rv2_select_faces
 from compas_rv2.rhino import select_edges as rv2_select_edges
@@ -30,6 +29,9 @@ class MeshObject(MeshObject):
     """Scene object for mesh-based data structures in RV2.
     """
 
+    # if more than this fraction of the elements changed, the object is redrawn completely
+    REDRAW_FRACTION = 0.5
+
     @property
     def datastructure(self):
         return self.mesh
@@ -38,30 +40,158 @@ class MeshObject(MeshObject):
     def datastructure(self, datastructure):
         self.mesh = datastructure
 
+    @property
+    def guid_vertex(self):
+        """:class:`compas_rv2.scene.GuidMap` : Map between the guids of the Rhino points and the vertices."""
+        if not isinstance(self._guid_vertex, GuidMap):
+            self._guid_vertex = GuidMap(self._guid_vertex)
+        return self._guid_vertex
+
+    @guid_vertex.setter
+    def guid_vertex(self, values):
+        self._guid_vertex = GuidMap(values)
+
+    @property
+    def guid_edge(self):
+        """:class:`compas_rv2.scene.GuidMap` : Map between the guids of the Rhino lines and the edges."""
+        if not isinstance(self._guid_edge, GuidMap):
+            self._guid_edge = GuidMap(self._guid_edge)
+        return self._guid_edge
+
+    @guid_edge.setter
+    def guid_edge(self, values):
+        self._guid_edge = GuidMap(values)
+
+    @property
+    def guid_face(self):
+        """:class:`compas_rv2.scene.GuidMap` : Map between the guids of the Rhino meshes and the faces."""
+        if not isinstance(self._guid_face, GuidMap):
+            self._guid_face = GuidMap(self._guid_face)
+        return self._guid_face
+
+    @guid_face.setter
+    def guid_face(self, values):
+        self._guid_face = GuidMap(values)
+
+    def vertex_guids(self, vertices):
+        """The guids of the Rhino points of vertices."""
+        return self.guid_vertex.guids(vertices)
+
+    def edge_guids(self, edges):
+        """The guids of the Rhino lines of edges, in any orientation."""
+        return self.guid_edge.edge_guids(edges)
+
+    def face_guids(self, faces):
+        """The guids of the Rhino meshes of faces."""
+        return self.guid_face.guids(faces)
+
+    @property
+    def view_coordinates(self):
+        """:class:`compas_rv2.scene.ViewCoordinates` : The cached view coordinates of the object."""
+        if getattr(self, '_view_coordinates', None) is None:
+            self._view_coordinates = ViewCoordinates()
+        return self._view_coordinates
+
     @property
     def vertex_xyz(self):
         """dict : The view coordinates of the mesh object."""
-        origin = Point(0, 0, 0)
-        if self.anchor is not None:
-            xyz = self.mesh.vertex_attributes(self.anchor, 'xyz')
-            point = Point(* xyz)
-            T1 = Translation.from_vector(origin - point)
-            S = Scale.from_factors([self.scale] * 3)
-            R = Rotation.from_euler_angles(self.rotation)
-            T2 = Translation.from_vector(self.location)
-            X = T2 * R * S * T1
-        else:
-            S = Scale.from_factors([self.scale] * 3)
-            R = Rotation.from_euler_angles(self.rotation)
-            T = Translation.from_vector(self.location)
-            X = T * R * S
-        mesh = self.mesh.transformed(X)
-        vertex_xyz = {vertex: mesh.vertex_attributes(vertex, 'xyz') for vertex in mesh.vertices()}
-        return vertex_xyz
+        return self.view_coordinates.get(self.mesh, self.location, self.scale, self.rotation, anchor=self.anchor)
 
     def clear_conduits(self):
         pass
 
+    def redraw(self, changes):
+        """Redraw the changed elements of the object.
+
+        By default, the object is redrawn completely.
+
+        Parameters
+        ----------
+        changes : :class:`compas_rv2.scene.ChangeSet`
+            The changes of the vertices, edges and faces since the previous draw.
+        """
+        self.draw()
+
+    def redraw_elements(self, changes):
+        """Redraw the changed vertices, and the changed edges and the edges of moved vertices.
+
+        The object is redrawn completely if too many elements changed.
+        The colors of the elements are defined by the methods ``vertex_colors`` and ``edge_colors`` of the object.
+
+        Parameters
+        ----------
+        changes : :class:`compas_rv2.scene.ChangeSet`
+            The changes of the vertices, edges and faces since the previous draw.
+        """
+        guid_edge = self.guid_edge
+        edges = [guid_edge[guid] for guid in guid_edge.edge_guids(changes.affected_edges(self.mesh))]
+        vertices = list(changes.vertices)
+        if not self.is_partial(vertices, edges):
+            self.draw()
+            return
+        layer = self.settings['layer']
+        self.artist.layer = layer
+        self.artist.vertex_xyz = self.vertex_xyz
+        if vertices:
+            self.redraw_vertices(vertices, self.vertex_colors(vertices), "{}::vertices".format(layer), self.settings['show.vertices'])
+        if edges:
+            self.redraw_edges(edges, self.edge_colors(edges), "{}::edges".format(layer), self.settings['show.edges'])
+
+    def is_partial(self, vertices, edges):
+        """Verify if a redraw of a number of vertices and edges is cheaper than a full redraw."""
+        fraction = self.REDRAW_FRACTION
+        return len(vertices) <= fraction * self.mesh.number_of_vertices() and len(edges) <= fraction * self.mesh.number_of_edges()
+
+    def redraw_vertices(self, vertices, color, group, show=True):
+        """Replace the Rhino points of a selection of vertices.
+
+        Parameters
+        ----------
+        vertices : list
+            The vertices.
+        color : dict
+            The color per vertex.
+        group : str
+            The name of the group of the vertices.
+        show : bool, optional
+            Show or hide the new points.
+        """
+        guid_vertex = self.guid_vertex
+        old = guid_vertex.guids(vertices)
+        compas_rhino.delete_objects(old, purge=True)
+        guids = self.artist.draw_vertices(vertices, color)
+        for guid in old:
+            del guid_vertex[guid]
+        guid_vertex.update(zip(guids, vertices))
+        compas_rhino.rs.AddObjectsToGroup(guids, group)
+        if not show:
+            compas_rhino.rs.HideObjects(guids)
+
+    def redraw_edges(self, edges, color, group, show=True):
+        """Replace the Rhino lines of a selection of edges.
+
+        Parameters
+        ----------
+        edges : list
+            The edges, in the orientation in which they were drawn.
+        color : dict
+            The color per edge.
+        group : str
+            The name of the group of the edges.
+        show : bool, optional
+            Show or hide the new lines.
+        """
+        guid_edge = self.guid_edge
+        old = guid_edge.guids(edges)
+        compas_rhino.delete_objects(old, purge=True)
+        guids = self.artist.draw_edges(edges, color)
+        for guid in old:
+            del guid_edge[guid]
+        guid_edge.update(zip(guids, edges))
+        compas_rhino.rs.AddObjectsToGroup(guids, group)
+        if not show:
+            compas_rhino.rs.HideObjects(guids)
+
     def update_attributes(self):
         """Update the attributes of the data structure through a Rhino dialog.
 
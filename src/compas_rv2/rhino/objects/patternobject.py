@@ -3,10 +3,6 @@ from __future__ import absolute_import
 from __future__ import division
 
 import compas_rhino
-from compas.geometry import Point
-from compas.geometry import Scale
-from compas.geometry import Translation
-from compas.geometry import Rotation
 
 from .meshobject import MeshObject
 
@@ -33,27 +29,6 @@ class PatternObject(MeshObject):
         'from_surface.density.V': 10,
     }
 
-    @property
-    def vertex_xyz(self):
-        """dict : The view coordinates of the mesh object."""
-        origin = Point(0, 0, 0)
-        if self.anchor is not None:
-            xyz = self.mesh.vertex_attributes(self.anchor, 'xyz')
-            point = Point(* xyz)
-            T1 = Translation.from_vector(origin - point)
-            S = Scale.from_factors([self.scale] * 3)
-            R = Rotation.from_euler_angles(self.rotation)
-            T2 = Translation.from_vector(self.location)
-            X = T2 * R * S * T1
-        else:
-            S = Scale.from_factors([self.scale] * 3)
-            R = Rotation.from_euler_angles(self.rotation)
-            T = Translation.from_vector(self.location)
-            X = T * R * S
-        mesh = self.mesh.transformed(X)
-        vertex_xyz = {vertex: mesh.vertex_attributes(vertex, 'xyz') for vertex in mesh.vertices()}
-        return vertex_xyz
-
     def draw(self):
         """Draw the objects representing the force diagram.
         """
@@ -5,10 +5,8 @@ from __future__ import division
 import compas_rhino
 
 from compas.utilities import i_to_rgb
-from compas.geometry import Point
-from compas.geometry import Scale
-from compas.geometry import Translation
-from compas.geometry import Rotation
+
+from compas_rv2.scene.registry import GuidMap
 
 from .meshobject import MeshObject
 
@@ -63,8 +61,8 @@ class ThrustObject(MeshObject):
 
     def __init__(self, diagram, **kwargs):
         super(ThrustObject, self).__init__(diagram, **kwargs)
-        self._guid_free = {}
-        self._guid_anchor = {}
+        self._guid_free = GuidMap()
+        self._guid_anchor = GuidMap()
         self._guid_reaction = {}
         self._guid_residual = {}
         self._guid_selfweight = {}
@@ -75,34 +73,13 @@ class ThrustObject(MeshObject):
         self._conduit_loads = None
         self._conduit_residuals = None
 
-    @property
-    def vertex_xyz(self):
-        """dict : The view coordinates of the mesh object."""
-        origin = Point(0, 0, 0)
-        if self.anchor is not None:
-            xyz = self.mesh.vertex_attributes(self.anchor, 'xyz')
-            point = Point(* xyz)
-            T1 = Translation.from_vector(origin - point)
-            S = Scale.from_factors([self.scale] * 3)
-            R = Rotation.from_euler_angles(self.rotation)
-            T2 = Translation.from_vector(self.location)
-            X = T2 * R * S * T1
-        else:
-            S = Scale.from_factors([self.scale] * 3)
-            R = Rotation.from_euler_angles(self.rotation)
-            T = Translation.from_vector(self.location)
-            X = T * R * S
-        mesh = self.mesh.transformed(X)
-        vertex_xyz = {vertex: mesh.vertex_attributes(vertex, 'xyz') for vertex in mesh.vertices()}
-        return vertex_xyz
-
     @property
     def guid_free(self):
         return self._guid_free
 
     @guid_free.setter
     def guid_free(self, values):
-        self._guid_free = dict(values)
+        self._guid_free = GuidMap(values)
 
     @property
     def guid_anchor(self):
@@ -110,7 +87,12 @@ class ThrustObject(MeshObject):
 
     @guid_anchor.setter
     def guid_anchor(self, values):
-        self._guid_anchor = dict(values)
+        self._guid_anchor = GuidMap(values)
+
+    def vertex_guids(self, vertices):
+        """The guids of the Rhino points of free and anchored vertices."""
+        vertices = list(vertices)
+        return self.guid_free.guids(vertices) + self.guid_anchor.guids(vertices)
 
     @property
     def guid_selfweight(self):
@@ -232,8 +214,8 @@ class ThrustObject(MeshObject):
         guids += list(self.guid_residual)
         guids += list(self.guid_pipe)
         compas_rhino.delete_objects(guids, purge=True)
-        self._guid_free = {}
-        self._guid_anchor = {}
+        self._guid_free = GuidMap()
+        self._guid_anchor = GuidMap()
         self._guid_selfweight = {}
         self._guid_load = {}
         self._guid_residual = {}
@@ -350,11 +332,9 @@ class ThrustObject(MeshObject):
                 vertices = list(self.mesh.vertices())
                 vertex_colors = {vertex: self.settings['color.vertices'] if self.settings['_is.valid'] else self.settings['color.invalid'] for vertex in vertices}
 
-                stresses = [self.mesh.vertex_lumped_stress(vertex) for vertex in vertices]
-                smin = min(stresses)
-                smax = max(stresses)
+                stresses, smin, smax = self.mesh.vertices_lumped_stress()
 
-                for vertex, stress in zip(vertices, stresses):
+                for vertex, stress in stresses.items():
                     if smin != smax:
                         vertex_colors[vertex] = i_to_rgb((stress - smin) / (smax - smin))
 
@@ -388,6 +368,7 @@ class ThrustObject(MeshObject):
             self.conduit_selfweight.color = self.settings['color.selfweight']
             self.conduit_selfweight.scale = self.settings['scale.selfweight']
             self.conduit_selfweight.tol = self.settings['tol.selfweight']
+            self.conduit_selfweight.invalidate()
             self.conduit_selfweight.enable()
         else:
             if self.conduit_selfweight:
@@ -401,6 +382,7 @@ class ThrustObject(MeshObject):
             self.conduit_loads.color = self.settings['color.loads']
             self.conduit_loads.scale = self.settings['scale.externalforces']
             self.conduit_loads.tol = self.settings['tol.externalforces']
+            self.conduit_loads.invalidate()
             self.conduit_loads.enable()
         else:
             if self.conduit_loads:
@@ -414,6 +396,7 @@ class ThrustObject(MeshObject):
             self.conduit_residuals.color = self.settings['color.residuals']
             self.conduit_residuals.scale = self.settings['scale.residuals']
             self.conduit_residuals.tol = self.settings['tol.residuals']
+            self.conduit_residuals.invalidate()
             self.conduit_residuals.enable()
         else:
             if self.conduit_residuals:
@@ -427,6 +410,7 @@ class ThrustObject(MeshObject):
             self.conduit_reactions.color = self.settings['color.reactions']
             self.conduit_reactions.scale = self.settings['scale.externalforces']
             self.conduit_reactions.tol = self.settings['tol.externalforces']
+            self.conduit_reactions.invalidate()
             self.conduit_reactions.enable()
         else:
             if self.conduit_reactions:
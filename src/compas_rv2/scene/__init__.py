@@ -5,6 +5,10 @@ compas_rv2.scene
 
 .. currentmodule:: compas_rv2.scene
 
+The scene draws its objects through a drawing backend.
+In Rhino, the default backend builds and draws the RV2 Rhino scene objects.
+Elsewhere, the default backend builds headless scene objects that do not draw anything,
+such that the scene, sessions and command logic can be used without Rhino.
 
 .. autosummary::
     :toctree: generated/
@@ -12,13 +16,105 @@ compas_rv2.scene
 
     Scene
 
+Backends
+========
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    RhinoBackend
+    HeadlessBackend
+    RecordingBackend
+
+Objects
+=======
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    SceneObject
+
+View
+====
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    ViewCoordinates
+    view_matrix
+
+Registry
+========
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    GuidMap
+
+Changes
+=======
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    ChangeSet
+    ChangeTracker
+
+Buffers
+=======
+
+Precomputed display geometry, for display conduits that redraw often.
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    ArrowBuffer
+    arrows_selfweight
+    arrows_loads
+    arrows_reactions
+    arrows_residuals
+
 """
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from .objects import SceneObject
+from .backends import RhinoBackend
+from .backends import HeadlessBackend
+from .backends import RecordingBackend
+from .view import ViewCoordinates
+from .view import view_matrix
+from .registry import GuidMap
+from .changes import ChangeSet
+from .changes import ChangeTracker
 from .scene import Scene
+from .buffers import ArrowBuffer
+from .buffers import arrows_selfweight
+from .buffers import arrows_loads
+from .buffers import arrows_reactions
+from .buffers import arrows_residuals
 
 __all__ = [
-    'Scene'
+    'Scene',
+    'SceneObject',
+    'RhinoBackend',
+    'HeadlessBackend',
+    'RecordingBackend',
+    'ViewCoordinates',
+    'view_matrix',
+    'GuidMap',
+    'ChangeSet',
+    'ChangeTracker',
+    'ArrowBuffer',
+    'arrows_selfweight',
+    'arrows_loads',
+    'arrows_reactions',
+    'arrows_residuals',
 ]
@@ -0,0 +1,152 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from .objects import SceneObject
+
+
+__all__ = [
+    'RhinoBackend',
+    'HeadlessBackend',
+    'RecordingBackend',
+]
+
+
+def is_full(changes):
+    """Verify if a set of changes requires a full redraw of an object."""
+    return changes is None or changes.full or bool(changes.settings) or bool(changes.attributes)
+
+
+def draw(node, changes=None):
+    """Draw an object completely, or redraw only the changed elements if the changes allow it."""
+    if is_full(changes):
+        node.draw()
+    else:
+        node.redraw(changes)
+
+
+class RhinoBackend(object):
+    """Drawing backend that builds the RV2 Rhino scene objects and draws them in the Rhino document.
+
+    The Rhino modules are imported when they are used,
+    such that the Rhino scene objects and conduits can use the Rhino-free parts of the scene.
+    """
+
+    def build(self, item, **kwargs):
+        from compas_rv2.rhino import MeshObject
+        return MeshObject.build(item, **kwargs)
+
+    def draw(self, node, changes=None):
+        draw(node, changes)
+
+    def clear(self, node):
+        node.clear_conduits()
+        node.clear()
+
+    def begin(self):
+        import compas_rhino
+        compas_rhino.rs.EnableRedraw(False)
+
+    def end(self):
+        import compas_rhino
+        compas_rhino.rs.EnableRedraw(True)
+        compas_rhino.rs.Redraw()
+
+    def update_settings(self, settings):
+        from compas_rv2.rhino import SettingsForm
+        SettingsForm.from_settings(settings)
+
+    def clear_selection(self):
+        import compas_rhino
+        compas_rhino.rs.UnselectAllObjects()
+
+    def update_selection(self, guids):
+        import compas_rhino
+        compas_rhino.rs.SelectObjects(guids)
+
+    def registered_object_types(self):
+        from compas_rv2.rhino import MeshObject
+        return MeshObject.registered_object_types()
+
+
+class HeadlessBackend(object):
+    """Drawing backend that builds headless scene objects and does not draw anything.
+
+    Examples
+    --------
+    >>> scene = Scene(SETTINGS, backend=HeadlessBackend())
+    >>> scene.add(form, name='form')
+    >>> scene.update()
+
+    """
+
+    def build(self, item, **kwargs):
+        return SceneObject.build(item, **kwargs)
+
+    def draw(self, node, changes=None):
+        draw(node, changes)
+
+    def clear(self, node):
+        node.clear_conduits()
+        node.clear()
+
+    def begin(self):
+        pass
+
+    def end(self):
+        pass
+
+    def update_settings(self, settings):
+        pass
+
+    def clear_selection(self):
+        pass
+
+    def update_selection(self, guids):
+        pass
+
+    def registered_object_types(self):
+        return SceneObject.registered_object_types()
+
+
+class RecordingBackend(HeadlessBackend):
+    """Headless drawing backend that records the drawing operations of the scene.
+
+    Attributes
+    ----------
+    log : list
+        The recorded operations, as tuples of the name of the operation
+        and the name of the scene object, if any.
+
+    Examples
+    --------
+    >>> backend = RecordingBackend()
+    >>> scene = Scene(SETTINGS, backend=backend)
+    >>> scene.add(form, name='form')
+    >>> scene.update()
+    >>> backend.log
+    [('build', 'form'), ('begin', None), ('draw', 'form'), ('end', None)]
+
+    """
+
+    def __init__(self):
+        super(RecordingBackend, self).__init__()
+        self.log = []
+
+    def build(self, item, **kwargs):
+        self.log.append(('build', kwargs.get('name')))
+        return super(RecordingBackend, self).build(item, **kwargs)
+
+    def draw(self, node, changes=None):
+        self.log.append(('draw' if is_full(changes) else 'redraw', node.name))
+        super(RecordingBackend, self).draw(node, changes)
+
+    def clear(self, node):
+        self.log.append(('clear', node.name))
+        super(RecordingBackend, self).clear(node)
+
+    def begin(self):
+        self.log.append(('begin', None))
+
+    def end(self):
+        self.log.append(('end', None))
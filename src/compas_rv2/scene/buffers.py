@@ -0,0 +1,216 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+
+__all__ = [
+    'ArrowBuffer',
+    'arrows_selfweight',
+    'arrows_loads',
+    'arrows_reactions',
+    'arrows_residuals',
+]
+
+
+def arrows_selfweight(mesh):
+    """Collect the self-weight vectors of the vertices of a thrust diagram.
+
+    Parameters
+    ----------
+    mesh : :class:`compas_rv2.datastructures.ThrustDiagram`
+        The thrust diagram.
+
+    Returns
+    -------
+    tuple
+        The vertices and their vectors.
+
+    """
+    selfweight = mesh.vertices_selfweight()
+    vertices = list(mesh.vertices())
+    return vertices, [[0.0, 0.0, selfweight[vertex]] for vertex in vertices]
+
+
+def arrows_loads(mesh):
+    """Collect the vectors of the external loads (``pz``) of the vertices of a diagram.
+
+    Parameters
+    ----------
+    mesh : :class:`compas_tna.diagrams.FormDiagram`
+        The diagram.
+
+    Returns
+    -------
+    tuple
+        The vertices and their vectors.
+
+    """
+    vertices = []
+    vectors = []
+    for vertex, attr in mesh.vertices(True):
+        vertices.append(vertex)
+        vectors.append([0.0, 0.0, attr['pz']])
+    return vertices, vectors
+
+
+def arrows_reactions(mesh):
+    """Collect the reaction forces of the anchored vertices of a diagram.
+
+    Parameters
+    ----------
+    mesh : :class:`compas_tna.diagrams.FormDiagram`
+        The diagram.
+
+    Returns
+    -------
+    tuple
+        The vertices and their vectors.
+
+    """
+    vertices = list(mesh.vertices_where({'is_anchor': True}))
+    return vertices, mesh.vertices_attributes(['_rx', '_ry', '_rz'], keys=vertices)
+
+
+def arrows_residuals(mesh):
+    """Collect the residual forces of the free vertices of a diagram.
+
+    Parameters
+    ----------
+    mesh : :class:`compas_tna.diagrams.FormDiagram`
+        The diagram.
+
+    Returns
+    -------
+    tuple
+        The vertices and their vectors.
+
+    """
+    vertices = list(mesh.vertices_where({'is_anchor': False}))
+    return vertices, mesh.vertices_attributes(['_rx', '_ry', '_rz'], keys=vertices)
+
+
+class ArrowBuffer(object):
+    """Precomputed arrows of a vector quantity at the vertices of a diagram, for display.
+
+    Every arrow starts at the vertex plus the scaled vector and ends at the vertex.
+    Arrows shorter than the tolerance are culled.
+    The buffer is rebuilt only when it is invalidated, or when the scale or tolerance change,
+    and every rebuild increases its version,
+    such that a display conduit only has to convert the arrows to display geometry after a rebuild.
+
+    Parameters
+    ----------
+    arrows : callable
+        A function that collects the vertices and their vectors from a diagram,
+        for example :func:`arrows_selfweight`.
+    scale : float, optional
+        The scale factor of the vectors.
+    tol : float, optional
+        Minimum length of a scaled vector.
+
+    Attributes
+    ----------
+    vertices : list
+        The vertices of the arrows that are not culled.
+    starts : list
+        The start points of the arrows.
+    ends : list
+        The end points of the arrows.
+    version : int
+        The number of times the buffer was built.
+
+    Examples
+    --------
+    >>> buffer = ArrowBuffer(arrows_reactions, scale=0.1)
+    >>> buffer.update(thrust)
+    1
+    >>> buffer.update(thrust)
+    1
+    >>> buffer.invalidate()
+    >>> buffer.update(thrust)
+    2
+
+    """
+
+    def __init__(self, arrows, scale=1.0, tol=1e-3):
+        self.arrows = arrows
+        self._scale = scale
+        self._tol = tol
+        self.vertices = []
+        self.starts = []
+        self.ends = []
+        self.version = 0
+        self.stale = True
+
+    @property
+    def scale(self):
+        return self._scale
+
+    @scale.setter
+    def scale(self, value):
+        if value != self._scale:
+            self._scale = value
+            self.stale = True
+
+    @property
+    def tol(self):
+        return self._tol
+
+    @tol.setter
+    def tol(self, value):
+        if value != self._tol:
+            self._tol = value
+            self.stale = True
+
+    def invalidate(self):
+        """Mark the buffer for a rebuild, for example after a change of the diagram."""
+        self.stale = True
+
+    def update(self, mesh):
+        """Rebuild the buffer if it is invalid.
+
+        Parameters
+        ----------
+        mesh : :class:`compas.datastructures.Mesh`
+            The diagram.
+
+        Returns
+        -------
+        int
+            The version of the buffer.
+
+        """
+        if self.stale:
+            self.build(mesh)
+        return self.version
+
+    def build(self, mesh):
+        """Rebuild the buffer.
+
+        Parameters
+        ----------
+        mesh : :class:`compas.datastructures.Mesh`
+            The diagram.
+
+        Returns
+        -------
+        None
+
+        """
+        scale = self._scale
+        tol2 = self._tol ** 2
+        vertices, vectors = self.arrows(mesh)
+        self.vertices = []
+        self.starts = []
+        self.ends = []
+        for vertex, (x, y, z) in zip(vertices, vectors):
+            x, y, z = scale * x, scale * y, scale * z
+            if x * x + y * y + z * z < tol2:
+                continue
+            attr = mesh.vertex_attributes(vertex)
+            ex, ey, ez = attr['x'], attr['y'], attr['z']
+            self.vertices.append(vertex)
+            self.starts.append([ex + x, ey + y, ez + z])
+            self.ends.append([ex, ey, ez])
+        self.version += 1
+        self.stale = False
@@ -0,0 +1,208 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from ast import literal_eval
+
+from compas_rv2.history.history import mesh_sections
+from compas_rv2.history.history import mesh_snapshot
+from compas_rv2.history.history import has_topology_changed
+from compas_rv2.history.history import diff_sections
+from compas_rv2.history.history import diff_attributes
+from compas_rv2.history.history import apply_sections
+from compas_rv2.history.history import copy_settings
+
+
+__all__ = [
+    'ChangeSet',
+    'ChangeTracker',
+]
+
+
+GEOMETRY = set(['x', 'y', 'z'])
+
+
+class ChangeSet(object):
+    """The changes of a scene object since it was last drawn.
+
+    Parameters
+    ----------
+    full : bool, optional
+        The object has to be redrawn completely,
+        for example because it was not drawn before, or because the topology of its data structure changed.
+    settings : list, optional
+        The names of the changed settings of the object or the scene,
+        and ``"view"`` if the location, scale, rotation or visibility of the object changed.
+    attributes : list, optional
+        The names of the changed attributes of the data structure itself.
+    vertices : dict, optional
+        The names of the changed attributes per vertex.
+    edges : dict, optional
+        The names of the changed attributes per edge.
+    faces : dict, optional
+        The names of the changed attributes per face.
+
+    Examples
+    --------
+    >>> changes = tracker.collect()
+    >>> if changes.full or changes.settings:
+    ...     node.draw()
+    ... elif changes:
+    ...     node.redraw(changes)
+
+    """
+
+    def __init__(self, full=False, settings=None, attributes=None, vertices=None, edges=None, faces=None):
+        self.full = full
+        self.settings = set(settings or [])
+        self.attributes = set(attributes or [])
+        self.vertices = vertices or {}
+        self.edges = edges or {}
+        self.faces = faces or {}
+
+    def __bool__(self):
+        return bool(self.full or self.settings or self.attributes or self.vertices or self.edges or self.faces)
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        return 'ChangeSet(full={}, settings={}, attributes={}, vertices={}, edges={}, faces={})'.format(
+            self.full, sorted(self.settings), sorted(self.attributes), len(self.vertices), len(self.edges), len(self.faces))
+
+    @property
+    def geometry(self):
+        """bool : The coordinates of at least one vertex changed."""
+        return any(names & GEOMETRY for names in self.vertices.values())
+
+    def names(self, section):
+        """The names of the changed attributes of all elements of a section.
+
+        Parameters
+        ----------
+        section : {'vertices', 'edges', 'faces'}
+            The section.
+
+        Returns
+        -------
+        set
+
+        """
+        names = set()
+        for values in getattr(self, section).values():
+            names.update(values)
+        return names
+
+    def affected_edges(self, mesh):
+        """The edges that have to be redrawn: the changed edges, and the edges of vertices that moved.
+
+        Parameters
+        ----------
+        mesh : :class:`compas.datastructures.Mesh`
+            The data structure of the object.
+
+        Returns
+        -------
+        set
+            The edges, in arbitrary orientation.
+
+        """
+        edges = set(self.edges)
+        for vertex, names in self.vertices.items():
+            if names & GEOMETRY:
+                edges.update((vertex, nbr) for nbr in mesh.vertex_neighbors(vertex))
+        return edges
+
+
+class ChangeTracker(object):
+    """Track the changes of a scene object between updates of the scene.
+
+    The tracker compares the settings and the view of the object, and the attributes of the data structure itself,
+    with a copy taken at the previous update.
+    The modified vertices, edges and faces are read from the record of the data structure
+    (see :meth:`compas_rv2.datastructures.MeshMixin.pop_changes`).
+    Data structures without such a record are compared with a snapshot of all their attributes instead,
+    using the same differences as the undo :class:`compas_rv2.history.History`.
+
+    Parameters
+    ----------
+    node : object
+        The scene object.
+
+    """
+
+    def __init__(self, node):
+        self.node = node
+        self.reset()
+
+    def reset(self):
+        """Forget the previous update, such that the next change set requires a full redraw."""
+        self._mesh = None
+        self._snapshot = None
+        self._attributes = None
+        self._settings = None
+        self._view = None
+
+    def view(self):
+        node = self.node
+        return node.visible, node.anchor, list(node.location), node.scale, list(node.rotation)
+
+    def object_settings(self):
+        node = self.node
+        settings = {'object': copy_settings(node.settings)}
+        if node.scene is not None and node.scene.settings:
+            # the scene objects only use the display settings of the scene
+            settings['scene'] = copy_settings(node.scene.settings.get('RV2', {}))
+        return settings
+
+    def collect(self):
+        """Collect the changes since the previous call.
+
+        Returns
+        -------
+        :class:`ChangeSet`
+
+        """
+        mesh = self.node.datastructure
+        settings = self.object_settings()
+        view = self.view()
+        tracked = hasattr(mesh, 'pop_changes')
+        changes = mesh.pop_changes() if tracked else None
+        if tracked:
+            full = changes is None or changes['full']
+        else:
+            full = self._snapshot is None or has_topology_changed(self._snapshot, mesh)
+        if self._mesh is not mesh or self._attributes is None or full:
+            self._mesh = mesh
+            self._snapshot = None if tracked else mesh_snapshot(mesh)
+            self._attributes = dict(mesh.attributes)
+            self._settings = settings
+            self._view = view
+            return ChangeSet(full=True)
+
+        changed = []
+        if view != self._view:
+            changed.append('view')
+        for scope in ('object', 'scene'):
+            old = self._settings.get(scope, {})
+            new = settings.get(scope, {})
+            changed += [name for name in set(old) | set(new) if old.get(name) != new.get(name)]
+        self._settings = settings
+        self._view = view
+
+        attributes = []
+        if self._attributes != mesh.attributes:
+            attributes = list(diff_attributes(self._attributes, mesh.attributes)[1])
+            self._attributes = dict(mesh.attributes)
+        if tracked:
+            return ChangeSet(settings=changed, attributes=attributes,
+                             vertices=changes['vertices'], edges=changes['edges'], faces=changes['faces'])
+
+        sections = diff_sections(self._snapshot, mesh_sections(mesh))
+        apply_sections(self._snapshot, sections, 1)
+        vertices = {key: set(after) for key, _, after in sections.get('vertex', [])}
+        faces = {key: set(after) for key, _, after in sections.get('facedata', [])}
+        edges = {}
+        for key, before, after in sections.get('edgedata', []):
+            edge = literal_eval(key) if isinstance(key, str) else tuple(key)
+            edges[edge] = set(after or before)
+        return ChangeSet(settings=changed, attributes=attributes, vertices=vertices, edges=edges, faces=faces)
@@ -0,0 +1,218 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from .view import ViewCoordinates
+
+
+__all__ = ['SceneObject']
+
+
+class SceneObject(object):
+    """Scene object for mesh-based data structures in RV2, without geometry in a CAD environment.
+
+    The headless scene object has the same interface as the Rhino scene objects
+    for everything that does not involve drawing or user interaction,
+    such that the command logic can be run without Rhino.
+
+    Parameters
+    ----------
+    item : :class:`compas.datastructures.Mesh`
+        The data structure of the object.
+    scene : :class:`compas_rv2.scene.Scene`, optional
+        The scene to which the object belongs.
+    name : str, optional
+        The name of the object.
+    layer : str, optional
+        The layer of the object.
+    visible : bool, optional
+        Visibility of the object.
+    settings : dict, optional
+        Settings that override the default settings of the object type.
+
+    Attributes
+    ----------
+    count_draw : int
+        The number of times the object was drawn.
+    count_redraw : int
+        The number of times only the changed elements of the object were redrawn.
+    changes : :class:`compas_rv2.scene.ChangeSet`
+        The changes of the most recent partial redraw.
+
+    """
+
+    SETTINGS = {}
+
+    OBJECT_TYPES = {}
+
+    def __init__(self, item, scene=None, name=None, layer=None, visible=True, settings=None):
+        self.mesh = item
+        self.scene = scene
+        self.name = name
+        self.visible = visible
+        self.settings = dict(self.SETTINGS)
+        if layer:
+            self.settings['layer'] = layer
+        if settings:
+            self.settings.update(settings)
+        self.anchor = None
+        self.location = [0.0, 0.0, 0.0]
+        self.scale = 1.0
+        self.rotation = [0.0, 0.0, 0.0]
+        self.guids = []
+        self.count_draw = 0
+        self.count_redraw = 0
+        self.changes = None
+
+    @staticmethod
+    def register(name, object_type):
+        """Register a scene object type for a type of data structure.
+
+        Parameters
+        ----------
+        name : str
+            The name of the class of data structure.
+            Subclasses of a registered class are matched as well.
+        object_type : type
+            The scene object type.
+
+        Notes
+        -----
+        Data structure types are registered by name,
+        such that the headless scene does not have to import the data structures
+        (and, for example, the diagrams of :mod:`compas_tna` can be used as well).
+        """
+        SceneObject.OBJECT_TYPES[name] = object_type
+
+    @staticmethod
+    def registered_object_types():
+        return SceneObject.OBJECT_TYPES
+
+    @staticmethod
+    def build(item, **kwargs):
+        """Build a scene object of the type registered for the type of the item."""
+        for cls in type(item).__mro__:
+            if cls.__name__ in SceneObject.OBJECT_TYPES:
+                return SceneObject.OBJECT_TYPES[cls.__name__](item, **kwargs)
+        return SceneObject(item, **kwargs)
+
+    @property
+    def datastructure(self):
+        return self.mesh
+
+    @datastructure.setter
+    def datastructure(self, datastructure):
+        self.mesh = datastructure
+
+    @property
+    def view_coordinates(self):
+        """:class:`compas_rv2.scene.ViewCoordinates` : The cached view coordinates of the object."""
+        if getattr(self, '_view_coordinates', None) is None:
+            self._view_coordinates = ViewCoordinates()
+        return self._view_coordinates
+
+    @property
+    def vertex_xyz(self):
+        """dict : The view coordinates of the mesh object."""
+        return self.view_coordinates.get(self.mesh, self.location, self.scale, self.rotation, anchor=self.anchor)
+
+    def draw(self):
+        """Draw the object.
+
+        Nothing is drawn, only the number of draws is counted.
+        """
+        self.count_draw += 1
+
+    def redraw(self, changes):
+        """Redraw the changed elements of the object.
+
+        Nothing is drawn, only the number of redraws and the changes are recorded.
+
+        Parameters
+        ----------
+        changes : :class:`compas_rv2.scene.ChangeSet`
+            The changes of the vertices, edges and faces since the previous draw.
+
+        """
+        self.count_redraw += 1
+        self.changes = changes
+
+    def clear(self):
+        """Clear the geometry of the object."""
+        self.guids = []
+
+    def clear_conduits(self):
+        pass
+
+
+class PatternSceneObject(SceneObject):
+    """Headless scene object for patterns."""
+
+    SETTINGS = {
+        'layer': "RV2::Pattern",
+        'show.vertices': True,
+        'show.edges': True,
+        'show.faces': False,
+    }
+
+
+class SubdSceneObject(SceneObject):
+    """Headless scene object for subdivision meshes."""
+
+    SETTINGS = {
+        'layer': "RV2::Subd",
+        'nu': 4,
+        'nv': 4,
+        'n': 2,
+    }
+
+
+class FormSceneObject(SceneObject):
+    """Headless scene object for form diagrams."""
+
+    SETTINGS = {
+        'layer': "RV2::FormDiagram",
+        'show.vertices': True,
+        'show.edges': True,
+        'input_guids': [],
+    }
+
+    @property
+    def vertex_xyz(self):
+        """dict : The view coordinates of the mesh object."""
+        return self.view_coordinates.get(self.mesh, self.location, self.scale, self.rotation, anchor=self.anchor, flat=True)
+
+
+class ForceSceneObject(SceneObject):
+    """Headless scene object for force diagrams."""
+
+    SETTINGS = {
+        'layer': "RV2::ForceDiagram",
+        'show.vertices': True,
+        'show.edges': True,
+    }
+
+
+class ThrustSceneObject(SceneObject):
+    """Headless scene object for thrust diagrams."""
+
+    SETTINGS = {
+        '_is.valid': False,
+        'layer': "RV2::ThrustDiagram",
+        'show.vertices': True,
+        'show.edges': False,
+        'show.faces': True,
+        'show.stresses': False,
+        'show.selfweight': False,
+        'show.loads': False,
+        'show.residuals': False,
+        'show.reactions': True,
+        'show.pipes': False,
+    }
+
+
+SceneObject.register('SubdMesh', SubdSceneObject)
+SceneObject.register('Pattern', PatternSceneObject)
+SceneObject.register('FormDiagram', FormSceneObject)
+SceneObject.register('ForceDiagram', ForceSceneObject)
+SceneObject.register('ThrustDiagram', ThrustSceneObject)
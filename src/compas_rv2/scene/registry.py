@@ -0,0 +1,117 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+
+__all__ = ['GuidMap']
+
+
+class GuidMap(dict):
+    """A map of the guids of the CAD objects of a scene object to the elements they represent,
+    with the inverse map from elements to guids.
+
+    The map behaves as a dict from guids to elements (vertices, edges or faces),
+    and keeps the inverse map up to date with every change.
+
+    Parameters
+    ----------
+    values : iterable, optional
+        Pairs of guids and elements.
+
+    Examples
+    --------
+    >>> guid_vertex = GuidMap(zip(guids, vertices))
+    >>> guid_vertex.guids([0, 1, 2])
+    ['...', '...', '...']
+
+    """
+
+    def __init__(self, values=None):
+        super(GuidMap, self).__init__()
+        self.inverse = {}
+        if values is not None:
+            self.update(values)
+
+    def __setitem__(self, guid, element):
+        if guid in self:
+            self._unlink(guid)
+        super(GuidMap, self).__setitem__(guid, element)
+        self.inverse[element] = guid
+
+    def __delitem__(self, guid):
+        self._unlink(guid)
+        super(GuidMap, self).__delitem__(guid)
+
+    def _unlink(self, guid):
+        element = self[guid]
+        if self.inverse.get(element) == guid:
+            del self.inverse[element]
+
+    def update(self, *args, **kwargs):
+        for guid, element in dict(*args, **kwargs).items():
+            self[guid] = element
+
+    def pop(self, guid, *default):
+        if guid in self:
+            self._unlink(guid)
+        return super(GuidMap, self).pop(guid, *default)
+
+    def popitem(self):
+        guid, element = super(GuidMap, self).popitem()
+        if self.inverse.get(element) == guid:
+            del self.inverse[element]
+        return guid, element
+
+    def setdefault(self, guid, element=None):
+        if guid not in self:
+            self[guid] = element
+        return self[guid]
+
+    def clear(self):
+        super(GuidMap, self).clear()
+        self.inverse.clear()
+
+    def guid(self, element):
+        """The guid of an element, or None."""
+        return self.inverse.get(element)
+
+    def guids(self, elements):
+        """The guids of the elements that are in the map.
+
+        Parameters
+        ----------
+        elements : iterable
+            The elements.
+
+        Returns
+        -------
+        list
+
+        """
+        inverse = self.inverse
+        return [inverse[element] for element in elements if element in inverse]
+
+    def edge_guids(self, edges):
+        """The guids of edges that are in the map, in any orientation.
+
+        Parameters
+        ----------
+        edges : iterable
+            The edges, as pairs of vertices.
+
+        Returns
+        -------
+        list
+
+        """
+        inverse = self.inverse
+        guids = []
+        seen = set()
+        for u, v in edges:
+            guid = inverse.get((u, v))
+            if guid is None:
+                guid = inverse.get((v, u))
+            if guid is not None and guid not in seen:
+                seen.add(guid)
+                guids.append(guid)
+        return guids
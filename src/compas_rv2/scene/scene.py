@@ -4,24 +4,53 @@ from __future__ import print_function
 
 from uuid import uuid4
 
-import compas_rhino
+import compas
 
-from compas_rv2.rhino import SettingsForm
-from compas_rv2.rhino import MeshObject
+from .backends import RhinoBackend
+from .backends import HeadlessBackend
+from .changes import ChangeSet
+from .changes import ChangeTracker
 
 
 class Scene(object):
-    """"""
+    """The RV2 scene.
 
-    def __init__(self, settings={}):
+    Parameters
+    ----------
+    settings : dict, optional
+        The settings of the scene.
+    backend : object, optional
+        The drawing backend.
+        Default is a :class:`RhinoBackend` in Rhino, and a :class:`HeadlessBackend` otherwise.
+
+    Notes
+    -----
+    The scene keeps track of the changes of its objects between updates.
+    An update only redraws the objects that changed,
+    and objects that support it (:meth:`redraw`) only redraw their changed elements.
+
+    Examples
+    --------
+    >>> scene = Scene(SETTINGS, backend=HeadlessBackend())
+    >>> scene.load_session(session)
+    >>> form = scene.get('form')[0]
+
+    """
+
+    def __init__(self, settings={}, backend=None):
+        if backend is None:
+            backend = RhinoBackend() if compas.RHINO else HeadlessBackend()
         self.nodes = {}
+        self.trackers = {}
         self.settings = settings
+        self.backend = backend
 
     def add(self, item, **kwargs):
         kwargs['scene'] = self
-        node = MeshObject.build(item, **kwargs)
+        node = self.backend.build(item, **kwargs)
         guid = uuid4()
         self.nodes[guid] = node
+        self.trackers[guid] = ChangeTracker(node)
         return node
 
     def get(self, name):
@@ -34,35 +63,173 @@ class Scene(object):
         else:
             return selected
 
-    def update(self):
-        compas_rhino.rs.EnableRedraw(False)
+    def update(self, full=False):
+        """Redraw the objects of the scene that changed since the previous update.
+
+        Parameters
+        ----------
+        full : bool, optional
+            Redraw all objects completely.
+
+        Returns
+        -------
+        dict
+            The changes of the redrawn objects, per object.
+
+        """
+        changes = {}
         for guid in self.nodes:
-            node = self.nodes[guid]
-            node.draw()
-        compas_rhino.rs.EnableRedraw(True)
-        compas_rhino.rs.Redraw()
+            if full:
+                self.trackers[guid].reset()
+            changeset = self.trackers[guid].collect()
+            if changeset:
+                changes[guid] = changeset
+        # diagrams that refer to a changed diagram (primal or dual) are redrawn as well,
+        # if the changes can affect their colors
+        show_forces = bool(self.settings and self.settings.get('RV2', {}).get('show.forces'))
+        changed = set()
+        for guid, changeset in changes.items():
+            if changeset.full or changeset.edges or (show_forces and changeset.geometry):
+                changed.add(id(self.nodes[guid].datastructure))
+        for guid in self.nodes:
+            if guid in changes:
+                continue
+            mesh = self.nodes[guid].datastructure
+            for name in ('primal', 'dual'):
+                other = getattr(mesh, name, None)
+                if other is not None and id(other) in changed:
+                    changes[guid] = ChangeSet(full=True)
+                    break
+        if changes:
+            self.backend.begin()
+            for guid in self.nodes:
+                if guid in changes:
+                    self.backend.draw(self.nodes[guid], changes[guid])
+            self.backend.end()
+        return changes
+
+    def invalidate(self, node=None):
+        """Mark an object, or all objects, for a full redraw at the next update.
+
+        Parameters
+        ----------
+        node : object, optional
+            The scene object.
+            Default is all objects.
+
+        """
+        for guid in self.nodes:
+            if node is None or self.nodes[guid] is node:
+                self.trackers[guid].reset()
 
     def clear(self):
-        compas_rhino.rs.EnableRedraw(False)
+        self.backend.begin()
         for guid in list(self.nodes):
             node = self.nodes[guid]
-            node.clear_conduits()
-            node.clear()
+            self.backend.clear(node)
             del self.nodes[guid]
         self.nodes = {}
-        compas_rhino.rs.EnableRedraw(True)
-        compas_rhino.rs.Redraw()
+        self.trackers = {}
+        self.backend.end()
 
     def update_settings(self, settings=None):
         # should this not produce some kind of result we can react to?
-        SettingsForm.from_settings(self.settings)
+        self.backend.update_settings(self.settings)
 
     def clear_selection(self):
-        compas_rhino.rs.UnselectAllObjects()
+        self.backend.clear_selection()
 
     def update_selection(self, guids):
-        compas_rhino.rs.SelectObjects(guids)
+        self.backend.update_selection(guids)
 
     @property
     def registered_object_types(self):
-        return MeshObject.registered_object_types()
+        return self.backend.registered_object_types()
+
+    # --------------------------------------------------------------------------
+    # sessions
+    # --------------------------------------------------------------------------
+
+    def save_session(self):
+        """Save the diagrams and the settings of the scene as a session.
+
+        Returns
+        -------
+        dict
+            The session data.
+
+        """
+        session = {
+            "data": {"pattern": None, "form": None, "force": None},
+            "settings": self.settings,
+        }
+        for name in ('pattern', 'form', 'force'):
+            node = self.get(name)[0]
+            if node:
+                session['data'][name] = node.datastructure.to_data()
+        return session
+
+    def save_session_thrust(self):
+        """Save the loaded faces of the thrust diagram and the settings of the scene as a session.
+
+        Returns
+        -------
+        dict
+            The session data.
+
+        """
+        session = {
+            "data": {
+                "thrust": None
+            },
+            "settings": self.settings,
+        }
+        thrust = self.get('thrust')[0].datastructure
+
+        faces = list(thrust.faces_where({'_is_loaded': False}))
+
+        for face in faces:
+            thrust.delete_face(face)
+
+        if thrust:
+            session['data']['thrust'] = thrust.to_data()
+
+        return session
+
+    def load_session(self, session):
+        """Replace the contents of the scene by the diagrams and settings of a session.
+
+        Parameters
+        ----------
+        session : dict
+            The session data.
+
+        """
+        from compas_rv2.datastructures import Pattern
+        from compas_rv2.datastructures import FormDiagram
+        from compas_rv2.datastructures import ForceDiagram
+        from compas_rv2.datastructures import ThrustDiagram
+
+        self.clear()
+        if 'settings' in session:
+            self.settings = session['settings']
+        if 'data' in session:
+            data = session['data']
+            if 'pattern' in data and data['pattern']:
+                pattern = Pattern.from_data(data['pattern'])
+                self.add(pattern, name="pattern")
+            else:
+                if 'form' in data and data['form']:
+                    form = FormDiagram.from_data(data['form'])
+                    thrust = form.copy(cls=ThrustDiagram)  # this is not a good idea
+                    self.add(form, name="form")
+                    self.add(thrust, name="thrust")
+
+                if 'force' in data and data['force']:
+                    force = ForceDiagram.from_data(data['force'])
+                    force.primal = form
+                    form.dual = force
+                    force.update_edge_index()
+                    force.update_angle_deviations()
+                    self.add(force, name="force")
+        self.update()
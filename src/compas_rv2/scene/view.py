@@ -0,0 +1,135 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas.geometry import Point
+from compas.geometry import Scale
+from compas.geometry import Translation
+from compas.geometry import Rotation
+
+
+__all__ = [
+    'view_matrix',
+    'ViewCoordinates',
+]
+
+
+def view_matrix(location, scale, rotation, anchor=None):
+    """Construct the transformation from model coordinates to view coordinates.
+
+    Parameters
+    ----------
+    location : list
+        The location of the object in the view.
+    scale : float
+        The scale of the object.
+    rotation : list
+        The rotation of the object, as static XYZ Euler angles.
+    anchor : list, optional
+        The model coordinates of the point of the object that is placed at the location.
+        Default is the origin.
+
+    Returns
+    -------
+    list
+        The 4x4 transformation matrix.
+
+    """
+    S = Scale.from_factors([scale] * 3)
+    R = Rotation.from_euler_angles(rotation)
+    T = Translation.from_vector(location)
+    X = T * R * S
+    if anchor is not None:
+        X = X * Translation.from_vector(Point(0, 0, 0) - Point(*anchor))
+    return X.matrix
+
+
+class ViewCoordinates(object):
+    """Cached view coordinates of the vertices of a mesh.
+
+    The transformation is applied to the coordinates of the vertices directly,
+    without transforming a copy of the mesh.
+    The result is cached, and only recomputed if the location, scale, rotation or anchor of the object,
+    or the topology or geometry of the mesh changed.
+    For the RV2 data structures, the changes of the mesh are detected with the versions
+    of :class:`compas_rv2.datastructures.MeshMixin`, such that a cache hit does not visit the vertices.
+    For other meshes, the coordinates of the vertices are compared with those of the cached result.
+
+    Examples
+    --------
+    >>> view = ViewCoordinates()
+    >>> vertex_xyz = view.get(mesh, [10.0, 0.0, 0.0], 1.0, [0.0, 0.0, 0.0])
+
+    """
+
+    def __init__(self):
+        self._key = None
+        self._mesh = None
+        self._vertices = None
+        self._xyz = None
+        self._vertex_xyz = None
+
+    def invalidate(self):
+        """Clear the cache."""
+        self._key = None
+        self._mesh = None
+        self._vertices = None
+        self._xyz = None
+        self._vertex_xyz = None
+
+    def get(self, mesh, location, scale, rotation, anchor=None, flat=False):
+        """Get the view coordinates of the vertices of a mesh.
+
+        Parameters
+        ----------
+        mesh : :class:`compas.datastructures.Mesh`
+            The mesh.
+        location : list
+            The location of the object in the view.
+        scale : float
+            The scale of the object.
+        rotation : list
+            The rotation of the object, as static XYZ Euler angles.
+        anchor : int, optional
+            The vertex of the mesh that is placed at the location.
+        flat : bool, optional
+            Set the Z coordinate of the view coordinates to zero.
+
+        Returns
+        -------
+        dict
+            The view coordinates per vertex.
+            The dict is shared between calls and should not be modified.
+
+        """
+        key = anchor, list(location), scale, list(rotation), flat
+        versions = getattr(mesh, '_versions', None)
+        if versions is not None:
+            versions = versions()
+            # the mesh itself is kept with the cache, such that its id cannot be reused
+            key = (id(mesh), versions['topology'], versions['geometry']) + key
+            if key == self._key and mesh is self._mesh:
+                return self._vertex_xyz
+        vertices = []
+        xyz = []
+        for vertex, attr in mesh.vertices(True):
+            vertices.append(vertex)
+            xyz.append((attr['x'], attr['y'], attr['z']))
+        if versions is None and key == self._key and xyz == self._xyz and vertices == self._vertices:
+            return self._vertex_xyz
+        point = None
+        if anchor is not None:
+            point = mesh.vertex_attributes(anchor, 'xyz')
+        (a, b, c, d), (e, f, g, h), (i, j, k, l), _ = view_matrix(location, scale, rotation, point)  # noqa: E741
+        vertex_xyz = {}
+        for vertex, (x, y, z) in zip(vertices, xyz):
+            if flat:
+                vertex_xyz[vertex] = [a * x + b * y + c * z + d, e * x + f * y + g * z + h, 0.0]
+            else:
+                vertex_xyz[vertex] = [a * x + b * y + c * z + d, e * x + f * y + g * z + h, i * x + j * y + k * z + l]
+        self._key = key
+        self._mesh = mesh
+        self._vertices = vertices
+        self._xyz = xyz
+        self._vertex_xyz = vertex_xyz
+        return vertex_xyz
@@ -4,18 +4,16 @@ from __future__ import division
 
 from functools import partial
 
-from itertools import groupby
-
 import compas_rhino
 
 from compas.geometry import centroid_points
-from compas.geometry import distance_point_point_xy
-from compas.geometry import intersection_line_line_xy
-from compas.geometry import midpoint_point_point_xy
 from compas.utilities import pairwise
 
+from compas_rv2.equilibrium import opening_sag
+from compas_rv2.equilibrium import fit_opening_sags
+
 from compas_rv2.rhino import get_scene
-from compas_rv2.rhino import get_proxy
+from compas_rv2.rhino import get_executor
 from compas_rv2.rhino import rv2_undo
 from compas_rv2.rhino import rv2_error
 
@@ -24,60 +22,23 @@ __commandname__ = "RV2boundary_boundaries"
 
 
 def split_boundary(pattern):
-    boundaries = pattern.vertices_on_boundaries()
-    exterior = boundaries[0]
-    opening = []
-    openings = [opening]
-    for vertex in exterior:
-        opening.append(vertex)
-        if pattern.vertex_attribute(vertex, 'is_anchor'):
-            opening = [vertex]
-            openings.append(opening)
-    openings[-1] += openings[0]
-    del openings[0]
-    openings[:] = [opening for opening in openings if len(opening) > 2]
-    return [[v[0] for v in groupby(opening)] for opening in openings]
-
-
-def relax_pattern(pattern, relax):
-    key_index = pattern.key_index()
-    xyz = pattern.vertices_attributes('xyz')
-    loads = [[0.0, 0.0, 0.0] for _ in xyz]
-    anchors = [key_index[key] for key in pattern.vertices_where({'is_anchor': True})]
-    fixed = [key_index[key] for key in pattern.vertices_where({'is_fixed': True})]
-    fixed = list(set(anchors + fixed))
-    edges = [(key_index[u], key_index[v]) for u, v in pattern.edges()]
-    q = list(pattern.edges_attribute('q'))
-    xyz, q, f, l, r = relax(xyz, edges, fixed, q, loads)
-    for key in pattern.vertices():
-        index = key_index[key]
-        pattern.vertex_attributes(key, 'xyz', xyz[index])
-
-
-def compute_sag(pattern, opening):
-    u, v = opening[0]
-    if pattern.vertex_attribute(u, 'is_fixed'):
-        a = pattern.vertex_attributes(u, 'xyz')
-        aa = pattern.vertex_attributes(v, 'xyz')
-    else:
-        a = pattern.vertex_attributes(v, 'xyz')
-        aa = pattern.vertex_attributes(u, 'xyz')
-    u, v = opening[-1]
-    if pattern.vertex_attribute(u, 'is_fixed'):
-        b = pattern.vertex_attributes(u, 'xyz')
-        bb = pattern.vertex_attributes(v, 'xyz')
-    else:
-        b = pattern.vertex_attributes(v, 'xyz')
-        bb = pattern.vertex_attributes(u, 'xyz')
-    span = distance_point_point_xy(a, b)
-    apex = intersection_line_line_xy((a, aa), (b, bb))
-    if apex is None:
-        rise = 0.0
+    anchors = pattern.vertices_where({'is_anchor': True})
+    return pattern.boundary_analysis().split(anchors)
+
+
+def relax_pattern(pattern, executor):
+    anchors = list(pattern.vertices_where({'is_anchor': True}))
+    fixed = list(pattern.vertices_where({'is_fixed': True}))
+    executor.relax(pattern, list(set(anchors + fixed)))
+
+
+def fit_sags(pattern, openings, targets, Q, executor):
+    relax = partial(relax_pattern, pattern, executor)
+    Q[:], sags, count, converged = fit_opening_sags(pattern, openings, targets, Q, relax, tol=TOL, kmax=KMAX)
+    if converged:
+        print("converged after %s relaxations" % count)
     else:
-        midspan = midpoint_point_point_xy(a, b)
-        rise = 0.5 * distance_point_point_xy(midspan, apex)
-    sag = rise / span
-    return sag
+        print("did not converge after %s relaxations" % count)
 
 
 def _draw_labels(pattern, openings):
@@ -94,7 +55,8 @@ def _draw_labels(pattern, openings):
 # ==============================================================================
 
 
-TOL2 = 0.001 ** 2
+TOL = 0.001
+KMAX = 10
 
 
 @rv2_error()
@@ -104,12 +66,10 @@ def RunCommand(is_interactive):
     if not scene:
         return
 
-    proxy = get_proxy()
-    if not proxy:
+    executor = get_executor()
+    if not executor:
         return
 
-    relax = proxy.function("compas.numerical.fd_numpy")
-
     pattern = scene.get("pattern")[0]
     if not pattern:
         return
@@ -129,7 +89,7 @@ def RunCommand(is_interactive):
     # compute current opening sags
     targets = []
     for opening in openings:
-        sag = compute_sag(pattern.datastructure, opening)
+        sag = opening_sag(pattern.datastructure, opening)
         if sag < 0.05:
             sag = 0.05
         targets.append(sag)
@@ -140,32 +100,9 @@ def RunCommand(is_interactive):
         q = pattern.datastructure.edges_attribute('q', keys=opening)
         q = sum(q) / len(q)
         Q.append(q)
-        pattern.datastructure.edges_attribute('q', q, keys=opening)
-
-    # relax the pattern
-    relax_pattern(pattern.datastructure, relax)
 
     # update Qs to match target sag
-    count = 0
-    while True and count < 10:
-        count += 1
-        sags = [compute_sag(pattern.datastructure, opening) for opening in openings]
-        if all((sag - target) ** 2 < TOL2 for sag, target in zip(sags, targets)):
-            break
-        for i in range(len(openings)):
-            sag = sags[i]
-            target = targets[i]
-            q = Q[i]
-            q = sag / target * q
-            Q[i] = q
-            opening = openings[i]
-            pattern.datastructure.edges_attribute('q', Q[i], keys=opening)
-        relax_pattern(pattern.datastructure, relax)
-
-    if count == 10:
-        print("did not converge after 10 iterations")
-    else:
-        print("converged after %s iterations" % count)
+    fit_sags(pattern.datastructure, openings, targets, Q, executor)
 
     compas_rhino.delete_objects(guids, purge=True)
     scene.update()
@@ -195,32 +132,9 @@ def RunCommand(is_interactive):
                 break
 
             for boundary in N:
-
                 targets[boundary] = float(option2[4:]) / 100
 
-                count = 0
-
-                while True and count < 10:
-                    count += 1
-                    sags = [compute_sag(pattern.datastructure, opening) for opening in openings]
-
-                    if all((sag - target) ** 2 < TOL2 for sag, target in zip(sags, targets)):
-                        break
-
-                    for i in range(len(openings)):
-                        sag = sags[i]
-                        target = targets[i]
-                        q = Q[i]
-                        q = sag / target * q
-                        Q[i] = q
-                        opening = openings[i]
-                        pattern.datastructure.edges_attribute('q', Q[i], keys=opening)
-                    relax_pattern(pattern.datastructure, relax)
-
-                if count == 10:
-                    print("did not converge after 10 iterations")
-                else:
-                    print("converged after %s iterations" % count)
+            fit_sags(pattern.datastructure, openings, targets, Q, executor)
 
             compas_rhino.delete_objects(guids, purge=True)
             scene.update()
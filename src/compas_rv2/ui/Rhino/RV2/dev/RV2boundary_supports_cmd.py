@@ -2,7 +2,6 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-from compas.utilities import flatten
 
 import compas_rhino
 
@@ -65,7 +64,7 @@ def RunCommand(is_interactive):
             return
 
         if option2 == "AllBoundaryVertices":
-            keys = list(set(flatten(pattern.datastructure.vertices_on_boundaries())))
+            keys = pattern.datastructure.boundary_analysis().vertices()
 
         elif option2 == "Corners":
             angle = compas_rhino.rs.GetInteger('Angle tolerance for non-quad face corners:', 170, 1, 180)
@@ -73,7 +72,7 @@ def RunCommand(is_interactive):
 
         elif option2 == "ByContinuousEdges":
             edges = pattern.select_edges()
-            keys = list(set(flatten([pattern.datastructure.vertices_on_edge_loop(edge) for edge in edges])))
+            keys = pattern.datastructure.vertices_on_edge_loops(edges)
 
         # elif option2 == "ByConstraint":
 
@@ -3,12 +3,18 @@ from __future__ import absolute_import
 from __future__ import division
 
 from compas_rv2.rhino import get_proxy
+from compas_rv2.rhino import get_pool
 
 
 __commandname__ = "RV2cloud_check"
 
 
 def RunCommand(is_interactive):
+    pool = get_pool()
+    if pool:
+        for status in pool.health():
+            print(status)
+        return
     p = get_proxy()
     print(p.check())
 
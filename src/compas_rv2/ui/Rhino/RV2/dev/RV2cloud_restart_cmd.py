@@ -4,6 +4,7 @@ from __future__ import division
 
 from compas_rhino.ui import CommandMenu
 from compas_rv2.rhino import get_proxy
+from compas_rv2.rhino import get_pool
 
 
 __commandname__ = "RV2cloud_restart"
@@ -36,6 +37,13 @@ def RunCommand(is_interactive):
     if action['name'] == 'console':
         background = False
 
+    pool = get_pool()
+    if pool:
+        for worker in pool.workers:
+            worker.proxy.background = background
+        pool.restart(unhealthy=False)
+        return
+
     p = get_proxy()
     p.background = background
     p.restart()
@@ -4,6 +4,7 @@ from __future__ import division
 
 from compas_rhino.ui import CommandMenu
 from compas_rv2.rhino import get_proxy
+from compas_rv2.rhino import get_pool
 
 
 __commandname__ = "RV2cloud_shutdown"
@@ -32,6 +33,10 @@ def RunCommand(is_interactive):
     action = menu.select_action()
 
     if action['name'] == 'Yes':
+        pool = get_pool()
+        if pool:
+            pool.shutdown()
+            return
         p = get_proxy()
         p.shutdown()
 
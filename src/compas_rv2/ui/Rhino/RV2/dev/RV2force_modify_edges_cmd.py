@@ -39,7 +39,7 @@ def RunCommand(is_interactive):
 
     elif option == "Continuous":
         edges = force.select_edges()
-        keys = list(set(flatten([force.datastructure.edge_loop(edge) for edge in edges])))
+        keys = force.datastructure.edge_loops(edges)
 
     elif option == "Parallel":
         temp = force.select_edges()
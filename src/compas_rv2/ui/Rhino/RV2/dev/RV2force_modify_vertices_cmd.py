@@ -2,7 +2,6 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-from compas.utilities import flatten
 
 import compas_rhino
 from compas_rv2.rhino import get_scene
@@ -39,7 +38,7 @@ def RunCommand(is_interactive):
 
     elif option == "ByContinuousEdges":
         temp = force.select_edges()
-        keys = list(set(flatten([force.datastructure.vertices_on_edge_loop(key) for key in temp])))
+        keys = force.datastructure.vertices_on_edge_loops(temp)
 
     elif option == "Manual":
         keys = force.select_vertices()
@@ -4,7 +4,6 @@ from __future__ import division
 
 import compas_rhino
 from compas_rv2.rhino import get_scene
-from compas.utilities import flatten
 from compas_rv2.rhino import rv2_undo
 from compas_rv2.rhino import rv2_error
 
@@ -34,7 +33,7 @@ def RunCommand(is_interactive):
 
     if option == "ByContinuousEdges":
         temp = force.select_edges()
-        keys = list(set(flatten([force.datastructure.vertices_on_edge_loop(key) for key in temp])))
+        keys = force.datastructure.vertices_on_edge_loops(temp)
 
     elif option == "Manual":
         keys = force.select_vertices()
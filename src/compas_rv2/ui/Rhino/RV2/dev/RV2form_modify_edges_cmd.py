@@ -41,7 +41,7 @@ def RunCommand(is_interactive):
 
     elif option == "Continuous":
         temp = form.select_edges()
-        keys = list(set(flatten([form.datastructure.edge_loop(key) for key in temp])))
+        keys = form.datastructure.edge_loops(temp)
 
     elif option == "Parallel":
         temp = form.select_edges()
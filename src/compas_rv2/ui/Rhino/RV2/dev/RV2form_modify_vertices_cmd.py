@@ -57,7 +57,7 @@ def RunCommand(is_interactive):
 
     elif option == "ByContinuousEdges":
         temp = form.select_edges()
-        keys = list(set(flatten([form.datastructure.vertices_on_edge_loop(key) for key in temp])))
+        keys = form.datastructure.vertices_on_edge_loops(temp)
 
     # elif option == "ByConstraints":
     #     guids = form.datastructure.vertices_attribute('constraints')
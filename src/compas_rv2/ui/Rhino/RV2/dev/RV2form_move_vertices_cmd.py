@@ -4,7 +4,6 @@ from __future__ import division
 
 import compas_rhino
 from compas_rv2.rhino import get_scene
-from compas.utilities import flatten
 from compas_rv2.rhino import rv2_undo
 from compas_rv2.rhino import rv2_error
 
@@ -49,7 +48,7 @@ def RunCommand(is_interactive):
 
     if option == "ByContinuousEdges":
         temp = form.select_edges()
-        keys = list(set(flatten([form.datastructure.vertices_on_edge_loop(key) for key in temp])))
+        keys = form.datastructure.vertices_on_edge_loops(temp)
 
     # elif option == "ByConstraints":
     #     guids = form.datastructure.vertices_attribute('constraints')
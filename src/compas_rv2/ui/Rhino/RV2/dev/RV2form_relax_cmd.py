@@ -3,7 +3,7 @@ from __future__ import absolute_import
 from __future__ import division
 
 from compas_rv2.rhino import get_scene
-from compas_rv2.rhino import get_proxy
+from compas_rv2.rhino import get_executor
 from compas_rv2.rhino import rv2_undo
 from compas_rv2.rhino import rv2_error
 
@@ -18,8 +18,8 @@ def RunCommand(is_interactive):
     if not scene:
         return
 
-    proxy = get_proxy()
-    if not proxy:
+    executor = get_executor()
+    if not executor:
         return
 
     form = scene.get("form")[0]
@@ -33,21 +33,11 @@ def RunCommand(is_interactive):
     fixed = list(form.datastructure.vertices_where({'is_fixed': True}))
     fixed = list(set(anchors + fixed))
 
-    relax = proxy.function("compas.numerical.fd_numpy")
+    result = executor.relax(form.datastructure, fixed)
 
-    key_index = form.datastructure.key_index()
-    xyz = form.datastructure.vertices_attributes('xyz')
-    loads = [[0.0, 0.0, 0.0] for _ in xyz]
-    fixed[:] = [key_index[key] for key in fixed]
-    edges = [(key_index[u], key_index[v]) for u, v in form.datastructure.edges()]
-
-    q = form.datastructure.edges_attribute('q')
-
-    xyz, q, f, l, r = relax(xyz, edges, fixed, q, loads)
-
-    for key in form.datastructure.vertices():
-        index = key_index[key]
-        form.datastructure.vertex_attributes(key, 'xyz', xyz[index])
+    if not result:
+        print("Relaxation failed!")
+        return
 
     if thrust:
         thrust.settings['_is.valid'] = False
@@ -43,7 +43,7 @@ def RunCommand(is_interactive):
         return
 
     if option == 'True':
-        fixed += list(flatten(form.datastructure.vertices_on_boundaries()))
+        fixed += form.datastructure.boundary_analysis().vertices()
         fixed += list(flatten([form.datastructure.face_vertices(face) for face in form.datastructure.faces_where({'_is_loaded': False})]))
 
     fixed = list(set(fixed))
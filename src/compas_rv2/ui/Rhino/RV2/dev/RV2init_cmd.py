@@ -3,6 +3,7 @@ from __future__ import absolute_import
 from __future__ import division
 
 import os
+import uuid
 import scriptcontext as sc
 
 import compas
@@ -12,6 +13,8 @@ compas_rhino.unload_modules('compas_rv2')
 
 from compas_cloud import Proxy  # noqa: E402
 from compas_rv2.scene import Scene  # noqa: E402
+from compas_rv2.history import History  # noqa: E402
+from compas_rv2.execution import SolverPool  # noqa: E402
 from compas_rv2.rhino import rv2_error  # noqa: E402
 # from compas_rv2.activate import check  # noqa: E402
 # from compas_rv2.activate import activate  # noqa: E402
@@ -26,15 +29,19 @@ SETTINGS = {
     "RV2": {
         "show.forces": False,
         "show.angles": True,
-        "tol.angles": 5.0
+        "tol.angles": 5.0,
+        "undo.memory": 64
     },
 
     "Solvers": {
         "tna.vertical.kmax": 300,
         "tna.vertical.zmax": 4.0,
-        "tna.horizontal.kmax": 100,
+        "tna.vertical.warmstart": False,
+        "tna.horizontal.kmax": 500,
         "tna.horizontal.alpha": 100,
         "tna.horizontal.refreshrate": 10,
+        "tna.horizontal.checkrate": 10,
+        "pool.size": 1,
     }
 
 }
@@ -65,10 +72,20 @@ def RunCommand(is_interactive):
     errorHandler = rv2_error(title="Server side Error", showLocalTraceback=False)
     sc.sticky["RV2.proxy"] = Proxy(errorHandler=errorHandler, port=9009)
 
+    def factory(port):
+        if port == 9009:
+            return sc.sticky["RV2.proxy"]
+        return Proxy(errorHandler=errorHandler, port=port)
+
+    # the solver calls of a session only send the arrays that changed since the previous call
+    sc.sticky["RV2.pool"] = SolverPool(size=SETTINGS["Solvers"]["pool.size"], port=9009, factory=factory)
+    sc.sticky.pop("RV2.executor", None)
+
     sc.sticky["RV2.system"] = {
         "session.dirname": CWD,
         "session.filename": None,
-        "session.extension": 'rv2'
+        "session.extension": 'rv2',
+        "session.id": str(uuid.uuid4())
     }
 
     scene = Scene(SETTINGS)
@@ -76,7 +93,7 @@ def RunCommand(is_interactive):
 
     sc.sticky["RV2"] = {"scene": scene}
 
-    sc.sticky["RV2.sessions"] = []
+    sc.sticky["RV2.history"] = History(budget=SETTINGS["RV2"]["undo.memory"] * 2 ** 20)
 
     print("RV2 is successfully initiated!")
 
@@ -82,6 +82,8 @@ def RunCommand(is_interactive):
         constrained_smoothing(
             pattern, kmax=kmax, damping=0.5, constraints=constraints, algorithm="area"
         )
+        # the smoothing writes the coordinates directly
+        pattern.modified('vertices', 'xyz')
         scene.update()
 
     print('Pattern object successfully created. Input object has been hidden.')
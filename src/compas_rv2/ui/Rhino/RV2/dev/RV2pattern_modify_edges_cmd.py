@@ -37,7 +37,7 @@ def RunCommand(is_interactive):
 
     elif option == "Continuous":
         temp = pattern.select_edges()
-        keys = list(set(flatten([pattern.datastructure.edge_loop(key) for key in temp])))
+        keys = pattern.datastructure.edge_loops(temp)
 
     elif option == "Parallel":
         temp = pattern.select_edges()
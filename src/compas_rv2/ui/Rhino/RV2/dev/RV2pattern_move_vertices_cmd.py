@@ -4,7 +4,6 @@ from __future__ import division
 
 import compas_rhino
 from compas_rv2.rhino import get_scene
-from compas.utilities import flatten
 from compas_rv2.rhino import rv2_undo
 from compas_rv2.rhino import select_vertices
 from compas_rv2.rhino import rv2_error
@@ -33,7 +32,7 @@ def RunCommand(is_interactive):
 
     if option == "ByContinuousEdges":
         temp = pattern.select_edges()
-        keys = list(set(flatten([pattern.datastructure.vertices_on_edge_loop(key) for key in temp])))
+        keys = pattern.datastructure.vertices_on_edge_loops(temp)
 
     # elif option == "ByConstraints":
     #     guids = pattern.datastructure.vertices_attribute('constraints')
@@ -3,7 +3,7 @@ from __future__ import absolute_import
 from __future__ import division
 
 from compas_rv2.rhino import get_scene
-from compas_rv2.rhino import get_proxy
+from compas_rv2.rhino import get_executor
 from compas_rv2.rhino import rv2_undo
 from compas_rv2.rhino import rv2_error
 
@@ -18,8 +18,8 @@ def RunCommand(is_interactive):
     if not scene:
         return
 
-    proxy = get_proxy()
-    if not proxy:
+    executor = get_executor()
+    if not executor:
         return
 
     pattern = scene.get("pattern")[0]
@@ -33,21 +33,11 @@ def RunCommand(is_interactive):
         print("Pattern has no fixed vertices! Relaxation requires fixed vertices.")
         return
 
-    relax = proxy.function("compas.numerical.fd_numpy")
+    result = executor.relax(pattern.datastructure, fixed)
 
-    key_index = pattern.datastructure.key_index()
-    xyz = pattern.datastructure.vertices_attributes('xyz')
-    loads = [[0.0, 0.0, 0.0] for _ in xyz]
-    fixed[:] = [key_index[key] for key in fixed]
-    edges = [(key_index[u], key_index[v]) for u, v in pattern.datastructure.edges()]
-
-    q = pattern.datastructure.edges_attribute('q')
-
-    xyz, q, f, l, r = relax(xyz, edges, fixed, q, loads)
-
-    for key in pattern.datastructure.vertices():
-        index = key_index[key]
-        pattern.datastructure.vertex_attributes(key, 'xyz', xyz[index])
+    if not result:
+        print("Relaxation failed!")
+        return
 
     scene.update()
 
@@ -5,7 +5,6 @@ from __future__ import division
 import compas_rhino
 from compas_rv2.rhino import get_scene
 from compas_rv2.rhino import get_proxy
-from compas.utilities import flatten
 from compas_rv2.rhino import rv2_undo
 from compas_rv2.rhino import rv2_error
 
@@ -43,7 +42,7 @@ def RunCommand(is_interactive):
         return
 
     if option == 'True':
-        fixed = fixed + list(flatten(pattern.datastructure.vertices_on_boundaries()))
+        fixed = fixed + pattern.datastructure.boundary_analysis().vertices()
 
     pattern.datastructure.smooth_area(fixed=fixed)
 
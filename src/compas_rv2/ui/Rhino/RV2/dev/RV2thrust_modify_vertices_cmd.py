@@ -2,7 +2,6 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-from compas.utilities import flatten
 
 import compas_rhino
 
@@ -53,7 +52,7 @@ def RunCommand(is_interactive):
 
     if option == "Continuous":
         temp = thrust.select_edges()
-        keys = list(set(flatten([thrust.datastructure.vertices_on_edge_loop(key) for key in temp])))
+        keys = thrust.datastructure.vertices_on_edge_loops(temp)
 
     elif option == "Manual":
         keys = thrust.select_vertices()
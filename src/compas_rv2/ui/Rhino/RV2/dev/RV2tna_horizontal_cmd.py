@@ -4,8 +4,11 @@ from __future__ import division
 
 import compas_rhino
 from compas_rv2.rhino import get_scene
+from compas_rv2.rhino import get_executor
+from compas_rv2.rhino import print_timings
+from compas_rv2.rhino import solve_in_background
+from compas_rv2.execution import Cancelled
 from compas.geometry import Translation
-from compas_tna.equilibrium import horizontal_nodal
 from compas_rv2.rhino import HorizontalConduit
 from compas_rv2.rhino.helpers import rv2_undo
 from compas_rv2.rhino import rv2_error
@@ -19,16 +22,18 @@ __commandname__ = "RV2tna_horizontal"
 def RunCommand(is_interactive):
 
     def redraw(k, xy, edges):
-        if k % conduit.refreshrate:
-            return
-        print(k)
-        conduit.lines = [[[xy[i][1], -xy[i][0]], [xy[j][1], -xy[j][0]]] for i, j in edges]
+        compas_rhino.rs.Prompt('Iteration {} of {}. Press ESC to cancel.'.format(k, kmax))
+        conduit.update(xy, edges)
         conduit.redraw()
 
     scene = get_scene()
     if not scene:
         return
 
+    executor = get_executor()
+    if not executor:
+        return
+
     form = scene.get('form')[0]
     force = scene.get('force')[0]
     thrust = scene.get('thrust')[0]
@@ -44,8 +49,10 @@ def RunCommand(is_interactive):
     kmax = scene.settings['Solvers']['tna.horizontal.kmax']
     alpha = scene.settings['Solvers']['tna.horizontal.alpha']
     refresh = scene.settings['Solvers']['tna.horizontal.refreshrate']
+    checkrate = scene.settings['Solvers'].get('tna.horizontal.checkrate', 10)
+    tol = scene.settings['RV2']['tol.angles']
 
-    options = ['Alpha', 'Iterations', 'RefreshRate']
+    options = ['Alpha', 'Iterations', 'RefreshRate', 'CheckRate']
 
     while True:
         option = compas_rhino. rs.GetString('Press Enter to run or ESC to exit.', strings=options)
@@ -76,25 +83,51 @@ def RunCommand(is_interactive):
                 kmax = new_kmax
 
         elif option == 'RefreshRate':
-            new_refresh = compas_rhino.rs.GetInteger('Refresh rate for dynamic visualisation', refresh, 0, 1000)
+            new_refresh = compas_rhino.rs.GetInteger('Number of iterations between snapshots for dynamic visualisation (0 to disable)', refresh, 0, 1000)
             if new_refresh or new_refresh is not None:
                 refresh = new_refresh
 
+        elif option == 'CheckRate':
+            new_checkrate = compas_rhino.rs.GetInteger('Number of iterations between checks of the angle deviations', checkrate, 1, 1000)
+            if new_checkrate:
+                checkrate = new_checkrate
+
     if refresh > kmax:
         refresh = 0
 
     scene.settings['Solvers']['tna.horizontal.kmax'] = kmax
     scene.settings['Solvers']['tna.horizontal.alpha'] = alpha
     scene.settings['Solvers']['tna.horizontal.refreshrate'] = refresh
+    scene.settings['Solvers']['tna.horizontal.checkrate'] = checkrate
 
+    # the force diagram is drawn completely at the next update of the scene,
+    # also if the computation is cancelled or fails
     force.artist.clear()
+    scene.invalidate(force)
+
+    # the solver runs in the background,
+    # and the conduit draws the latest iteration at an interval that adapts to the time it takes to draw it
+    try:
+        if refresh > 0:
+            conduit = HorizontalConduit([])
+            # the context of the conduit would swallow the cancellation
+            conduit.enable()
+            try:
+                result = solve_in_background(executor.horizontal, form.datastructure, force.datastructure, kmax=kmax, alpha=alpha, refreshrate=refresh,
+                                             tol=tol, checkrate=checkrate, draw=redraw)
+            finally:
+                conduit.disable()
+        else:
+            result = solve_in_background(executor.horizontal, form.datastructure, force.datastructure, kmax=kmax, alpha=alpha, tol=tol, checkrate=checkrate)
+    except Cancelled:
+        print("Horizontal equilibrium cancelled! The diagrams were not changed.")
+        scene.update()
+        return
 
-    if refresh > 0:
-        conduit = HorizontalConduit([], refreshrate=refresh)
-        with conduit.enabled():
-            horizontal_nodal(form.datastructure, force.datastructure, kmax=kmax, alpha=alpha, callback=redraw)
-    else:
-        horizontal_nodal(form.datastructure, force.datastructure, kmax=kmax, alpha=alpha)
+    if not result:
+        print("Horizontal equilibrium failed!")
+        scene.update()
+        return
 
     bbox_form = form.datastructure.bounding_box_xy()
     bbox_force = force.datastructure.bounding_box_xy()
@@ -108,21 +141,21 @@ def RunCommand(is_interactive):
     dy = y_form - y_force
 
     force.datastructure.transform(Translation.from_vector([dx, dy, 0]))
-    force.datastructure.update_angle_deviations()
+    max_angle, _ = force.datastructure.update_angle_deviations()
 
     thrust.settings['_is.valid'] = False
 
     scene.update()
 
-    max_angle = max(form.datastructure.edges_attribute('_a'))
-    tol = scene.settings['RV2']['tol.angles']
-
     if max_angle < tol:
         print('Horizontal equilibrium found!')
         print('Maximum angle deviation:', max_angle)
     else:
         print('Horizontal equilibrium NOT found! Consider running more iterations.')
         print('Maximum angle deviation:', max_angle)
+    print('Iterations:', result['iterations'], 'of', kmax)
+
+    print_timings(result)
 
 
 # ==============================================================================
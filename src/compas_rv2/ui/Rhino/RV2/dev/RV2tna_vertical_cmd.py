@@ -2,9 +2,14 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+from copy import deepcopy
+
 import compas_rhino
 from compas_rv2.rhino import get_scene
-from compas_rv2.rhino import get_proxy
+from compas_rv2.rhino import get_executor
+from compas_rv2.rhino import print_timings
+from compas_rv2.rhino import solve_in_background
+from compas_rv2.execution import Cancelled
 from compas.geometry import subtract_vectors
 from compas.geometry import length_vector
 from compas_rv2.rhino import rv2_undo
@@ -24,12 +29,10 @@ def RunCommand(is_interactive):
     if not scene:
         return
 
-    proxy = get_proxy()
-    if not proxy:
+    executor = get_executor()
+    if not executor:
         return
 
-    vertical = proxy.function('compas_tna.equilibrium.vertical_from_zmax_proxy')
-
     form = scene.get('form')[0]
     force = scene.get('force')[0]
     thrust = scene.get('thrust')[0]
@@ -51,8 +54,9 @@ def RunCommand(is_interactive):
 
     zmax = scene.settings['Solvers']['tna.vertical.zmax']
     kmax = scene.settings['Solvers']['tna.vertical.kmax']
+    warmstart = scene.settings['Solvers'].get('tna.vertical.warmstart', False)
 
-    options = ['TargetHeight']
+    options = ['TargetHeight', 'Mode']
 
     while True:
         option = compas_rhino.rs.GetString('Press Enter to run or ESC to exit.', strings=options)
@@ -69,22 +73,32 @@ def RunCommand(is_interactive):
             if new_zmax or new_zmax is not None:
                 zmax = new_zmax
 
+        elif option == 'Mode':
+            # incremental mode starts from the current thrust diagram,
+            # after changes of loads, thickness or supports
+            modes = ['Cold', 'Incremental']
+            mode = compas_rhino.rs.GetString('Select solver mode', modes[int(warmstart)], modes)
+            if mode:
+                warmstart = mode == 'Incremental'
+
     scene.settings['Solvers']['tna.vertical.zmax'] = zmax
+    scene.settings['Solvers']['tna.vertical.warmstart'] = warmstart
 
-    result = vertical(form.datastructure.data, zmax, kmax=kmax)
+    try:
+        result = solve_in_background(executor.vertical, form.datastructure, zmax, kmax=kmax, warmstart=warmstart)
+    except Cancelled:
+        print("Vertical equilibrium cancelled! The diagrams were not changed.")
+        return
 
     if not result:
         print("Vertical equilibrium failed!")
         return
 
-    formdata, scale = result
-
     # store in advance such that it can be reset
     thrust_name = thrust.name
 
-    force.datastructure.attributes['scale'] = scale
-    form.datastructure.data = formdata
-    thrust.datastructure.data = formdata
+    force.datastructure.attributes['scale'] = result['scale']
+    thrust.datastructure.data = deepcopy(form.datastructure.data)
 
     # the name of the thrust diagram is stored in the attribute dict of the mesh
     # therefore the name must be reset explicitly
@@ -100,6 +114,8 @@ def RunCommand(is_interactive):
 
     print('Vertical equilibrium found!')
     print('ThrustDiagram object successfully created with target height of {}.'.format(zmax))
+    print('Iterations: {}, residual: {:.3e}'.format(result['iterations'], result['residual']))
+    print_timings(result)
 
 
 # ==============================================================================
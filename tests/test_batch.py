@@ -0,0 +1,128 @@
+import json
+import pytest
+
+from importlib import import_module
+
+from compas.datastructures import Mesh
+from compas_tna.diagrams import FormDiagram
+from compas_tna.diagrams import ForceDiagram
+
+from compas_rv2.batch import DEFAULT_SETTINGS
+from compas_rv2.batch import solver_settings
+from compas_rv2.batch import solve_diagrams
+from compas_rv2.batch import parameter_grid
+from compas_rv2.batch import sweep
+
+# the module, which is shadowed by the function of the same name in the package
+sweep_module = import_module('compas_rv2.batch.sweep')
+
+
+def make_diagrams(n=6):
+    form = FormDiagram.from_mesh(Mesh.from_meshgrid(dx=10, nx=n))
+    form.vertices_attribute('is_anchor', True, keys=list(form.vertices_where({'vertex_degree': 2})))
+    form.update_boundaries()
+    force = ForceDiagram.from_formdiagram(form)
+    return form, force
+
+
+def test_solver_settings():
+    assert solver_settings(None) == DEFAULT_SETTINGS
+    settings = solver_settings({'Solvers': {'tna.vertical.zmax': 2.0}}, {'tna.horizontal.alpha': 50, 'tna.vertical.kmax': None})
+    assert settings['tna.vertical.zmax'] == 2.0
+    assert settings['tna.horizontal.alpha'] == 50
+    assert settings['tna.vertical.kmax'] == DEFAULT_SETTINGS['tna.vertical.kmax']
+    # sessions of older versions store the solver settings at the top level
+    assert solver_settings({'tna.vertical.zmax': 3.0})['tna.vertical.zmax'] == 3.0
+
+
+def test_solve_diagrams():
+    form, force = make_diagrams()
+    settings = solver_settings(None, {'tna.vertical.zmax': 2.0})
+    summary = solve_diagrams(form, force, settings)
+    assert summary['max_angle'] < 5.0
+    assert summary['scale'] > 0
+    assert force.attributes['scale'] == summary['scale']
+    assert max(form.vertices_attribute('z')) == pytest.approx(2.0, rel=5e-2)
+
+
+def test_parameter_grid():
+    grid = parameter_grid([2.0, 3.0], [100, 50], [100])
+    assert len(grid) == 4
+    assert grid[0] == {'zmax': 2.0, 'alpha': 100, 'kmax': 100}
+    assert {(row['zmax'], row['alpha']) for row in grid} == {(2.0, 100), (2.0, 50), (3.0, 100), (3.0, 50)}
+
+
+def make_supported_diagrams(n=4):
+    form = FormDiagram.from_mesh(Mesh.from_meshgrid(dx=10, nx=n))
+    form.vertices_attribute('is_anchor', True, keys=list(form.vertices_on_boundary()))
+    form.update_boundaries()
+    force = ForceDiagram.from_formdiagram(form)
+    return form, force
+
+
+def assert_sweep_rows(table, grid):
+    assert [{name: row[name] for name in ('zmax', 'alpha', 'kmax')} for row in table] == grid
+    for row in table:
+        assert row['status'] == 'ok'
+        assert row['message'] == ''
+        assert row['max_angle'] < 1e-3
+        assert row['max_reaction'] > 0
+        assert row['max_stress'] > 0
+        assert row['time'] >= 0
+        # the same results as solving the diagrams of the session directly
+        form, force = make_supported_diagrams()
+        settings = {'tna.vertical.zmax': row['zmax'], 'tna.horizontal.alpha': row['alpha'], 'tna.horizontal.kmax': row['kmax']}
+        summary = solve_diagrams(form, force, solver_settings(None, settings))
+        assert row['scale'] == pytest.approx(summary['scale'])
+
+
+def test_sweep_single_process(monkeypatch):
+    # the workers solve thrust diagrams, which import the skeleton of compas_skeleton 1.x
+    pytest.importorskip('compas_skeleton.datastructure')
+    form, force = make_supported_diagrams()
+    data = form.to_data()
+    horizontal = sweep_module.horizontal_nodal_numpy
+
+    def horizontal_nodal_numpy(form, force, alpha=100, kmax=100, **kwargs):
+        if alpha == 0:
+            raise ValueError('alpha')
+        return horizontal(form, force, alpha=alpha, kmax=kmax, **kwargs)
+
+    monkeypatch.setattr(sweep_module, 'horizontal_nodal_numpy', horizontal_nodal_numpy)
+    table = sweep(form, force, zmax=[2.0, 3.0], alpha=[100, 0], kmax=[50], processes=1)
+    grid = parameter_grid([2.0, 3.0], [100, 0], [50])
+    assert len(table) == 4
+    assert_sweep_rows([row for row in table if row['alpha'] == 100], [row for row in grid if row['alpha'] == 100])
+    errors = [row for row in table if row['alpha'] == 0]
+    assert [row['zmax'] for row in errors] == [2.0, 3.0]
+    for row in errors:
+        assert row['status'] == 'error'
+        assert row['message'] == 'ValueError: alpha'
+        assert 'scale' not in row
+    # a higher thrust diagram needs smaller horizontal forces, and the diagrams themselves are not modified
+    assert table[2]['scale'] < table[0]['scale']
+    assert form.to_data() == data
+    assert sweep_module.WORKER == {}
+
+
+def test_sweep_processes():
+    pytest.importorskip('compas_skeleton.datastructure')
+    form, force = make_supported_diagrams()
+    table = sweep(form, force, zmax=[2.0, 3.0], alpha=[100], kmax=[50], processes=2)
+    assert_sweep_rows(table, parameter_grid([2.0, 3.0], [100], [50]))
+
+
+def test_init_worker_shared_memory():
+    shared_memory = pytest.importorskip('multiprocessing.shared_memory')
+    data = json.dumps({'form': {}, 'zmax': 2.0}).encode('utf-8')
+    shm = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        shm.buf[:len(data)] = data
+        sweep_module.init_worker(shm.name, len(data))
+        assert sweep_module.WORKER['data'] == data
+        sweep_module.init_worker(None, b'{}')
+        assert sweep_module.WORKER['data'] == b'{}'
+    finally:
+        sweep_module.WORKER.clear()
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,489 @@
+import pytest
+
+from itertools import groupby
+
+from compas.datastructures import Mesh
+from compas.geometry import angle_vectors
+from compas.geometry import angle_vectors_xy
+from compas.geometry import cross_vectors
+
+# the data structures import the skeleton of compas_skeleton 1.x
+pytest.importorskip('compas_skeleton.datastructure')
+
+from compas_rv2.datastructures import BoundaryAnalysis  # noqa: E402
+from compas_rv2.datastructures import FormDiagram  # noqa: E402
+from compas_rv2.datastructures import ForceDiagram  # noqa: E402
+from compas_rv2.datastructures import ThrustDiagram  # noqa: E402
+from compas_rv2.history.history import History  # noqa: E402
+from compas_rv2.scene import RecordingBackend  # noqa: E402
+from compas_rv2.scene import Scene  # noqa: E402
+from compas_rv2.scene import ViewCoordinates  # noqa: E402
+
+
+def make_thrust(n=5):
+    thrust = ThrustDiagram.from_mesh(Mesh.from_meshgrid(dx=10, nx=n))
+    for vertex, attr in thrust.vertices(True):
+        attr['z'] = 0.1 * attr['x'] * (10 - attr['x']) + 0.05 * attr['y'] * (10 - attr['y'])
+        attr['t'] = 0.5 + 0.01 * vertex
+    thrust.invalidate('geometry')
+    return thrust
+
+
+def assert_tributary_areas(thrust):
+    areas = thrust.vertices_tributary_area()
+    assert sorted(areas) == sorted(thrust.vertices())
+    for vertex in thrust.vertices():
+        assert areas[vertex] == pytest.approx(thrust.vertex_tributary_area(vertex))
+
+
+def test_vertices_tributary_area():
+    thrust = make_thrust()
+    assert_tributary_areas(thrust)
+    assert thrust.vertices_tributary_area() is thrust.vertices_tributary_area()
+
+
+def test_vertices_tributary_area_invalidated_by_geometry():
+    thrust = make_thrust()
+    areas = thrust.vertices_tributary_area()
+
+    thrust.vertex_attribute(12, 'z', 10.0)
+    assert thrust.vertices_tributary_area() is not areas
+    assert_tributary_areas(thrust)
+
+    areas = thrust.vertices_tributary_area()
+    thrust.vertices_attributes('xyz', [1.0, 1.0, 5.0], keys=[6])
+    assert thrust.vertices_tributary_area() is not areas
+    assert_tributary_areas(thrust)
+
+    # direct writes to the attribute dicts have to be followed by an explicit invalidation
+    areas = thrust.vertices_tributary_area()
+    for vertex, attr in thrust.vertices(True):
+        attr['z'] = 0.0
+    assert thrust.vertices_tributary_area() is areas
+    thrust.invalidate('geometry')
+    assert thrust.vertices_tributary_area() is not areas
+    assert_tributary_areas(thrust)
+
+
+def test_vertices_tributary_area_invalidated_by_loads():
+    thrust = make_thrust()
+    areas = thrust.vertices_tributary_area()
+
+    face = thrust.get_any_face()
+    thrust.face_attribute(face, '_is_loaded', False)
+    assert thrust.vertices_tributary_area() is not areas
+    assert_tributary_areas(thrust)
+
+    thrust.faces_attribute('_is_loaded', False)
+    assert all(area == 0.0 for area in thrust.vertices_tributary_area().values())
+
+    thrust.faces_attribute('_is_loaded', True, keys=[face])
+    assert_tributary_areas(thrust)
+
+
+def test_vertices_tributary_area_invalidated_by_topology():
+    thrust = make_thrust()
+    thrust.vertices_tributary_area()
+    thrust.delete_face(thrust.get_any_face())
+    assert_tributary_areas(thrust)
+
+    thrust.data = make_thrust(n=3).data
+    assert_tributary_areas(thrust)
+
+
+def test_vertices_selfweight():
+    thrust = make_thrust()
+    selfweight = thrust.vertices_selfweight()
+    for vertex, attr in thrust.vertices(True):
+        assert selfweight[vertex] == pytest.approx(thrust.vertex_tributary_area(vertex) * attr['t'])
+
+
+def test_vertices_lumped_stress():
+    thrust = make_thrust()
+    for index, (edge, attr) in enumerate(thrust.edges(True)):
+        attr['_f'] = 1.0 + 0.1 * index
+    # the edges of a corner vertex carry no force
+    corner = next(thrust.vertices_where({'vertex_degree': 2}))
+    for nbr in thrust.vertex_neighbors(corner):
+        thrust.edge_attribute((corner, nbr), '_f', 0.0)
+
+    stresses, smin, smax = thrust.vertices_lumped_stress()
+    assert thrust.vertex_lumped_stress(corner) is None
+    assert corner not in stresses
+    for vertex in thrust.vertices():
+        if vertex == corner:
+            continue
+        assert stresses[vertex] == pytest.approx(thrust.vertex_lumped_stress(vertex))
+    assert smin == min(stresses.values())
+    assert smax == max(stresses.values())
+
+
+def test_vertices_lumped_stress_without_forces():
+    thrust = make_thrust()
+    assert all(thrust.vertex_lumped_stress(vertex) is None for vertex in thrust.vertices())
+    assert thrust.vertices_lumped_stress() == ({}, None, None)
+
+
+def test_force_edge_index(monkeypatch):
+    form = FormDiagram.from_mesh(Mesh.from_meshgrid(dx=10, nx=4))
+    force = ForceDiagram.from_formdiagram(form)
+    for edge in force.edges():
+        assert force.dual_edge(force.primal_edge(edge)) == edge
+
+    rebuilds = []
+    update_edge_index = force.update_edge_index
+    monkeypatch.setattr(force, 'update_edge_index', lambda: rebuilds.append(update_edge_index()))
+
+    # a boundary edge of the form diagram has no dual edge, which does not rebuild the index
+    u, v = next(edge for edge in form.edges() if form.is_edge_on_boundary(*edge))
+    with pytest.raises(KeyError):
+        force.dual_edge((u, v))
+    assert not rebuilds
+
+    # a change of the topology of the form diagram does
+    form.delete_face(form.get_any_face())
+    with pytest.raises(KeyError):
+        force.dual_edge((u, v))
+    assert len(rebuilds) == 1
+
+
+def baseline_angle_deviations(force):
+    angles = {}
+    for edge in force.edges():
+        edge_ = force.primal_edge(edge)
+        uv = force.edge_vector(*edge)
+        uv_ = force.primal.edge_vector(*edge_)
+        a = angle_vectors_xy(uv, cross_vectors(uv_, (0, 0, 1)), deg=True)
+        if force.primal.edge_attribute(edge_, '_is_tension'):
+            a = 180 - a
+        angles[edge] = a
+    return angles
+
+
+def test_update_angle_deviations():
+    form = FormDiagram.from_mesh(Mesh.from_meshgrid(dx=10, nx=4))
+    force = ForceDiagram.from_formdiagram(form)
+    for vertex in force.vertices():
+        force.vertex_attribute(vertex, 'x', force.vertex_attribute(vertex, 'x') + 0.3 * ((vertex * 7) % 5 - 2))
+    # an edge with a small deviation in compression has a large one in tension
+    compression = baseline_angle_deviations(force)
+    edge = next(edge for edge, a in compression.items() if 0 < a < 90)
+    form.edge_attribute(force.primal_edge(edge), '_is_tension', True)
+    expected = baseline_angle_deviations(force)
+    assert expected[edge] == pytest.approx(180 - compression[edge])
+
+    force.pop_changes()
+    amax, amean = force.update_angle_deviations()
+    assert amax == pytest.approx(max(expected.values()), abs=1e-5)
+    assert amean == pytest.approx(sum(expected.values()) / len(expected), abs=1e-5)
+    for edge, a in expected.items():
+        assert force.edge_attribute(edge, '_a') == pytest.approx(a, abs=1e-5)
+        assert form.edge_attribute(force.primal_edge(edge), '_a') == pytest.approx(a, abs=1e-5)
+    assert set(force.pop_changes()['edges']) == set(tuple(sorted(edge)) for edge in expected)
+
+
+def test_view_coordinates_versions():
+    form = FormDiagram.from_mesh(Mesh.from_meshgrid(dx=10, nx=4))
+    view = ViewCoordinates()
+    vertex_xyz = view.get(form, [10.0, 0.0, 0.0], 1.0, [0.0, 0.0, 0.0])
+    assert vertex_xyz[0] == [10.0, 0.0, 0.0]
+
+    # a cache hit only compares the versions of the mesh, not the coordinates
+    form.vertex[0]['x'] = 1.0
+    assert view.get(form, [10.0, 0.0, 0.0], 1.0, [0.0, 0.0, 0.0]) is vertex_xyz
+    form.invalidate('geometry')
+    assert view.get(form, [10.0, 0.0, 0.0], 1.0, [0.0, 0.0, 0.0])[0] == [11.0, 0.0, 0.0]
+
+    vertex_xyz = view.get(form, [10.0, 0.0, 0.0], 1.0, [0.0, 0.0, 0.0])
+    form.vertex_attribute(0, 'y', 2.0)
+    assert view.get(form, [10.0, 0.0, 0.0], 1.0, [0.0, 0.0, 0.0])[0] == [11.0, 2.0, 0.0]
+    assert view.get(form, [0.0, 0.0, 0.0], 2.0, [0.0, 0.0, 0.0])[0] == [2.0, 4.0, 0.0]
+
+
+def test_invalidate_attributes_names():
+    form = FormDiagram.from_mesh(Mesh.from_meshgrid(dx=10, nx=4))
+    versions = dict(form._versions())
+    form.invalidate_attributes('zmax')
+    form.invalidate_attributes('x_label')
+    assert form._versions() == versions
+    form.invalidate_attributes('xyz')
+    assert form._versions()['geometry'] == versions['geometry'] + 1
+    form.invalidate_attributes('xy')
+    form.invalidate_attributes(['px', 'x'])
+    assert form._versions()['geometry'] == versions['geometry'] + 3
+    assert form._versions()['fixity'] == versions['fixity']
+    form.vertices_attribute('zmax', 1.0)
+    assert form._versions()['geometry'] == versions['geometry'] + 3
+
+
+# ==============================================================================
+# Changes
+# ==============================================================================
+
+
+def test_pop_changes():
+    form = FormDiagram.from_mesh(Mesh.from_meshgrid(dx=10, nx=4))
+    # the modifications are recorded only after the first call
+    form.vertex_attribute(0, 'z', 1.0)
+    assert form.pop_changes() is None
+
+    versions = dict(form._versions())
+    form.vertex_attribute(5, 'z', 3.0)
+    form.vertices_attributes('xy', [1.0, 2.0], keys=iter([6, 7]))
+    form.edge_attribute((6, 5), 'q', 2.0)
+    form.edges_attribute('_is_tension', True, keys=[(1, 2)])
+    form.face_attribute(0, 'is_loaded', False)
+    form.modified('edges', ['_f'], [(5, 6)])
+    changes = form.pop_changes()
+    assert not changes['full']
+    assert changes['vertices'] == {5: {'z'}, 6: {'x', 'y'}, 7: {'x', 'y'}}
+    assert changes['edges'] == {(5, 6): {'q', '_f'}, (1, 2): {'_is_tension'}}
+    assert changes['faces'] == {0: {'is_loaded'}}
+    assert form._versions()['geometry'] > versions['geometry']
+    assert form.pop_changes() == {'full': False, 'vertices': {}, 'edges': {}, 'faces': {}}
+
+    # without keys, all elements of the section
+    form.modified('vertices', ['z'])
+    assert form.pop_changes()['vertices'] == {vertex: {'z'} for vertex in form.vertices()}
+
+    form.delete_face(0)
+    form.vertex_attribute(5, 'z', 2.0)
+    assert form.pop_changes()['full']
+
+
+def test_scene_update_modified():
+    form = FormDiagram.from_mesh(Mesh.from_meshgrid(dx=10, nx=4))
+    scene = Scene({'RV2': {}}, backend=RecordingBackend())
+    scene.add(form, name='form')
+    assert list(scene.update().values())[0].full
+
+    # the attribute dicts are not compared
+    form.vertex[5]['z'] = 3.0
+    form.vertex_attribute(6, 'is_anchor', True)
+    form.edge_attribute((6, 5), '_is_tension', True)
+    form.attributes['name'] = 'other'
+    changeset = list(scene.update().values())[0]
+    assert not changeset.full
+    assert changeset.vertices == {6: {'is_anchor'}}
+    assert changeset.edges == {(5, 6): {'_is_tension'}}
+    assert changeset.attributes == {'name'}
+    assert scene.update() == {}
+
+    form.vertex[5]['z'] = 2.0
+    form.modified('vertices', ['z'], [5])
+    changeset = list(scene.update().values())[0]
+    assert changeset.vertices == {5: {'z'}}
+    assert changeset.geometry
+
+    form.delete_face(0)
+    assert list(scene.update().values())[0].full
+
+
+def test_history_undo_modified():
+    form = FormDiagram.from_mesh(Mesh.from_meshgrid(dx=10, nx=4))
+    history = History()
+    history.record({'form': form})
+    form.vertex_attribute(5, 'z', 3.0)
+    form.edge_attribute((6, 5), 'q', 2.0)
+    history.record({'form': form})
+    form.pop_changes()
+    versions = dict(form._versions())
+    history.undo({'form': form})
+    assert form.vertex_attribute(5, 'z') == 0.0
+    changes = form.pop_changes()
+    assert changes['vertices'] == {5: {'z'}}
+    assert changes['edges'] == {(5, 6): {'q'}}
+    assert form._versions()['geometry'] == versions['geometry'] + 1
+
+
+# ==============================================================================
+# Edge loops
+# ==============================================================================
+
+
+def baseline_edge_loop(mesh, uv):
+    """The walk of ``MeshMixin.edge_loop`` before the edge loop index."""
+    boundary = mesh.is_edge_on_boundary(*uv)
+
+    def step(previous, current):
+        if mesh.vertex_attribute(current, 'is_fixed'):
+            return None
+        if boundary:
+            nbrs = mesh.vertex_neighbors(current)
+            if len(nbrs) == 2:
+                return None
+            for nbr in nbrs:
+                if nbr != previous and mesh.is_edge_on_boundary(current, nbr):
+                    return nbr
+            return None
+        nbrs = mesh.vertex_neighbors(current, ordered=True)
+        if len(nbrs) != 4:
+            return None
+        return nbrs[nbrs.index(previous) - 2]
+
+    edges = []
+    current, previous = uv
+    edges.append((previous, current))
+    while current != uv[1]:
+        nbr = step(previous, current)
+        if nbr is None:
+            break
+        previous, current = current, nbr
+        edges.append((previous, current))
+    edges[:] = [(u, v) for v, u in edges[::-1]]
+    if edges[0][0] == edges[-1][1]:
+        return edges
+    previous, current = uv
+    while True:
+        nbr = step(previous, current)
+        if nbr is None:
+            break
+        previous, current = current, nbr
+        edges.append((previous, current))
+    return edges
+
+
+def make_grid(n=6, opening=False, fixed=None):
+    form = FormDiagram.from_mesh(Mesh.from_meshgrid(dx=10, nx=n))
+    if opening:
+        center = [5.0, 5.0, 0.0]
+        for face in list(form.faces()):
+            x, y, _ = form.face_centroid(face)
+            if abs(x - center[0]) < 3 and abs(y - center[1]) < 3:
+                form.delete_face(face)
+        form.remove_unused_vertices()
+    if fixed:
+        form.vertices_attribute('is_fixed', True, keys=fixed)
+    return form
+
+
+@pytest.mark.parametrize('opening, fixed', [(False, None), (True, None), (False, [8, 15, 27]), (True, [1, 13])])
+def test_edge_loop_index(opening, fixed):
+    form = make_grid(opening=opening, fixed=fixed)
+    for u, v in form.edges():
+        for edge in ((u, v), (v, u)):
+            assert form.edge_loop(edge) == baseline_edge_loop(form, edge)
+
+
+def test_edge_loop_index_bulk():
+    form = make_grid(opening=True, fixed=[8])
+    edges = list(form.edges())[::5]
+    expected = set()
+    vertices = set()
+    for edge in edges:
+        for u, v in baseline_edge_loop(form, edge):
+            expected.add(frozenset((u, v)))
+            vertices.update((u, v))
+    loops = form.edge_loops(edges)
+    assert len(loops) == len(expected)
+    assert set(frozenset(edge) for edge in loops) == expected
+    assert sorted(form.vertices_on_edge_loops(edges)) == sorted(vertices)
+
+
+def test_edge_loop_index_fixity():
+    form = make_grid()
+    edge = next(edge for edge in form.edges() if not form.is_edge_on_boundary(*edge))
+    loop = form.edge_loop(edge)
+    form.vertex_attribute(loop[-1][0], 'is_fixed', True)
+    assert form.edge_loop(edge) == baseline_edge_loop(form, edge)
+    assert len(form.edge_loop(edge)) < len(loop)
+
+
+# ==============================================================================
+# Boundaries
+# ==============================================================================
+
+
+def baseline_corner_vertices(mesh, tol=160):
+    """``MeshMixin.corner_vertices`` before the boundary analysis, without the repeated start vertex."""
+    vertices = []
+    for key in mesh.vertices_on_boundary()[:-1]:
+        if mesh.vertex_degree(key) == 2:
+            vertices.append(key)
+            continue
+        nbrs = [nbr for nbr in mesh.vertex_neighbors(key) if mesh.is_edge_on_boundary(key, nbr)]
+        if angle_vectors(mesh.edge_vector(key, nbrs[0]), mesh.edge_vector(key, nbrs[1]), deg=True) < tol:
+            vertices.append(key)
+    return vertices
+
+
+def baseline_split_boundary(mesh, vertices):
+    """``split_boundary`` of ``RV2boundary_boundaries`` before the boundary analysis."""
+    openings = [[]]
+    for vertex in mesh.vertices_on_boundaries()[0]:
+        openings[-1].append(vertex)
+        if vertex in vertices:
+            openings.append([vertex])
+    openings[-1] += openings[0]
+    del openings[0]
+    openings = [opening for opening in openings if len(opening) > 2]
+    return [[key for key, _ in groupby(opening)] for opening in openings]
+
+
+def rotated(loop, start):
+    """A closed loop, or a list of the vertices of a closed loop, rotated to start at the given vertex."""
+    i = loop.index(start)
+    return loop[i:] + loop[:i]
+
+
+def make_boundary_grid():
+    form = make_grid(opening=True)
+    # a vertex on the edge y = 0 with an angle of about 132 degrees between its boundary edges
+    key = next(key for key in form.vertices_on_boundary() if form.vertex_degree(key) == 3 and form.vertex_attribute(key, 'y') == 0)
+    form.vertex_attribute(key, 'y', -0.75)
+    return form, key
+
+
+def test_boundary_analysis_boundaries():
+    form, _ = make_boundary_grid()
+    analysis = BoundaryAnalysis(form)
+    expected = form.vertices_on_boundaries()
+    assert len(analysis.boundaries) == len(expected) == 2
+    for boundary, vertices in zip(analysis.boundaries, expected):
+        assert boundary[0] == boundary[-1]
+        assert rotated(boundary[:-1], vertices[0]) == vertices[:-1]
+    assert sorted(analysis.vertices()) == sorted(set(key for vertices in expected for key in vertices))
+
+
+def test_boundary_analysis_split():
+    form, _ = make_boundary_grid()
+    anchors = list(form.vertices_where({'vertex_degree': 2}))
+    segments = form.boundary_analysis().split(anchors)
+    expected = baseline_split_boundary(form, anchors)
+    assert len(segments) == len(expected) == 4
+    assert sorted(segments) == sorted(expected)
+    # consecutive segments share their end vertices
+    for a, b in zip(segments, segments[1:] + segments[:1]):
+        assert a[-1] == b[0]
+
+
+def test_boundary_analysis_corners():
+    form, key = make_boundary_grid()
+    for tol in (90, 145, 160, 179):
+        corners = form.corner_vertices(tol=tol)
+        expected = baseline_corner_vertices(form, tol=tol)
+        assert rotated(corners, expected[0]) == expected
+    assert key not in form.corner_vertices(tol=130)
+    assert key in form.corner_vertices(tol=145)
+    # the corners of the opening are only returned for all boundaries
+    corners = form.boundary_analysis().corners(tol=160)
+    opening = form.boundary_analysis().corners(tol=160, boundary=1)
+    assert len(opening) == 4
+    assert corners == form.corner_vertices(tol=160) + opening
+
+
+def test_boundary_analysis_update():
+    form, key = make_boundary_grid()
+    analysis = form.boundary_analysis()
+    assert analysis.update(form) is False
+    form.vertex[key]['y'] = -1.5
+    assert analysis.update(form) is True
+    u, v = analysis.neighbors[key]
+    assert analysis.angles[key] == pytest.approx(angle_vectors(form.edge_vector(key, u), form.edge_vector(key, v), deg=True))
+    assert analysis.angles[key] < 130
+    assert analysis.update(form) is False
+
+    # the cached analysis updates the angles after a change of the geometry
+    form.vertex_attribute(key, 'y', 0.0)
+    assert form.boundary_analysis() is analysis
+    assert key not in form.corner_vertices(tol=170)
@@ -0,0 +1,226 @@
+import random
+import warnings
+
+import pytest
+
+from scipy.sparse import diags
+
+from compas.datastructures import Mesh
+from compas_tna.diagrams import FormDiagram
+from compas_tna.diagrams import ForceDiagram
+from compas.numerical import fd_numpy
+from compas_tna.equilibrium import horizontal_nodal
+from compas_tna.equilibrium import vertical_from_zmax
+
+from compas_rv2.equilibrium import horizontal_nodal_numpy
+from compas_rv2.equilibrium import vertical_from_zmax_numpy
+from compas_rv2.equilibrium import fd_topology
+from compas_rv2.equilibrium import fd_arrays_numpy
+from compas_rv2.equilibrium import TopologyCache
+from compas_rv2.equilibrium import ProductPattern
+from compas_rv2.equilibrium import relax_numpy
+from compas_rv2.equilibrium import opening_sag
+from compas_rv2.equilibrium import fit_opening_sags
+
+
+def make_diagrams(n=6, seed=0):
+    random.seed(seed)
+    form = FormDiagram.from_mesh(Mesh.from_meshgrid(dx=10, nx=n))
+    form.vertices_attribute('is_anchor', True, keys=list(form.vertices_where({'vertex_degree': 2})))
+    form.update_boundaries()
+    for vertex in form.vertices_where({'is_anchor': False}):
+        x, y = form.vertex_attributes(vertex, 'xy')
+        form.vertex_attributes(vertex, 'xy', [x + random.random(), y + random.random()])
+    force = ForceDiagram.from_formdiagram(form)
+    return form, force
+
+
+@pytest.mark.parametrize('alpha', [100, 50, 0])
+def test_horizontal_nodal_numpy_matches_nodal(alpha):
+    form, force = make_diagrams()
+    form_, force_ = make_diagrams()
+
+    horizontal_nodal(form, force, alpha=alpha, kmax=30)
+    horizontal_nodal_numpy(form_, force_, alpha=alpha, kmax=30)
+
+    for vertex in form.vertices():
+        assert form.vertex_attributes(vertex, 'xy') == pytest.approx(form_.vertex_attributes(vertex, 'xy'))
+    for vertex in force.vertices():
+        assert force.vertex_attributes(vertex, 'xy') == pytest.approx(force_.vertex_attributes(vertex, 'xy'))
+    assert form.edges_attribute('q') == pytest.approx(form_.edges_attribute('q'))
+    assert form.edges_attribute('_a') == pytest.approx(form_.edges_attribute('_a'), abs=1e-6)
+
+
+def test_horizontal_nodal_numpy_stops_within_tolerance():
+    form = FormDiagram.from_mesh(Mesh.from_meshgrid(dx=10, nx=6))
+    form.vertices_attribute('is_anchor', True, keys=list(form.vertices_where({'vertex_degree': 2})))
+    form.update_boundaries()
+    force = ForceDiagram.from_formdiagram(form)
+    form_, force_ = form.copy(), force.copy()
+    force_.primal = form_
+
+    stats = {}
+    horizontal_nodal_numpy(form, force, kmax=1000, tol=1.0, checkrate=10, stats=stats)
+    assert stats['iterations'] < 1000
+    assert stats['iterations'] % 10 == 0
+    assert [k for k, _ in stats['history']] == list(range(10, stats['iterations'] + 1, 10))
+    assert stats['history'][-1][1] < 1.0
+    assert max(form.edges_attribute('_a')) == pytest.approx(stats['history'][-1][1])
+
+    stats = {}
+    horizontal_nodal_numpy(form_, force_, kmax=100, stats=stats)
+    assert stats['iterations'] == 100
+    assert [k for k, _ in stats['history']] == list(range(10, 101, 10))
+
+
+def test_horizontal_nodal_numpy_stops_with_tension_edges():
+    # a tension net: all edges of the force diagram are flipped with respect to the form diagram
+    form = FormDiagram.from_mesh(Mesh.from_meshgrid(dx=10, nx=6))
+    form.vertices_attribute('is_anchor', True, keys=list(form.vertices_where({'vertex_degree': 2})))
+    form.update_boundaries()
+    form.edges_attribute('_is_tension', True)
+    force = ForceDiagram.from_formdiagram(form)
+
+    stats = {}
+    horizontal_nodal_numpy(form, force, kmax=1000, tol=1.0, checkrate=10, stats=stats)
+    assert stats['iterations'] < 1000
+    assert stats['history'][-1][1] < 1.0
+    assert all(q < 0 for q in form.edges_attribute('q', keys=list(form.edges_where({'_is_edge': True}))))
+
+
+def test_horizontal_nodal_numpy_zero_length_edges():
+    form, force = make_diagrams()
+    # collapse an interior edge of the form diagram, which does not move for alpha = 100
+    u, v = next(edge for edge in form.edges_where({'_is_edge': True}) if not form.is_edge_on_boundary(*edge))
+    form.vertex_attributes(v, 'xy', form.vertex_attributes(u, 'xy'))
+    form.edge_attribute((u, v), 'q', 2.5)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        horizontal_nodal_numpy(form, force, alpha=100, kmax=10)
+    assert form.edge_attribute((u, v), 'q') == 2.5
+    for edge in form.edges_where({'_is_edge': True}):
+        if set(edge) != {u, v}:
+            q, f, l = form.edge_attributes(edge, ['q', '_f', '_l'])  # noqa: E741
+            assert q == pytest.approx(f / l)
+
+
+def test_vertical_from_zmax_numpy_matches_tna():
+    form, force = make_diagrams()
+    horizontal_nodal_numpy(form, force, kmax=30)
+    form.vertices_attribute('pz', 0.5, keys=[7, 8])
+    form.faces_attribute('_is_loaded', False, keys=[0])
+    form_ = form.copy()
+    cache = TopologyCache()
+
+    for zmax in (3.0, 2.0):
+        _, scale = vertical_from_zmax(form, zmax, kmax=300)
+        _, scale_ = vertical_from_zmax_numpy(form_, zmax, kmax=300, cache=cache)
+        assert scale == pytest.approx(scale_)
+        for vertex in form.vertices():
+            assert form.vertex_attributes(vertex, ['z', '_rx', '_ry', '_rz']) == pytest.approx(form_.vertex_attributes(vertex, ['z', '_rx', '_ry', '_rz']), abs=1e-9)
+        assert form.edges_attribute('_f') == pytest.approx(form_.edges_attribute('_f'))
+
+    # the second solve reuses the assembled topology
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_vertical_from_zmax_numpy_warmstart():
+    form, force = make_diagrams()
+    horizontal_nodal_numpy(form, force, kmax=30)
+    cache = TopologyCache()
+    vertical_from_zmax_numpy(form, 3.0, kmax=300, cache=cache)
+    form.vertices_attribute('t', 1.5, keys=[7, 8, 9])
+    form_ = form.copy()
+
+    cold = {}
+    warm = {}
+    vertical_from_zmax_numpy(form, 3.0, kmax=300, stats=cold, cache=cache)
+    vertical_from_zmax_numpy(form_, 3.0, kmax=300, warmstart=True, stats=warm, cache=cache)
+    assert warm['iterations'] < cold['iterations']
+    assert warm['residual'] < 1e-3
+    assert max(form_.vertices_attribute('z')) == pytest.approx(3.0, abs=1e-2)
+    for vertex in form.vertices():
+        assert form.vertex_attribute(vertex, 'z') == pytest.approx(form_.vertex_attribute(vertex, 'z'), abs=1e-2)
+
+
+def test_fd_arrays_numpy_reuses_factorization():
+    form, _ = make_diagrams()
+    key_index = form.key_index()
+    xyz = form.vertices_attributes('xyz')
+    edges = [(key_index[u], key_index[v]) for u, v in form.edges()]
+    fixed = [key_index[vertex] for vertex in form.vertices_where({'is_anchor': True})]
+    q = [1.0 + 0.1 * i for i in range(len(edges))]
+    loads = [[0.0, 0.0, -0.1]] * len(xyz)
+
+    topology = fd_topology(len(xyz), edges, fixed, cache=TopologyCache())
+    for factor in (1.0, 2.0):
+        result = fd_numpy(xyz, edges, fixed, [factor * value for value in q], loads)
+        result_ = fd_arrays_numpy(topology, xyz, [factor * value for value in q], loads)
+        for a, b in zip(result, result_):
+            assert a.ravel().tolist() == pytest.approx(b.ravel().tolist())
+    assert topology.factorizations == 1
+
+
+def test_product_pattern_assembles_stiffness_matrix():
+    form, _ = make_diagrams()
+    key_index = form.key_index()
+    edges = [(key_index[u], key_index[v]) for u, v in form.edges()]
+    fixed = [key_index[vertex] for vertex in form.vertices_where({'is_anchor': True})]
+    topology = fd_topology(len(key_index), edges, fixed, cache=TopologyCache())
+    q = [1.0 + 0.1 * i for i in range(len(edges))]
+    Q = diags([q], [0])
+    for X, Y in ((topology.Ci, topology.Ci), (topology.Ci, topology.Cf)):
+        A = ProductPattern(X, Y).assemble(q)
+        assert abs(A - X.transpose().dot(Q).dot(Y)).max() < 1e-12
+
+
+def test_relax_numpy_assembles_topology_once():
+    form, _ = make_diagrams()
+    form_ = form.copy()
+    key_index = form.key_index()
+    xyz = form.vertices_attributes('xyz')
+    edges = [(key_index[u], key_index[v]) for u, v in form.edges()]
+    anchors = list(form.vertices_where({'is_anchor': True}))
+    fixed = [key_index[vertex] for vertex in anchors]
+    cache = TopologyCache()
+    for factor in (1.0, 3.0):
+        for mesh in (form, form_):
+            mesh.vertex_attribute(anchors[0], 'y', factor)
+            for i, edge in enumerate(mesh.edges()):
+                mesh.edge_attribute(edge, 'q', 1.0 + factor * (i % 5))
+        relax_numpy(form, anchors, cache=cache)
+        result = fd_numpy(form_.vertices_attributes('xyz'), edges, fixed, form_.edges_attribute('q'), [[0.0, 0.0, 0.0]] * len(xyz))
+        assert [value for point in form.vertices_attributes('xyz') for value in point] == pytest.approx(result[0].ravel().tolist())
+    assert cache.misses == 1
+    assert cache.hits == 1
+
+
+def test_fit_opening_sags_fits_all_openings_jointly():
+    random.seed(1)
+    mesh = Mesh.from_meshgrid(dx=10, nx=12)
+    mesh.update_default_vertex_attributes(is_fixed=False)
+    mesh.update_default_edge_attributes(q=1.0)
+    boundary = mesh.vertices_on_boundaries()[0]
+    anchors = [boundary[i] for i in (0, 7, 12, 24, 36, 40)]
+    mesh.vertices_attribute('is_fixed', True, keys=anchors)
+    openings = [[]]
+    for vertex in boundary[:-1]:
+        if vertex in anchors and openings[-1]:
+            openings[-1].append(vertex)
+            openings.append([])
+        openings[-1].append(vertex)
+    openings[-1].append(boundary[0])
+    openings = [list(zip(opening[:-1], opening[1:])) for opening in openings]
+
+    def relax():
+        relax_numpy(mesh, anchors)
+
+    for opening in openings:
+        mesh.edges_attribute('q', random.uniform(0.5, 4.0), keys=opening)
+    relax()
+    targets = [opening_sag(mesh, opening) for opening in openings]
+
+    q, sags, count, converged = fit_opening_sags(mesh, openings, targets, [1.0] * len(openings), relax, tol=1e-3, kmax=10)
+    assert converged
+    assert count < 10
+    assert sags == pytest.approx(targets, abs=1e-3)
@@ -0,0 +1,287 @@
+import json
+import importlib
+import threading
+
+import pytest
+
+from compas.datastructures import Mesh
+from compas.utilities import DataEncoder
+from compas.utilities import DataDecoder
+from compas_tna.diagrams import FormDiagram
+from compas_tna.diagrams import ForceDiagram
+
+from compas_rv2.execution import LocalExecutor
+from compas_rv2.execution import ProxyExecutor
+from compas_rv2.execution import BackgroundSolve
+from compas_rv2.execution import SnapshotChannel
+from compas_rv2.execution import Cancellation
+from compas_rv2.execution import Cancelled
+
+
+class JsonProxy(object):
+    """Stand-in for the RPC proxy that calls the functions in-process, with JSON serialisation of the data.
+
+    As with the proxy, callbacks are not serialised but called on the client side.
+    """
+
+    def function(self, name):
+        module, name = name.rsplit('.', 1)
+        function = getattr(importlib.import_module(module), name)
+
+        def call(*args, **kwargs):
+            callback = kwargs.pop('callback', None)
+            args, kwargs = json.loads(json.dumps([args, kwargs], cls=DataEncoder), cls=DataDecoder)
+            if callback:
+                kwargs['callback'] = callback
+            return json.loads(json.dumps(function(*args, **kwargs), cls=DataEncoder), cls=DataDecoder)
+
+        return call
+
+
+def make_diagrams(n=6):
+    form = FormDiagram.from_mesh(Mesh.from_meshgrid(dx=10, nx=n))
+    form.vertices_attribute('is_anchor', True, keys=list(form.vertices_where({'vertex_degree': 2})))
+    form.update_boundaries()
+    force = ForceDiagram.from_formdiagram(form)
+    return form, force
+
+
+@pytest.mark.parametrize('executor', [LocalExecutor(), ProxyExecutor(JsonProxy())])
+def test_vertical(executor):
+    form, _ = make_diagrams()
+    result = executor.vertical(form, 3.0, kmax=300)
+    assert result['scale'] > 0
+    assert max(form.vertices_attribute('z')) == pytest.approx(3.0, rel=5e-2)
+    time = result['time']
+    assert time['total'] >= time['solver'] >= 0
+    assert time['transport'] == pytest.approx(time['total'] - time['solver'])
+
+
+@pytest.mark.parametrize('executor', [LocalExecutor(), ProxyExecutor(JsonProxy())])
+def test_horizontal(executor):
+    form, force = make_diagrams()
+    calls = []
+    result = executor.horizontal(form, force, alpha=100, kmax=10, callback=lambda k, xy, edges: calls.append(k), refreshrate=5)
+    assert len(calls) == 2
+    assert result['iterations'] == 10
+    assert set(result['time']) == {'total', 'solver', 'transport'}
+
+
+@pytest.mark.parametrize('executor', [LocalExecutor(), ProxyExecutor(JsonProxy())])
+def test_horizontal_tolerance(executor):
+    form, force = make_diagrams()
+    result = executor.horizontal(form, force, alpha=100, kmax=20, tol=180.0, checkrate=5)
+    assert result['iterations'] == 5
+    assert [k for k, _ in result['history']] == [5]
+
+
+@pytest.mark.parametrize('executor', [LocalExecutor(), ProxyExecutor(JsonProxy())])
+def test_horizontal_cancel(executor):
+    form, force = make_diagrams()
+    xy = force.vertices_attributes('xy')
+    q = form.edges_attribute('q')
+    cancel = Cancellation()
+
+    def callback(k, xy, edges):
+        if k == 20:
+            cancel.cancel()
+
+    with pytest.raises(Cancelled):
+        executor.horizontal(form, force, kmax=100, callback=callback, refreshrate=10, cancel=cancel)
+    assert force.vertices_attributes('xy') == xy
+    assert form.edges_attribute('q') == q
+
+
+@pytest.mark.parametrize('executor', [LocalExecutor(), ProxyExecutor(JsonProxy())])
+def test_vertical_cancel(executor):
+    form, _ = make_diagrams()
+    z = form.vertices_attribute('z')
+    cancel = Cancellation()
+    cancel.cancel()
+    with pytest.raises(Cancelled):
+        executor.vertical(form, 3.0, kmax=300, cancel=cancel)
+    assert form.vertices_attribute('z') == z
+
+
+def test_background_solve_matches_foreground():
+    form, force = make_diagrams()
+    other, other_force = form.copy(), force.copy()
+    other_force.primal = other
+    force.primal = form
+
+    channel = SnapshotChannel(minimum=0.0)
+    solve = BackgroundSolve(LocalExecutor().horizontal, form, force, kmax=50, callback=channel.callback, refreshrate=1)
+    while not solve.wait(0.001):
+        snapshot = channel.take()
+        if snapshot:
+            channel.drawn(0.0)
+    assert solve.result()['iterations'] == 50
+    assert not solve.cancel()
+
+    LocalExecutor().horizontal(other, other_force, kmax=50)
+    for key in force.vertices():
+        assert force.vertex_attributes(key, 'xy') == pytest.approx(other_force.vertex_attributes(key, 'xy'))
+
+
+def test_background_solve_cancel():
+    form, force = make_diagrams()
+    xy = force.vertices_attributes('xy')
+    started = threading.Event()
+    release = threading.Event()
+
+    def callback(k, xy, edges):
+        started.set()
+        release.wait(1.0)
+
+    solve = BackgroundSolve(LocalExecutor().horizontal, form, force, kmax=100, callback=callback)
+    assert started.wait(5.0)
+    assert solve.cancel()
+    release.set()
+    with pytest.raises(Cancelled):
+        solve.result(5.0)
+    assert force.vertices_attributes('xy') == xy
+
+
+def test_snapshot_channel():
+    import numpy
+    channel = SnapshotChannel(budget=0.5, minimum=0.0, maximum=10.0)
+    xy = numpy.zeros((2, 2))
+    edges = [[0, 1]]
+    channel.callback(0, xy, edges)
+    xy[0, 0] = 1.0
+    # no new frame was requested
+    channel.callback(1, xy, edges)
+    k, snapshot, _ = channel.take()
+    assert k == 0
+    assert snapshot[0, 0] == 0.0
+    assert channel.take() is None
+    channel.drawn(1.0)
+    assert channel.interval == pytest.approx(1.0)
+    channel.callback(2, xy, edges)
+    # the next frame is not yet due
+    assert channel.take() is None
+
+
+def test_relax_local_and_proxy_agree():
+    form, _ = make_diagrams()
+    form.edges_attribute('q', 2.0, keys=list(form.edges())[:10])
+    fixed = list(form.vertices_where({'is_anchor': True}))
+    other = form.copy()
+    LocalExecutor().relax(form, fixed)
+    ProxyExecutor(JsonProxy()).relax(other, fixed)
+    for vertex in fixed:
+        assert form.vertex_attributes(vertex, 'xyz') == other.vertex_attributes(vertex, 'xyz')
+    for vertex in form.vertices():
+        assert form.vertex_attributes(vertex, 'xyz') == pytest.approx(other.vertex_attributes(vertex, 'xyz'))
+
+
+def test_wire_roundtrip():
+    from compas_rv2.execution.wire import encode_array
+    from compas_rv2.execution.wire import decode_array
+    from compas_rv2.execution.wire_numpy import encode_array_numpy
+    from compas_rv2.execution.wire_numpy import decode_array_numpy
+
+    rows = [[0.0, 1.5, -2.0], [3.25, 4.0, 1e-12]]
+    assert decode_array(encode_array(rows)) == rows
+    assert decode_array(encode_array([1, 2, 3], 'i4')) == [1, 2, 3]
+    assert decode_array_numpy(encode_array(rows)).tolist() == rows
+    assert decode_array(encode_array_numpy(decode_array_numpy(encode_array(rows)))) == rows
+
+
+def test_proxy_matches_local():
+    form, force = make_diagrams()
+    form.vertices_attribute('pz', 0.5, keys=[7, 8])
+    other, other_force = form.copy(), force.copy()
+    other_force.primal = other
+    force.primal = form
+
+    LocalExecutor().horizontal(form, force, alpha=100, kmax=50)
+    ProxyExecutor(JsonProxy()).horizontal(other, other_force, alpha=100, kmax=50)
+    for key in force.vertices():
+        assert force.vertex_attributes(key, 'xy') == pytest.approx(other_force.vertex_attributes(key, 'xy'))
+    for edge in form.edges():
+        assert form.edge_attributes(edge, ['q', '_a']) == pytest.approx(other.edge_attributes(edge, ['q', '_a']))
+
+    a = LocalExecutor().vertical(form, 3.0, kmax=300)
+    b = ProxyExecutor(JsonProxy()).vertical(other, 3.0, kmax=300)
+    assert a['scale'] == pytest.approx(b['scale'])
+    for key in form.vertices():
+        assert form.vertex_attributes(key, ['z', '_rx', '_ry', '_rz']) == pytest.approx(other.vertex_attributes(key, ['z', '_rx', '_ry', '_rz']))
+    for edge in form.edges():
+        assert form.edge_attributes(edge, ['q', '_f']) == pytest.approx(other.edge_attributes(edge, ['q', '_f']))
+
+
+class StandInServer(JsonProxy):
+    """Stand-in for the proxy of a worker of a solver pool, that records the names and arguments of the calls."""
+
+    def __init__(self, port):
+        self.port = port
+        self.log = []
+
+    def function(self, name):
+        call = super(StandInServer, self).function(name)
+
+        def logged(*args, **kwargs):
+            self.log.append((name, args))
+            return call(*args, **kwargs)
+
+        return logged
+
+    def restart(self):
+        self.log.append(('restart', ()))
+
+    def shutdown(self):
+        self.log.append(('shutdown', ()))
+
+
+def test_pool_warmup_and_health():
+    from compas_rv2.execution import SolverPool
+
+    pool = SolverPool(size=2, port=9100, factory=StandInServer)
+    assert [worker.port for worker in pool.workers] == [9100, 9101]
+    for worker in pool.workers:
+        assert worker.proxy.log[0][0] == 'compas_rv2.execution.warmup_proxy'
+    report = pool.health()
+    assert [status['status'] for status in report] == ['ok', 'ok']
+    assert pool.restart() == []
+    assert pool.restart(unhealthy=False) == [9100, 9101]
+
+
+def test_pool_resident_session():
+    from compas_rv2.execution import SolverPool
+
+    pool = SolverPool(size=2, port=9100, factory=StandInServer, preload=False)
+    executor = ProxyExecutor(pool, session='test')
+    form, _ = make_diagrams()
+    other = form.copy()
+    executor.vertical(form, 3.0, kmax=300)
+    executor.vertical(form, 2.0, kmax=300)
+    LocalExecutor().vertical(other, 2.0, kmax=300)
+    for key in form.vertices():
+        assert form.vertex_attribute(key, 'z') == pytest.approx(other.vertex_attribute(key, 'z'))
+
+    # all calls of the session run on the same worker
+    calls = [call for worker in pool.workers for call in worker.proxy.log]
+    assert len(calls) == 2
+    worker = pool.affinity['test']
+    (_, first), (_, second) = worker.proxy.log
+    assert first[2] == second[2]
+    # the topology and loads did not change, and are not sent again
+    assert set(first[3]) == set(first[2])
+    assert set(second[3]) == {'xyz', 'q'}
+
+
+def test_pool_submit():
+    from compas_rv2.execution import SolverPool
+    from compas_rv2.execution.wire import pack_fd
+
+    pool = SolverPool(size=2, port=9100, factory=StandInServer, preload=False)
+    message = pack_fd([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [2.0, 1.0, 0.0]], [[0, 1], [1, 2]], [0, 2], [1.0, 1.0], [[0.0, 0.0, 0.0]] * 3)
+    futures = [pool.submit('compas_rv2.execution.fd_proxy', message) for _ in range(4)]
+    for future in futures:
+        result = future.result(timeout=10)
+        assert result['time'] >= 0
+    assert sum(worker.calls for worker in pool.workers) == 4
+    failed = pool.submit('compas_rv2.execution.fd_proxy', {})
+    with pytest.raises(KeyError):
+        failed.result(timeout=10)
@@ -0,0 +1,118 @@
+from compas.datastructures import Mesh
+from compas_tna.diagrams import FormDiagram
+from compas_tna.diagrams import ForceDiagram
+
+from compas_rv2.history import History
+
+
+def make_diagrams(n=4):
+    form = FormDiagram.from_mesh(Mesh.from_meshgrid(dx=10, nx=n))
+    form.vertices_attribute('is_anchor', True, keys=list(form.vertices_where({'vertex_degree': 2})))
+    form.update_boundaries()
+    force = ForceDiagram.from_formdiagram(form)
+    return {'form': form, 'force': force}
+
+
+def test_undo_redo_attributes():
+    diagrams = make_diagrams()
+    form = diagrams['form']
+    history = History()
+    assert not history.record(diagrams)
+
+    form.vertex_attributes(5, 'xyz', [1.0, 2.0, 3.0])
+    form.vertex_attribute(6, 'is_anchor', True)
+    form.edge_attribute((5, 6), 'q', 3.0)
+    form.face_attribute(0, 'custom', 'load')
+    assert history.record(diagrams)
+    assert history.can_undo
+
+    assert history.undo(diagrams) == []
+    assert form.vertex_attributes(5, 'xy') != [1.0, 2.0]
+    assert not form.vertex_attribute(6, 'is_anchor')
+    assert form.edge_attribute((5, 6), 'q') == 1.0
+    assert form.face_attribute(0, 'custom') is None
+    assert diagrams['form'] is form
+
+    assert history.redo(diagrams) == []
+    assert form.vertex_attributes(5, 'xyz') == [1.0, 2.0, 3.0]
+    assert form.vertex_attribute(6, 'is_anchor')
+    assert form.edge_attribute((5, 6), 'q') == 3.0
+    assert form.face_attribute(0, 'custom') == 'load'
+    assert not history.can_redo
+
+
+def test_undo_topology():
+    diagrams = make_diagrams()
+    form = diagrams['form']
+    history = History()
+    history.record(diagrams)
+    vertices = sorted(form.vertices())
+    form.delete_face(0)
+    form.vertex_attribute(10, 'z', 5.0)
+    assert history.record(diagrams)
+
+    history.undo(diagrams)
+    assert diagrams['form'] is form
+    assert form.has_face(0)
+    assert sorted(form.vertices()) == vertices
+    assert form.vertex_attribute(10, 'z') == 0.0
+
+    history.redo(diagrams)
+    assert not form.has_face(0)
+    assert form.vertex_attribute(10, 'z') == 5.0
+
+
+def test_undo_replaced_diagram():
+    diagrams = make_diagrams()
+    form = diagrams['form']
+    force = diagrams['force']
+    history = History()
+    history.record(diagrams)
+    diagrams['force'] = None
+    diagrams['form'] = form.copy()
+    diagrams['form'].vertex_attribute(0, 'z', 1.0)
+    history.record(diagrams)
+
+    assert sorted(history.undo(diagrams)) == ['force', 'form']
+    assert diagrams['form'] is not form
+    assert isinstance(diagrams['form'], FormDiagram)
+    assert isinstance(diagrams['force'], ForceDiagram)
+    assert diagrams['form'].vertex_attribute(0, 'z') == 0.0
+    assert sorted(diagrams['force'].edges()) == sorted(force.edges())
+
+
+def test_undo_settings():
+    diagrams = make_diagrams()
+    settings = {'Solvers': {'tna.horizontal.kmax': 100}}
+    history = History()
+    history.record(diagrams, settings)
+    settings['Solvers']['tna.horizontal.kmax'] = 500
+    assert history.record(diagrams, settings)
+    history.undo(diagrams, settings)
+    assert settings['Solvers']['tna.horizontal.kmax'] == 100
+
+
+def test_unrecorded_changes_are_undone_first():
+    diagrams = make_diagrams()
+    form = diagrams['form']
+    history = History()
+    history.record(diagrams)
+    form.vertex_attribute(5, 'x', 100.0)
+    history.record(diagrams)
+    form.vertex_attribute(5, 'x', 200.0)
+    history.undo(diagrams)
+    assert form.vertex_attribute(5, 'x') == 100.0
+
+
+def test_budget():
+    diagrams = make_diagrams()
+    form = diagrams['form']
+    history = History(budget=0)
+    history.record(diagrams)
+    for i in range(5):
+        form.vertex_attribute(5, 'z', float(i + 1))
+        history.record(diagrams)
+    assert history.undo(diagrams) == []
+    assert form.vertex_attribute(5, 'z') == 4.0
+    assert history.undo(diagrams) is None
+    assert history.nbytes > 0
@@ -0,0 +1,254 @@
+import pytest
+
+from compas.datastructures import Mesh
+from compas_tna.diagrams import FormDiagram
+from compas_tna.diagrams import ForceDiagram
+
+from compas_rv2.scene import Scene
+from compas_rv2.scene import HeadlessBackend
+from compas_rv2.scene import RecordingBackend
+from compas_rv2.scene import ArrowBuffer
+from compas_rv2.scene import ViewCoordinates
+from compas_rv2.scene import GuidMap
+from compas_rv2.scene import arrows_loads
+from compas_rv2.scene import arrows_reactions
+
+
+SETTINGS = {
+    "RV2": {
+        "show.forces": False,
+        "show.angles": True,
+        "tol.angles": 5.0,
+    },
+}
+
+
+def make_diagrams(n=4):
+    form = FormDiagram.from_mesh(Mesh.from_meshgrid(dx=10, nx=n))
+    form.vertices_attribute('is_anchor', True, keys=list(form.vertices_where({'vertex_degree': 2})))
+    form.update_boundaries()
+    force = ForceDiagram.from_formdiagram(form)
+    return form, force
+
+
+def test_default_backend_is_headless():
+    scene = Scene(SETTINGS)
+    assert isinstance(scene.backend, HeadlessBackend)
+
+
+def test_add_get_update_clear():
+    form, force = make_diagrams()
+    backend = RecordingBackend()
+    scene = Scene(SETTINGS, backend=backend)
+    scene.add(form, name='form')
+    scene.add(force, name='force')
+
+    node = scene.get('form')[0]
+    assert node.datastructure is form
+    assert node.scene is scene
+    assert node.settings['layer'] == "RV2::FormDiagram"
+    assert scene.get('force')[0].settings['layer'] == "RV2::ForceDiagram"
+    assert scene.get('thrust') == [None]
+
+    scene.update()
+    assert node.count_draw == 1
+    assert backend.log[:2] == [('build', 'form'), ('build', 'force')]
+    assert backend.log[2] == ('begin', None)
+    assert sorted(backend.log[3:5]) == [('draw', 'force'), ('draw', 'form')]
+    assert backend.log[5] == ('end', None)
+
+    scene.clear()
+    assert scene.nodes == {}
+    assert scene.get('form') == [None]
+
+
+def test_form_vertex_xyz():
+    form, _ = make_diagrams()
+    form.vertices_attribute('z', 1.0)
+    scene = Scene(SETTINGS)
+    node = scene.add(form, name='form')
+    node.location = [1.0, 0.0, 0.0]
+    vertex_xyz = node.vertex_xyz
+    for vertex in form.vertices():
+        x, y = form.vertex_attributes(vertex, 'xy')
+        assert vertex_xyz[vertex] == [x + 1.0, y, 0.0]
+
+
+def test_view_coordinates():
+    from compas.geometry import Rotation
+    from compas.geometry import Scale
+    from compas.geometry import Translation
+
+    form, _ = make_diagrams()
+    form.vertices_attribute('z', 1.0)
+    view = ViewCoordinates()
+    location, scale, rotation = [1.0, 2.0, 3.0], 0.5, [0.1, 0.2, 0.3]
+    vertex_xyz = view.get(form, location, scale, rotation, anchor=0)
+
+    x, y, z = form.vertex_attributes(0, 'xyz')
+    X = Translation.from_vector(location) * Rotation.from_euler_angles(rotation) * Scale.from_factors([scale] * 3) * Translation.from_vector([-x, -y, -z])
+    mesh = form.transformed(X)
+    for vertex in form.vertices():
+        assert vertex_xyz[vertex] == pytest.approx(mesh.vertex_attributes(vertex, 'xyz'))
+
+    # cached until the geometry or the view changes
+    assert view.get(form, location, scale, rotation, anchor=0) is vertex_xyz
+    form.vertex_attribute(5, 'x', 100.0)
+    moved = view.get(form, location, scale, rotation, anchor=0)
+    assert moved is not vertex_xyz
+    assert moved[5] != vertex_xyz[5] and moved[6] == vertex_xyz[6]
+    assert view.get(form, location, 1.0, rotation, anchor=0) is not moved
+
+
+def test_guid_map():
+    guid_edge = GuidMap(zip(['a', 'b', 'c'], [(0, 1), (1, 2), (2, 3)]))
+    assert guid_edge['b'] == (1, 2)
+    assert guid_edge.guid((1, 2)) == 'b'
+    assert guid_edge.guids([(0, 1), (2, 3), (5, 6)]) == ['a', 'c']
+    assert guid_edge.edge_guids([(1, 0), (0, 1), (3, 2)]) == ['a', 'c']
+
+    # the inverse map follows every change
+    del guid_edge['a']
+    guid_edge['d'] = (0, 1)
+    guid_edge.update({'e': (4, 5)})
+    assert guid_edge.pop('c') == (2, 3)
+    assert guid_edge.inverse == {(0, 1): 'd', (1, 2): 'b', (4, 5): 'e'}
+    guid_edge.clear()
+    assert guid_edge.inverse == {}
+
+
+def test_save_session():
+    form, force = make_diagrams()
+    scene = Scene(SETTINGS)
+    scene.add(form, name='form')
+    scene.add(force, name='force')
+    session = scene.save_session()
+    assert session['settings'] is SETTINGS
+    assert session['data']['pattern'] is None
+    assert session['data']['form'] == form.to_data()
+    assert session['data']['force'] == force.to_data()
+
+
+def test_arrow_buffer():
+    form, _ = make_diagrams()
+    form.vertices_attribute('pz', 1.0)
+    form.vertex_attribute(0, 'pz', 0.001)
+    buffer = ArrowBuffer(arrows_loads, scale=0.5, tol=0.01)
+    assert buffer.update(form) == 1
+    assert 0 not in buffer.vertices
+    assert len(buffer.vertices) == form.number_of_vertices() - 1
+    vertex = buffer.vertices[0]
+    x, y, z = form.vertex_coordinates(vertex)
+    assert buffer.starts[0] == [x, y, z + 0.5]
+    assert buffer.ends[0] == [x, y, z]
+
+    # the buffer is rebuilt only when it is invalidated, or when the scale or tolerance change
+    form.vertex_attribute(0, 'pz', 1.0)
+    assert buffer.update(form) == 1
+    buffer.invalidate()
+    assert buffer.update(form) == 2
+    assert 0 in buffer.vertices
+    buffer.scale = 0.5
+    assert buffer.update(form) == 2
+    buffer.tol = 1.0
+    assert buffer.update(form) == 3
+    assert buffer.vertices == []
+
+
+def test_arrow_buffer_reactions():
+    form, _ = make_diagrams()
+    anchors = list(form.anchors())
+    form.vertices_attributes(['_rx', '_ry', '_rz'], [1.0, 0.0, -2.0], keys=anchors)
+    buffer = ArrowBuffer(arrows_reactions)
+    buffer.update(form)
+    assert sorted(buffer.vertices) == sorted(anchors)
+    for vertex, start, end in zip(buffer.vertices, buffer.starts, buffer.ends):
+        assert end == form.vertex_coordinates(vertex)
+        assert [a - b for a, b in zip(start, end)] == [1.0, 0.0, -2.0]
+
+
+def test_update_only_changed():
+    form, force = make_diagrams()
+    backend = RecordingBackend()
+    scene = Scene(SETTINGS, backend=backend)
+    node = scene.add(form, name='form')
+    scene.add(force, name='force')
+    scene.update()
+    del backend.log[:]
+
+    # nothing changed
+    assert scene.update() == {}
+    assert backend.log == []
+
+    # attributes of a few vertices
+    form.vertex_attribute(5, 'z', 3.0)
+    form.vertex_attribute(6, 'is_anchor', True)
+    changes = scene.update()
+    assert backend.log == [('begin', None), ('redraw', 'form'), ('end', None)]
+    assert node.count_draw == 1
+    assert node.count_redraw == 1
+    changeset = list(changes.values())[0]
+    assert changeset.vertices == {5: {'z'}, 6: {'is_anchor'}}
+    assert changeset.edges == {}
+    assert changeset.geometry
+    assert changeset.affected_edges(form) >= {(5, nbr) for nbr in form.vertex_neighbors(5)}
+
+    # settings of the object
+    del backend.log[:]
+    node.settings['show.vertices'] = False
+    changeset = list(scene.update().values())[0]
+    assert changeset.settings == {'show.vertices'}
+    assert backend.log[1] == ('draw', 'form')
+    assert node.count_draw == 2
+
+
+def test_update_full():
+    form, force = make_diagrams()
+    backend = RecordingBackend()
+    scene = Scene(SETTINGS, backend=backend)
+    scene.add(form, name='form')
+    scene.add(force, name='force')
+    scene.update()
+
+    # settings of the scene
+    del backend.log[:]
+    SETTINGS['RV2']['show.forces'] = True
+    try:
+        assert len(scene.update()) == 2
+    finally:
+        SETTINGS['RV2']['show.forces'] = False
+    assert sorted(backend.log[1:3]) == [('draw', 'force'), ('draw', 'form')]
+    scene.update()
+
+    # topology
+    del backend.log[:]
+    form.delete_face(0)
+    changes = scene.update()
+    assert all(changeset.full for changeset in changes.values())
+    assert sorted(backend.log[1:3]) == [('draw', 'force'), ('draw', 'form')]
+
+    # forced
+    del backend.log[:]
+    scene.update(full=True)
+    assert sorted(backend.log[1:3]) == [('draw', 'force'), ('draw', 'form')]
+
+
+def test_update_dual():
+    form, force = make_diagrams()
+    backend = RecordingBackend()
+    scene = Scene(SETTINGS, backend=backend)
+    scene.add(form, name='form')
+    scene.add(force, name='force')
+    scene.update()
+    del backend.log[:]
+
+    # the force diagram is redrawn with the edges of its primal
+    form.vertex_attribute(5, 'x', 3.0)
+    scene.update()
+    assert backend.log[1:-1] == [('redraw', 'form')]
+    del backend.log[:]
+    form.edge_attribute((6, 5), '_is_tension', True)
+    changes = scene.update()
+    assert sorted(backend.log[1:3]) == [('draw', 'force'), ('redraw', 'form')]
+    changeset = [changes[guid] for guid in changes if scene.nodes[guid].name == 'form'][0]
+    assert set(changeset.edges) == {(5, 6)}